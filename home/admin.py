@@ -1,9 +1,10 @@
 from django.contrib import admin
 from .models import (
     StudentProfile, Document, ApplicationStep,
-    UpcomingDate, Reminder, Announcement, NewApplication, RenewalApplication, Office,
+    UpcomingDate, Reminder, Announcement, Application, NewApplication, RenewalApplication, Office,
     ActiveStudentAssistant, AttendanceRecord, PerformanceEvaluation,
-    ApplicationNote, NoDutyDay, DutyReminder,
+    ApplicationNote, NoDutyDay, DutyReminder, UploadSettings, NormalizedUpload,
+    ReportSnapshot, EmailOutbox, OfficeWeeklySnapshot, ReportSubscription,
 )
 
 
@@ -182,6 +183,28 @@ class RenewalApplicationAdmin(admin.ModelAdmin):
     )
 
 
+# ══════════════════════════════════════════════════
+#  All Applications (read-only; synced from New/Renewal)
+# ══════════════════════════════════════════════════
+
+@admin.register(Application)
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ('student_id', 'full_name', 'kind', 'status', 'assigned_office', 'submitted_at')
+    list_filter = ('kind', 'status', 'semester')
+    search_fields = ('student_id', 'full_name', 'email')
+    date_hierarchy = 'submitted_at'
+    list_per_page = 25
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # ══════════════════════════════════════════════════
 #  Offices
 # ══════════════════════════════════════════════════
@@ -318,3 +341,71 @@ class DutyReminderAdmin(admin.ModelAdmin):
     search_fields = ('student_assistant__full_name', 'student_assistant__student_id')
     date_hierarchy = 'date'
     list_per_page = 25
+
+
+# ══════════════════════════════════════════════════
+#  Upload Normalization
+# ══════════════════════════════════════════════════
+
+@admin.register(UploadSettings)
+class UploadSettingsAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'quality', 'keep_originals', 'updated_at')
+
+    def has_add_permission(self, request):
+        return not UploadSettings.objects.exists()
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NormalizedUpload)
+class NormalizedUploadAdmin(admin.ModelAdmin):
+    list_display = ('stored_name', 'field_name', 'original_size', 'normalized_size', 'bytes_saved', 'created_at')
+    list_filter = ('field_name', 'created_at')
+    search_fields = ('stored_name', 'original_name')
+    date_hierarchy = 'created_at'
+    list_per_page = 25
+
+
+# ══════════════════════════════════════════════════
+#  Report Snapshots, Subscriptions & Email Outbox
+# ══════════════════════════════════════════════════
+
+@admin.register(ReportSnapshot)
+class ReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'version', 'status', 'started_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('version', 'summary', 'error', 'started_at', 'finished_at')
+    list_per_page = 25
+
+
+@admin.register(ReportSubscription)
+class ReportSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ('name', 'report', 'cadence', 'office', 'is_active', 'last_window')
+    list_filter = ('report', 'cadence', 'is_active')
+    search_fields = ('name', 'recipients')
+    readonly_fields = ('last_window', 'created_by', 'created_at')
+    list_per_page = 25
+
+    def save_model(self, request, obj, form, change):
+        if not obj.created_by_id:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'updated_at', 'sent_at')
+    date_hierarchy = 'created_at'
+    list_per_page = 25
+
+
+@admin.register(OfficeWeeklySnapshot)
+class OfficeWeeklySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('office', 'week_start', 'sa_count', 'att_total', 'hours_worked', 'eval_count', 'updated_at')
+    list_filter = ('office', 'semester')
+    date_hierarchy = 'week_start'
+    list_per_page = 25
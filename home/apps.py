@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class HomeConfig(AppConfig):
     name = "home"
+
+    def ready(self):
+        from . import signals  # noqa: F401 — registers the delta-export tombstone and application-sync receivers
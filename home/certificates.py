@@ -0,0 +1,338 @@
+"""
+Completion certificates — single and bulk.
+
+``certificate_data()`` turns SAs into plain dicts with everything a
+certificate prints, using one grouped attendance query and one
+evaluation query for the whole batch. Rendering only needs those dicts,
+so this module imports no models at load time and spawned worker
+processes can render without setting Django up.
+
+Bulk output is either a ZIP with one PDF per SA, rendered in a process
+pool and written in order as chunks come back, or one merged PDF with a
+page per SA drawn on a single canvas.
+"""
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from io import BytesIO
+
+# Certificates per pool task; keeps pickling overhead low without
+# holding many finished PDFs in memory
+CHUNK_SIZE = 25
+
+
+def _semester_reports(sa_ids):
+    """``{sa_id: {total, present, late, absent, attendance_rate}}`` from one grouped query."""
+    from django.db.models import Count
+    from .models import AttendanceRecord
+
+    counts = {}
+    rows = (
+        AttendanceRecord.objects.filter(student_assistant_id__in=sa_ids).order_by()
+        .values('student_assistant_id', 'status').annotate(n=Count('id'))
+    )
+    for row in rows:
+        counts.setdefault(row['student_assistant_id'], {})[row['status']] = row['n']
+
+    reports = {}
+    for sa_id, by_status in counts.items():
+        total = sum(by_status.values())
+        present, late = by_status.get('present', 0), by_status.get('late', 0)
+        reports[sa_id] = {
+            'total': total,
+            'present': present,
+            'late': late,
+            'absent': by_status.get('absent', 0),
+            'attendance_rate': round((present + late) / total * 100, 1) if total else 0,
+        }
+    return reports
+
+
+def _final_evaluations(sa_ids):
+    """``{sa_id: {overall_rating, recommendation}}`` for SAs with a final evaluation."""
+    from .models import PerformanceEvaluation
+
+    labels = dict(PerformanceEvaluation.RECOMMENDATION_CHOICES)
+    rows = PerformanceEvaluation.objects.filter(
+        student_assistant_id__in=sa_ids, evaluation_period='final',
+    ).values_list('student_assistant_id', 'overall_rating', 'recommendation_status')
+    return {
+        sa_id: {'overall_rating': rating, 'recommendation': labels.get(rec, '') if rec else ''}
+        for sa_id, rating, rec in rows
+    }
+
+
+def certificate_data(sas):
+    """
+    Return one dict per SA in *sas* (in order) with every value the
+    certificate prints. The SAs should have ``assigned_office`` loaded.
+    """
+    sas = list(sas)
+    sa_ids = [sa.pk for sa in sas]
+    reports = _semester_reports(sa_ids)
+    evaluations = _final_evaluations(sa_ids)
+    empty_report = {'total': 0, 'present': 0, 'late': 0, 'absent': 0, 'attendance_rate': 0}
+    issued = date.today().strftime('%B %d, %Y')
+    return [{
+        'pk': sa.pk,
+        'full_name': sa.full_name,
+        'student_id': sa.student_id,
+        'course': sa.course,
+        'office_name': sa.assigned_office.name if sa.assigned_office else 'N/A',
+        'semester_label': sa.get_semester_display(),
+        'academic_year': sa.academic_year or 'N/A',
+        'start': sa.start_date.strftime('%B %d, %Y') if sa.start_date else 'N/A',
+        'end': sa.end_date.strftime('%B %d, %Y') if sa.end_date else 'N/A',
+        'total_hours': float(sa.total_hours),
+        'semester_report': reports.get(sa.pk, empty_report),
+        'final_eval': evaluations.get(sa.pk),
+        'issued': issued,
+    } for sa in sas]
+
+
+def certificate_filename(cert, unique=False):
+    """``Completion_Certificate_<Name>.pdf``; *unique* adds the student ID for bulk output."""
+    safe_name = cert['full_name'].replace(' ', '_')
+    suffix = f'_{cert["student_id"]}' if unique else ''
+    return f'Completion_Certificate_{safe_name}{suffix}.pdf'
+
+
+# ── Rendering ────────────────────────────────────────────────────
+
+LAYOUT_FORM = 'certificate_layout'
+SIGNATURES_FORM = 'certificate_signatures'
+
+# Baselines (points from the bottom of a letter page) shared by the
+# layout form and the stamped text
+NAME_Y = 550
+NAME_RULE_Y = NAME_Y - 15
+
+
+def _draw_layout(c):
+    """Border, university header, title rule, "This is to certify that" and the name rule."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    width, height = letter
+
+    # Border
+    c.setStrokeColor(colors.HexColor('#166534'))
+    c.setLineWidth(3)
+    c.rect(40, 40, width - 80, height - 80)
+    c.setLineWidth(1)
+    c.rect(45, 45, width - 90, height - 90)
+
+    # Header
+    y = height - 100
+    c.setFont('Helvetica-Bold', 22)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, y, 'CARLOS HILADO MEMORIAL STATE UNIVERSITY')
+    y -= 22
+    c.setFont('Helvetica', 12)
+    c.setFillColor(colors.HexColor('#166534'))
+    c.drawCentredString(width / 2, y, 'Talisay City, Negros Occidental')
+    y -= 40
+    c.setFont('Helvetica-Bold', 18)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, y, 'CERTIFICATE OF COMPLETION')
+    y -= 15
+    c.setStrokeColor(colors.HexColor('#22c55e'))
+    c.setLineWidth(2)
+    c.line(width / 2 - 120, y, width / 2 + 120, y)
+    y -= 30
+
+    c.setFont('Helvetica', 12)
+    c.setFillColor(colors.black)
+    c.drawCentredString(width / 2, y, 'This is to certify that')
+    c.setStrokeColor(colors.HexColor('#14532d'))
+    c.setLineWidth(0.5)
+    c.line(width / 2 - 150, NAME_RULE_Y, width / 2 + 150, NAME_RULE_Y)
+
+
+def _draw_signatures(c):
+    """The two signature lines and labels, with the lines at y=0."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    width = letter[0]
+    c.setStrokeColor(colors.black)
+    c.setFillColor(colors.black)
+    c.setLineWidth(0.5)
+    # Left
+    c.line(80, 0, 260, 0)
+    c.setFont('Helvetica', 10)
+    c.drawCentredString(170, -14, 'Student Director')
+    # Right
+    c.line(width - 260, 0, width - 80, 0)
+    c.drawCentredString(width - 170, -14, 'Office Head / Supervisor')
+
+
+def _define_forms(c):
+    """
+    Record the static layout and the signature block as form XObjects on
+    *c*. The PDF stores each once and every page references it.
+    """
+    from reportlab.lib.pagesizes import letter
+
+    c.beginForm(LAYOUT_FORM)
+    _draw_layout(c)
+    c.endForm()
+    c.beginForm(SIGNATURES_FORM, lowerx=0, lowery=-20, upperx=letter[0], uppery=5)
+    _draw_signatures(c)
+    c.endForm()
+
+
+def draw_certificate(c, cert, shared_layout=False):
+    """
+    Draw one certificate page for *cert* on ReportLab canvas *c* (letter
+    size). With *shared_layout* the static parts are form XObjects
+    defined on the first page and referenced from every later one —
+    worth it for multi-page files; a one-page file is smaller and faster
+    drawn directly.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    width, height = letter
+    if shared_layout:
+        if not c.hasForm(LAYOUT_FORM):
+            _define_forms(c)
+        c.doForm(LAYOUT_FORM)
+    else:
+        _draw_layout(c)
+
+    # Body
+    c.setFont('Helvetica-Bold', 20)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, NAME_Y, cert['full_name'].upper())
+    y = NAME_RULE_Y - 25
+    c.setFont('Helvetica', 11)
+    c.setFillColor(colors.black)
+    c.drawCentredString(width / 2, y, f'Student ID: {cert["student_id"]}    |    Course: {cert["course"]}')
+    y -= 30
+    c.setFont('Helvetica', 12)
+
+    lines = [
+        'has successfully completed the Student Assistant Program',
+        f'at {cert["office_name"]}',
+        f'for {cert["semester_label"]}, A.Y. {cert["academic_year"]}',
+        f'from {cert["start"]} to {cert["end"]}',
+        f'with a total of {cert["total_hours"]:.1f} hours rendered.',
+    ]
+    for line in lines:
+        c.drawCentredString(width / 2, y, line)
+        y -= 20
+
+    report = cert['semester_report']
+    y -= 15
+    c.setFont('Helvetica', 10)
+    c.setFillColor(colors.HexColor('#374151'))
+    c.drawCentredString(width / 2, y, f'Attendance Rate: {report["attendance_rate"]}%    |    '
+                        f'Present: {report["present"]}    |    Late: {report["late"]}    |    '
+                        f'Absent: {report["absent"]}')
+
+    final_eval = cert['final_eval']
+    if final_eval:
+        y -= 25
+        c.drawCentredString(width / 2, y, f'Performance Rating: {final_eval["overall_rating"]}/5.00')
+        if final_eval['recommendation']:
+            y -= 16
+            c.drawCentredString(width / 2, y, f'Recommendation: {final_eval["recommendation"]}')
+
+    # The signature block sits below however many lines the body took
+    y -= 60
+    c.saveState()
+    c.translate(0, y)
+    if shared_layout:
+        c.doForm(SIGNATURES_FORM)
+    else:
+        _draw_signatures(c)
+    c.restoreState()
+
+    # Date
+    y -= 45
+    c.setFont('Helvetica', 10)
+    c.setFillColor(colors.HexColor('#6b7280'))
+    c.drawCentredString(width / 2, y, f'Issued on: {cert["issued"]}')
+
+    c.showPage()
+
+
+def render_certificate(cert):
+    """Return the PDF bytes of a single certificate."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    buf = BytesIO()
+    c = pdf_canvas.Canvas(buf, pagesize=letter)
+    draw_certificate(c, cert)
+    c.save()
+    return buf.getvalue()
+
+
+def render_chunk(certs):
+    """Pool task: ``[(filename, pdf_bytes), ...]`` for a list of certificate dicts."""
+    return [(certificate_filename(cert, unique=True), render_certificate(cert)) for cert in certs]
+
+
+# ── Bulk output ──────────────────────────────────────────────────
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def iter_rendered(certs, workers=1, progress=None):
+    """
+    Yield ``(filename, pdf_bytes)`` for every certificate, in order.
+
+    With *workers* > 1 the chunks are rendered in spawned processes.
+    *progress(done, total)* is called after each chunk.
+    """
+    total = len(certs)
+    done = 0
+    chunks = list(_chunks(certs, CHUNK_SIZE))
+    if workers > 1 and len(chunks) > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        results = pool.map(render_chunk, chunks)
+    else:
+        pool = None
+        results = map(render_chunk, chunks)
+    try:
+        for rendered in results:
+            yield from rendered
+            done += len(rendered)
+            if progress:
+                progress(done, total)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def write_zip(certs, out, workers=1, progress=None):
+    """Write a ZIP with one PDF per certificate to the file-like *out* (needn't be seekable)."""
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for filename, pdf_bytes in iter_rendered(certs, workers, progress):
+            zf.writestr(filename, pdf_bytes)
+
+
+def write_merged_pdf(certs, out, progress=None):
+    """
+    Write one PDF with a page per certificate to *out*. Drawn on a single
+    canvas, so fonts and the layout forms are stored once for the file.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    c = pdf_canvas.Canvas(out, pagesize=letter)
+    total = len(certs)
+    for done, cert in enumerate(certs, start=1):
+        draw_certificate(c, cert, shared_layout=True)
+        if progress and (done % CHUNK_SIZE == 0 or done == total):
+            progress(done, total)
+    c.save()
+
@@ -0,0 +1,135 @@
+"""
+Incremental exports for downstream systems (registrar, finance).
+
+Each feed returns rows created or changed since a cursor, ordered by
+``(updated_at, pk)``, plus the DeletedRecord tombstones written since
+then. The cursor is opaque to clients: they send back the
+``next_cursor`` of the previous page and stop when ``has_more`` is false.
+
+Rows touched in the last SETTLE_SECONDS are held back until the next
+sync. A request that saved a row just before the cursor's watermark may
+commit after a sync has read past it; the lag gives those transactions
+time to land so they aren't skipped.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    ActiveStudentAssistant, AttendanceRecord, DeletedRecord, NewApplication,
+    PerformanceEvaluation, RenewalApplication, compute_hours_worked,
+)
+
+SETTLE_SECONDS = 60
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 5000
+
+# feed name -> (model, exported columns)
+FEEDS = {
+    'new_applications': (NewApplication, [
+        'id', 'student_id', 'first_name', 'last_name', 'email', 'contact_number',
+        'course', 'year_level', 'semester', 'gpa', 'preferred_office_id',
+        'preferred_office__name', 'assigned_office', 'start_date', 'status',
+        'submitted_at', 'updated_at',
+    ]),
+    'renewal_applications': (RenewalApplication, [
+        'id', 'student_id', 'full_name', 'email', 'contact_number',
+        'course', 'year_level', 'semester', 'gpa', 'previous_office_id',
+        'preferred_office_id', 'preferred_office__name', 'assigned_office',
+        'hours_rendered', 'start_date', 'status', 'submitted_at', 'updated_at',
+    ]),
+    'active_sas': (ActiveStudentAssistant, [
+        'id', 'new_application_id', 'renewal_application_id', 'student_id',
+        'full_name', 'email', 'course', 'assigned_office_id', 'assigned_office__name',
+        'semester', 'academic_year', 'start_date', 'end_date', 'total_hours',
+        'required_hours', 'status', 'created_at', 'updated_at',
+    ]),
+    'attendance': (AttendanceRecord, [
+        'id', 'student_assistant_id', 'student_assistant__student_id', 'date',
+        'shift', 'time_in', 'time_out', 'status', 'remarks', 'created_at', 'updated_at',
+    ]),
+    'evaluations': (PerformanceEvaluation, [
+        'id', 'student_assistant_id', 'student_assistant__student_id',
+        'evaluation_period', 'work_quality', 'punctuality', 'initiative',
+        'cooperation', 'communication', 'overall_rating', 'recommendation_status',
+        'remarks', 'evaluated_by__username', 'evaluated_at', 'updated_at',
+    ]),
+}
+
+# model -> feed name, for writing tombstones
+MODEL_FEEDS = {model: name for name, (model, _) in FEEDS.items()}
+
+
+def encode_cursor(rows_mark, deleted_mark):
+    """Pack the ``(timestamp, pk)`` watermarks of both streams into an opaque string."""
+    payload = {
+        'u': [rows_mark[0].isoformat(), rows_mark[1]] if rows_mark else None,
+        'd': [deleted_mark[0].isoformat(), deleted_mark[1]] if deleted_mark else None,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of ``encode_cursor``; raises ValueError on anything malformed."""
+    if not cursor:
+        return None, None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        marks = []
+        for key in ('u', 'd'):
+            mark = payload.get(key)
+            marks.append((datetime.fromisoformat(mark[0]), int(mark[1])) if mark else None)
+    except (TypeError, ValueError, KeyError, IndexError, AttributeError):
+        raise ValueError('Invalid cursor.')
+    return marks[0], marks[1]
+
+
+def _after(mark, time_field):
+    if mark is None:
+        return Q()
+    ts, pk = mark
+    return Q(**{f'{time_field}__gt': ts}) | Q(**{time_field: ts, 'pk__gt': pk})
+
+
+def fetch_delta(feed, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    Return one page of the *feed* after *cursor*:
+    ``{'rows': [...], 'deleted': [...], 'next_cursor': str, 'has_more': bool}``.
+
+    Raises KeyError for an unknown feed and ValueError for a bad cursor.
+    """
+    model, columns = FEEDS[feed]
+    rows_mark, deleted_mark = decode_cursor(cursor)
+    limit = max(1, min(limit, MAX_LIMIT))
+    settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+
+    rows = list(
+        model.objects.filter(_after(rows_mark, 'updated_at'), updated_at__lte=settled)
+        .order_by('updated_at', 'pk')
+        .values(*columns)[:limit]
+    )
+    if model is AttendanceRecord:
+        for row in rows:
+            row['hours_worked'] = compute_hours_worked(row['date'], row['time_in'], row['time_out'])
+    if rows:
+        rows_mark = (rows[-1]['updated_at'], rows[-1]['id'])
+
+    deleted = list(
+        DeletedRecord.objects.filter(
+            _after(deleted_mark, 'deleted_at'), entity=feed, deleted_at__lte=settled,
+        )
+        .order_by('deleted_at', 'pk')
+        .values('id', 'object_pk', 'deleted_at')[:limit]
+    )
+    if deleted:
+        deleted_mark = (deleted[-1]['deleted_at'], deleted[-1]['id'])
+
+    return {
+        'rows': rows,
+        'deleted': [{'id': d['object_pk'], 'deleted_at': d['deleted_at']} for d in deleted],
+        'next_cursor': encode_cursor(rows_mark, deleted_mark),
+        'has_more': len(rows) == limit or len(deleted) == limit,
+    }
@@ -0,0 +1,237 @@
+"""
+Resized image variants for ID photos and announcement images.
+
+Derivatives are keyed by the SHA-256 of the source image, so their URLs
+change whenever the source bytes do and can be cached forever. They are
+generated on first request (inside the shared CPU budget, after the
+digest has been checked without reading the file where possible), stored
+through the default storage under ``derivatives/<sha>/`` and recorded in
+ImageDerivative. Sources outside DatabaseStorage are hashed once, off the
+request thread, and their digest is read back from ImageDerivative after
+that.
+"""
+import hashlib
+import logging
+import queue
+import re
+import threading
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+# variant -> (width, height, crop). Sizes are 2x the CSS box for HiDPI screens.
+VARIANTS = {
+    'avatar': (160, 160, True),     # office map popups
+    'card': (800, 500, False),      # announcement cards
+    'full': (1600, 1600, False),    # announcement popup / lightbox
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+_DIGEST_RE = re.compile(r'[0-9a-f]{64}')
+
+
+def webp_supported():
+    from PIL import features
+    return features.check('webp')
+
+
+def source_digest(field_file):
+    """
+    Return the SHA-256 of *field_file*'s contents, or None if not known yet.
+
+    DatabaseStorage already knows it (content-addressed blobs); for other
+    backends a previously generated derivative remembers it. Nothing here
+    reads the file, so it is safe to call while rendering a template.
+    """
+    from .models import ImageDerivative
+    from .storage import DatabaseStorage, db_file_meta
+
+    name = field_file.name
+    if isinstance(field_file.storage, DatabaseStorage):
+        meta = db_file_meta(name)
+        return meta['sha256'] if meta else None
+
+    return (
+        ImageDerivative.objects.filter(source_name=name)
+        .values_list('source_sha256', flat=True)
+        .first()
+    )
+
+
+def file_digest(storage, name):
+    """Hash a stored file chunk by chunk."""
+    sha = hashlib.sha256()
+    with storage.open(name, 'rb') as f:
+        for chunk in f.chunks():
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# ── First derivative of a non-database source ──
+# Its digest is unknown until the file is hashed, so that happens on a
+# per-process worker thread; pages show the original until it's done.
+_queue = None
+_queued = set()
+_lock = threading.Lock()
+_worker = None
+
+
+def _derive_loop():
+    from django.db import connection
+    from .limiter import cpu_slot
+
+    while True:
+        storage, name, variant = _queue.get()
+        try:
+            fmt = 'webp' if webp_supported() else 'jpeg'
+            with cpu_slot('image_derivative'):
+                get_or_create_derivative(name, file_digest(storage, name), variant, fmt)
+        except Exception:
+            logger.exception('Derivatives: cannot derive %s', name)
+        finally:
+            with _lock:
+                _queued.discard(name)
+            if _queue.empty():
+                connection.close()
+
+
+def _derive_in_background(field_file, variant):
+    global _queue, _worker
+
+    with _lock:
+        if field_file.name in _queued:
+            return
+        if _queue is None:
+            _queue = queue.Queue()
+        _queued.add(field_file.name)
+        _queue.put((field_file.storage, field_file.name, variant))
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_derive_loop, name='image-derivatives', daemon=True)
+            _worker.start()
+
+
+def derivative_url(field_file, variant):
+    """
+    URL of the *variant* rendition of an image field, or '' if it has no file.
+
+    Falls back to the original file's URL while the source's digest is
+    still being worked out, or if the source can't be read.
+    """
+    from .storage import DatabaseStorage
+
+    if not field_file:
+        return ''
+    try:
+        digest = source_digest(field_file)
+    except (OSError, ValueError):
+        digest = None
+    if not digest:
+        if isinstance(field_file.storage, DatabaseStorage):
+            logger.warning('Derivatives: cannot read source %s', field_file.name)
+        else:
+            _derive_in_background(field_file, variant)
+        return field_file.url
+    return reverse('home:image_derivative', kwargs={
+        'variant': variant, 'digest': digest, 'name': field_file.name,
+    })
+
+
+def _render(source, variant, fmt):
+    """Resize *source* (a file object) and return ``(bytes, width, height)``."""
+    from PIL import Image, ImageOps
+
+    width, height, crop = VARIANTS[variant]
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert('RGB')
+        if crop:
+            img = ImageOps.fit(img, (width, height), Image.LANCZOS)
+        else:
+            img.thumbnail((width, height), Image.LANCZOS)
+
+        out = BytesIO()
+        if fmt == 'webp':
+            img.save(out, 'WEBP', quality=WEBP_QUALITY, method=4)
+        else:
+            img.save(out, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return out.getvalue(), img.width, img.height
+
+
+def find_derivative(digest, variant, fmt):
+    """The already generated ImageDerivative for this digest/variant/format, or None."""
+    from .models import ImageDerivative
+
+    return ImageDerivative.objects.filter(source_sha256=digest, variant=variant, format=fmt).first()
+
+
+def check_source_digest(source_name, digest):
+    """
+    Reject a *digest* that can't be *source_name*'s without reading the
+    file: DatabaseStorage knows every file's digest, and for other backends
+    an earlier derivative of the same name does. Raises ValueError on a
+    mismatch and FileNotFoundError if a database file doesn't exist.
+    """
+    from .models import ImageDerivative
+    from .storage import DatabaseStorage, db_file_meta
+
+    if not _DIGEST_RE.fullmatch(digest):
+        raise ValueError(f'Malformed digest {digest!r}')
+    if isinstance(default_storage, DatabaseStorage):
+        meta = db_file_meta(source_name)
+        if meta is None:
+            raise FileNotFoundError(f'File not found: {source_name}')
+        known = meta['sha256']
+    else:
+        known = (
+            ImageDerivative.objects.filter(source_name=source_name)
+            .values_list('source_sha256', flat=True)
+            .first()
+        )
+    if known and known != digest:
+        raise ValueError(f'Source {source_name} does not match digest {digest}')
+
+
+def get_or_create_derivative(source_name, digest, variant, fmt):
+    """
+    Return the ImageDerivative for this source/variant/format, generating it
+    on first use. Raises ValueError if *source_name* doesn't hash to *digest*.
+    """
+    from .models import ImageDerivative
+
+    existing = find_derivative(digest, variant, fmt)
+    if existing:
+        return existing
+
+    check_source_digest(source_name, digest)
+    with default_storage.open(source_name, 'rb') as source:
+        data = source.read()
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f'Source {source_name} does not match digest {digest}')
+
+    rendered, width, height = _render(BytesIO(data), variant, fmt)
+    ext = 'webp' if fmt == 'webp' else 'jpg'
+    stored_name = default_storage.save(
+        f'derivatives/{digest[:2]}/{digest}/{variant}.{ext}', ContentFile(rendered),
+    )
+    try:
+        return ImageDerivative.objects.create(
+            source_sha256=digest,
+            source_name=source_name,
+            variant=variant,
+            format=fmt,
+            file=stored_name,
+            width=width,
+            height=height,
+            size=len(rendered),
+        )
+    except IntegrityError:
+        # Another worker rendered it first — keep theirs
+        default_storage.delete(stored_name)
+        return ImageDerivative.objects.get(source_sha256=digest, variant=variant, format=fmt)
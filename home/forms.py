@@ -140,6 +140,26 @@ def validate_image_type(value):
             )
 
 
+class NormalizeUploadsMixin:
+    """Downscale and re-encode uploaded images while cleaning (see home/uploads.py).
+
+    ``self.normalized_uploads`` maps each normalized field to its original,
+    for ``log_normalized_uploads`` once the instance is saved.
+    """
+
+    def _normalize(self, field_name, f):
+        from .models import UploadSettings
+        from .uploads import NormalizedFile, normalize_upload
+
+        if not hasattr(self, 'normalized_uploads'):
+            self.normalized_uploads = {}
+            self._upload_quality = UploadSettings.load().quality
+        f = normalize_upload(f, field_name, self._upload_quality)
+        if isinstance(f, NormalizedFile):
+            self.normalized_uploads[field_name] = f.original
+        return f
+
+
 class ReminderForm(AutoCapitalizeMixin, forms.ModelForm):
     class Meta:
         model = Reminder
@@ -203,7 +223,7 @@ class AnnouncementForm(AutoCapitalizeMixin, forms.ModelForm):
         }
 
 
-class NewApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
+class NewApplicationForm(NormalizeUploadsMixin, AutoCapitalizeMixin, forms.ModelForm):
     class Meta:
         model = NewApplication
         fields = [
@@ -346,6 +366,7 @@ class NewApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
         if f:
             validate_file_size(f)
             validate_document_type(f)
+            f = self._normalize(field_name, f)
         return f
 
     def _validate_img(self, field_name):
@@ -353,6 +374,7 @@ class NewApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
         if f:
             validate_file_size(f)
             validate_image_type(f)
+            f = self._normalize(field_name, f)
         return f
 
     def clean_application_form(self):
@@ -397,7 +419,7 @@ class NewApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
         return data
 
 
-class RenewalApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
+class RenewalApplicationForm(NormalizeUploadsMixin, AutoCapitalizeMixin, forms.ModelForm):
     class Meta:
         model = RenewalApplication
         fields = [
@@ -509,6 +531,7 @@ class RenewalApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
         if f:
             validate_file_size(f)
             validate_document_type(f)
+            f = self._normalize(field_name, f)
         return f
 
     def _validate_img(self, field_name):
@@ -516,6 +539,7 @@ class RenewalApplicationForm(AutoCapitalizeMixin, forms.ModelForm):
         if f:
             validate_file_size(f)
             validate_image_type(f)
+            f = self._normalize(field_name, f)
         return f
 
     def clean_id_picture(self):
@@ -587,7 +611,7 @@ class ScheduleResubmitForm(forms.Form):
 #  DOCUMENT RESUBMISSION FORM
 # ================================================================
 
-class DocumentResubmitForm(forms.Form):
+class DocumentResubmitForm(NormalizeUploadsMixin, forms.Form):
     """Form for students to re-upload documents requested by staff."""
     application_form = forms.FileField(required=False, validators=[validate_file_size, validate_document_type],
                                         widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.pdf,.jpg,.jpeg,.png'}))
@@ -612,6 +636,13 @@ class DocumentResubmitForm(forms.Form):
     evaluation_form = forms.FileField(required=False, validators=[validate_file_size, validate_document_type],
                                        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.pdf,.jpg,.jpeg,.png'}))
 
+    def clean(self):
+        cleaned_data = super().clean()
+        for field_name, f in list(cleaned_data.items()):
+            if f:
+                cleaned_data[field_name] = self._normalize(field_name, f)
+        return cleaned_data
+
 
 # ================================================================
 #  OFFICE FORM
@@ -0,0 +1,241 @@
+"""
+Cross-worker concurrency limiter for CPU-heavy endpoints.
+
+Every limiter name in CONCURRENCY_LIMITS draws from one shared CPU budget
+(CONCURRENCY_BUDGET, sized from the gunicorn worker count): ``slots`` lock
+files and ``queue`` waiting-room lock files under CONCURRENCY_LIMIT_DIR:
+
+    <CONCURRENCY_LIMIT_DIR>/cpu.slot.<n>       held while a request runs
+    <CONCURRENCY_LIMIT_DIR>/cpu.queue.<n>      held while a request waits
+    <CONCURRENCY_LIMIT_DIR>/<name>.stats.json  admitted / rejected counters
+
+A request takes a free slot, or else a free queue place and polls for a
+slot until ``timeout`` seconds pass. With no queue place left, or on
+timeout, it's shed with 503 and ``Retry-After``. The locks are flock()s,
+so every gunicorn worker on the node sees the same slots and a crashed
+worker releases its locks with its file descriptors. Queue depth and
+slots in use are read by probing the lock files, so they can't drift.
+Background work takes a slot with ``cpu_slot()``, which waits instead of
+shedding.
+
+On platforms without fcntl the limiter lets everything through.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.05  # seconds between slot attempts while queued
+BACKGROUND_POLL_INTERVAL = 0.25  # same, for background work in cpu_slot()
+
+# Lock-file prefix of the budget every limiter shares
+POOL = 'cpu'
+
+DEFAULT_BUDGET = {'slots': 1, 'queue': 0, 'timeout': 1}
+DEFAULT_RETRY_AFTER = 5
+
+
+def _config(name):
+    """The shared budget plus *name*'s ``retry_after``, or None if *name* isn't limited."""
+    limits = getattr(settings, 'CONCURRENCY_LIMITS', {})
+    if name not in limits:
+        return None
+    return {
+        **DEFAULT_BUDGET,
+        **getattr(settings, 'CONCURRENCY_BUDGET', {}),
+        'retry_after': limits[name].get('retry_after', DEFAULT_RETRY_AFTER),
+    }
+
+
+def _path(name, suffix):
+    return os.path.join(settings.CONCURRENCY_LIMIT_DIR, f'{name}.{suffix}')
+
+
+def _try_lock(path):
+    """Take an exclusive flock on *path* without blocking; return the fd or None."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _release(fd):
+    if fd is not None:
+        os.close(fd)  # closing the descriptor drops the flock
+
+
+def _grab(kind, count):
+    for n in range(count):
+        fd = _try_lock(_path(POOL, f'{kind}.{n}'))
+        if fd is not None:
+            return fd
+    return None
+
+
+def _held(kind, count):
+    """How many of the shared *kind* lock files are currently held by some process."""
+    held = 0
+    for n in range(count):
+        fd = _try_lock(_path(POOL, f'{kind}.{n}'))
+        if fd is None:
+            held += 1
+        else:
+            _release(fd)
+    return held
+
+
+# ── Counters ─────────────────────────────────────────────────────
+
+def _bump(name, **increments):
+    """Add *increments* to the counters in ``<name>.stats.json`` under a lock."""
+    fd = os.open(_path(name, 'stats.json'), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        with os.fdopen(os.dup(fd), 'r+') as f:
+            try:
+                stats = json.load(f)
+            except ValueError:
+                stats = {}
+            for key, value in increments.items():
+                stats[key] = stats.get(key, 0) + value
+            f.seek(0)
+            f.truncate()
+            json.dump(stats, f)
+    except OSError:
+        logger.exception('Could not update limiter counters for %s', name)
+    finally:
+        os.close(fd)
+
+
+def _read_counters(name):
+    try:
+        with open(_path(name, 'stats.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def stats():
+    """
+    Current state and lifetime counters for every configured limiter.
+    ``slots``, ``in_use`` and the queue figures describe the shared budget.
+    """
+    result = {}
+    for name in getattr(settings, 'CONCURRENCY_LIMITS', {}):
+        config = _config(name)
+        entry = {
+            'slots': config['slots'],
+            'queue_size': config['queue'],
+            'admitted': 0,
+            'queued': 0,
+            'rejected_queue_full': 0,
+            'rejected_timeout': 0,
+            'wait_ms_total': 0,
+        }
+        if fcntl is not None:
+            os.makedirs(settings.CONCURRENCY_LIMIT_DIR, exist_ok=True)
+            entry['in_use'] = _held('slot', config['slots'])
+            entry['queue_depth'] = _held('queue', config['queue'])
+            entry.update(_read_counters(name))
+        result[name] = entry
+    return result
+
+
+# ── Decorator ────────────────────────────────────────────────────
+
+def _busy_response(config, json_response):
+    message = 'The server is busy processing other requests. Please try again in a few seconds.'
+    if json_response:
+        response = JsonResponse({'status': 'error', 'message': message}, status=503)
+    else:
+        response = HttpResponse(message, status=503, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(config['retry_after'])
+    return response
+
+
+def concurrency_limit(name, json_response=False):
+    """
+    Run the decorated view only inside the shared CPU budget, across all
+    workers; *name* picks the ``CONCURRENCY_LIMITS`` entry (Retry-After)
+    and the counters. Views with no configured limit run unrestricted.
+    Shed requests get a 503 — JSON if *json_response*, plain text
+    otherwise.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            config = _config(name)
+            if config is None or fcntl is None:
+                return view_func(request, *args, **kwargs)
+            os.makedirs(settings.CONCURRENCY_LIMIT_DIR, exist_ok=True)
+
+            slot = _grab('slot', config['slots'])
+            waited = 0.0
+            if slot is None:
+                place = _grab('queue', config['queue'])
+                if place is None:
+                    _bump(name, rejected_queue_full=1)
+                    logger.warning('Shedding %s request: queue full', name)
+                    return _busy_response(config, json_response)
+                start = time.monotonic()
+                try:
+                    while slot is None and time.monotonic() - start < config['timeout']:
+                        time.sleep(POLL_INTERVAL)
+                        slot = _grab('slot', config['slots'])
+                finally:
+                    _release(place)
+                waited = time.monotonic() - start
+                if slot is None:
+                    _bump(name, queued=1, rejected_timeout=1, wait_ms_total=round(waited * 1000))
+                    logger.warning('Shedding %s request: no slot after %.1f s', name, waited)
+                    return _busy_response(config, json_response)
+
+            try:
+                _bump(name, admitted=1, queued=1 if waited else 0, wait_ms_total=round(waited * 1000))
+                return view_func(request, *args, **kwargs)
+            finally:
+                _release(slot)
+        return _wrapped
+    return decorator
+
+
+@contextlib.contextmanager
+def cpu_slot(name):
+    """
+    Hold a slot of the shared CPU budget for background work (a render
+    thread, a management command), counted under *name*. Unlike the
+    decorator it never sheds: it waits as long as it takes for a slot,
+    without taking a queue place from web requests.
+    """
+    config = _config(name)
+    if config is None or fcntl is None:
+        yield
+        return
+    os.makedirs(settings.CONCURRENCY_LIMIT_DIR, exist_ok=True)
+    start = time.monotonic()
+    slot = _grab('slot', config['slots'])
+    queued = slot is None
+    while slot is None:
+        time.sleep(BACKGROUND_POLL_INTERVAL)
+        slot = _grab('slot', config['slots'])
+    waited = time.monotonic() - start if queued else 0
+    try:
+        _bump(name, admitted=1, queued=int(queued), wait_ms_total=round(waited * 1000))
+        yield
+    finally:
+        _release(slot)
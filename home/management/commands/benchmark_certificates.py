@@ -0,0 +1,207 @@
+import io
+import math
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.certificates import render_certificate, write_merged_pdf, write_zip
+
+
+def synthetic_certificates(count):
+    """Certificate dicts shaped like ``certificate_data()`` output, a third without a final evaluation."""
+    certs = []
+    for i in range(count):
+        certs.append({
+            'pk': i,
+            'full_name': f'Student Assistant {i:04d}',
+            'student_id': f'2026{i:04d}',
+            'course': 'BS Information Technology',
+            'office_name': 'Office of the Registrar',
+            'semester_label': '1st Semester',
+            'academic_year': '2026-2027',
+            'start': 'June 01, 2026',
+            'end': 'October 09, 2026',
+            'total_hours': 200.0 + i % 7,
+            'semester_report': {'total': 80, 'present': 70, 'late': 6, 'absent': 4, 'attendance_rate': 95.0},
+            'final_eval': None if i % 3 == 0 else {
+                'overall_rating': '4.20',
+                'recommendation': 'Recommend for Rehire' if i % 2 else '',
+            },
+            'issued': 'October 19, 2026',
+        })
+    return certs
+
+
+def legacy_draw(c, cert):
+    """The pre-template drawing: every line of the static layout redrawn per page."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    width, height = letter
+    c.setStrokeColor(colors.HexColor('#166534'))
+    c.setLineWidth(3)
+    c.rect(40, 40, width - 80, height - 80)
+    c.setLineWidth(1)
+    c.rect(45, 45, width - 90, height - 90)
+    y = height - 100
+    c.setFont('Helvetica-Bold', 22)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, y, 'CARLOS HILADO MEMORIAL STATE UNIVERSITY')
+    y -= 22
+    c.setFont('Helvetica', 12)
+    c.setFillColor(colors.HexColor('#166534'))
+    c.drawCentredString(width / 2, y, 'Talisay City, Negros Occidental')
+    y -= 40
+    c.setFont('Helvetica-Bold', 18)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, y, 'CERTIFICATE OF COMPLETION')
+    y -= 15
+    c.setStrokeColor(colors.HexColor('#22c55e'))
+    c.setLineWidth(2)
+    c.line(width / 2 - 120, y, width / 2 + 120, y)
+    y -= 30
+    c.setFont('Helvetica', 12)
+    c.setFillColor(colors.black)
+    c.drawCentredString(width / 2, y, 'This is to certify that')
+    y -= 35
+    c.setFont('Helvetica-Bold', 20)
+    c.setFillColor(colors.HexColor('#14532d'))
+    c.drawCentredString(width / 2, y, cert['full_name'].upper())
+    y -= 15
+    c.setStrokeColor(colors.HexColor('#14532d'))
+    c.setLineWidth(0.5)
+    c.line(width / 2 - 150, y, width / 2 + 150, y)
+    y -= 25
+    c.setFont('Helvetica', 11)
+    c.setFillColor(colors.black)
+    c.drawCentredString(width / 2, y, f'Student ID: {cert["student_id"]}    |    Course: {cert["course"]}')
+    y -= 30
+    c.setFont('Helvetica', 12)
+    for line in [
+        'has successfully completed the Student Assistant Program',
+        f'at {cert["office_name"]}',
+        f'for {cert["semester_label"]}, A.Y. {cert["academic_year"]}',
+        f'from {cert["start"]} to {cert["end"]}',
+        f'with a total of {cert["total_hours"]:.1f} hours rendered.',
+    ]:
+        c.drawCentredString(width / 2, y, line)
+        y -= 20
+    report = cert['semester_report']
+    y -= 15
+    c.setFont('Helvetica', 10)
+    c.setFillColor(colors.HexColor('#374151'))
+    c.drawCentredString(width / 2, y, f'Attendance Rate: {report["attendance_rate"]}%    |    '
+                        f'Present: {report["present"]}    |    Late: {report["late"]}    |    '
+                        f'Absent: {report["absent"]}')
+    final_eval = cert['final_eval']
+    if final_eval:
+        y -= 25
+        c.setFont('Helvetica', 10)
+        c.setFillColor(colors.HexColor('#374151'))
+        c.drawCentredString(width / 2, y, f'Performance Rating: {final_eval["overall_rating"]}/5.00')
+        if final_eval['recommendation']:
+            y -= 16
+            c.drawCentredString(width / 2, y, f'Recommendation: {final_eval["recommendation"]}')
+    y -= 60
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(0.5)
+    c.line(80, y, 260, y)
+    c.setFont('Helvetica', 10)
+    c.drawCentredString(170, y - 14, 'Student Director')
+    c.line(width - 260, y, width - 80, y)
+    c.drawCentredString(width - 170, y - 14, 'Office Head / Supervisor')
+    y -= 45
+    c.setFont('Helvetica', 10)
+    c.setFillColor(colors.HexColor('#6b7280'))
+    c.drawCentredString(width / 2, y, f'Issued on: {cert["issued"]}')
+    c.showPage()
+
+
+def legacy_render(cert):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    buf = io.BytesIO()
+    c = pdf_canvas.Canvas(buf, pagesize=letter)
+    legacy_draw(c, cert)
+    c.save()
+    return buf.getvalue()
+
+
+def legacy_merged(certs, out):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    c = pdf_canvas.Canvas(out, pagesize=letter)
+    for cert in certs:
+        legacy_draw(c, cert)
+    c.save()
+
+
+def _timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[math.ceil(len(samples) * 0.95) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark completion-certificate rendering: per-page drawing vs the shared layout forms.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=300,
+            help='Certificates per bulk run (default: 300)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed runs for the single-certificate case (default: 50)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for the parallel ZIP run (default: number of CPUs)',
+        )
+
+    def handle(self, *args, **options):
+        count = max(1, options['count'])
+        iterations = max(1, options['iterations'])
+        certs = synthetic_certificates(count)
+        cert = certs[1]
+        legacy_render(cert), render_certificate(cert)  # import and font set-up
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Single certificate (ms, mean / p95 over {iterations} run(s))'
+        ))
+        legacy_mean, legacy_p95 = _timed(lambda: legacy_render(cert), iterations)
+        new_mean, new_p95 = _timed(lambda: render_certificate(cert), iterations)
+        self.stdout.write(f'  {"legacy":<10} {legacy_mean:>8.2f} / {legacy_p95:>6.2f}   {len(legacy_render(cert)):>7} B')
+        self.stdout.write(f'  {"layout":<10} {new_mean:>8.2f} / {new_p95:>6.2f}   {len(render_certificate(cert)):>7} B')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Bulk, {count} certificate(s)'))
+        self.stdout.write(f'  {"output":<24} {"total ms":>9} {"ms/cert":>8} {"certs/s":>8} {"size KB":>8}')
+        runs = [
+            ('merged PDF, legacy', lambda out: legacy_merged(certs, out)),
+            ('merged PDF, layout', lambda out: write_merged_pdf(certs, out)),
+            ('ZIP, 1 process', lambda out: write_zip(certs, out, workers=1)),
+            (f'ZIP, {options["workers"]} processes', lambda out: write_zip(certs, out, workers=options['workers'])),
+        ]
+        for label, run in runs:
+            out = io.BytesIO()
+            start = time.perf_counter()
+            run(out)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f'  {label:<24} {elapsed:>9.0f} {elapsed / count:>8.2f} '
+                f'{count / elapsed * 1000:>8.0f} {len(out.getvalue()) / 1024:>8.1f}'
+            )
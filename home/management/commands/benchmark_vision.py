@@ -0,0 +1,174 @@
+import math
+import statistics
+import time
+
+import cv2
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from home.vision import ANALYSIS_MAX_EDGE, analyze_bytes, warm_up
+from home.vision.analysis import _fit
+from home.vision.camera import CAMERA_MAX_EDGE, process_camera_image
+
+
+def synthetic_document(height, width, seed=1, noise_sigma=3):
+    """A text-heavy, slightly noisy page — roughly what a phone scan looks like."""
+    rng = np.random.default_rng(seed)
+    img = np.full((height, width, 3), 235, np.uint8)
+    for i in range(60):
+        y = int(rng.integers(50, height - 50))
+        x = int(rng.integers(20, width // 2))
+        cv2.putText(img, f'Certificate of Enrolment 2026 {i}', (x, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, height / 1500, (30, 30, 30), max(1, height // 1000))
+    noise = rng.normal(0, noise_sigma, img.shape)
+    return np.clip(img + noise, 0, 255).astype(np.uint8)
+
+
+def legacy_analysis(file_bytes, detect_faces):
+    """The pre-engine path: full-resolution decode, cascade loaded per call."""
+    img = cv2.imdecode(np.frombuffer(file_bytes, np.uint8), cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    cv2.Laplacian(gray, cv2.CV_64F).var()
+    gray.std()
+    if detect_faces:
+        cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
+
+
+def legacy_camera(img_bytes):
+    """The pre-pipeline capture path: full-size CLAHE + colour NL-means, PNG output."""
+    img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+    l, a, b = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2LAB))
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    img = cv2.cvtColor(cv2.merge([clahe.apply(l), a, b]), cv2.COLOR_LAB2BGR)
+    img = cv2.fastNlMeansDenoisingColored(img, None, 5, 5, 7, 21)
+    return cv2.imencode('.png', img)[1].tobytes()
+
+
+def _psnr(output_bytes, reference):
+    """PSNR of a processed capture against the noise-free frame at the same size."""
+    out = cv2.imdecode(np.frombuffer(output_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if out.shape[:2] != reference.shape[:2]:
+        reference = cv2.resize(reference, (out.shape[1], out.shape[0]), interpolation=cv2.INTER_AREA)
+    return cv2.PSNR(out, reference)
+
+
+def _timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[math.ceil(len(samples) * 0.95) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark the image-analysis engine against the old full-resolution path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'images',
+            nargs='*',
+            help='Image files to benchmark (default: synthetic scans at common phone/webcam sizes)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Timed runs per image and path (default: 5)',
+        )
+        parser.add_argument(
+            '--camera',
+            action='store_true',
+            help='Benchmark the webcam capture pipeline (latency, output size, PSNR) instead',
+        )
+        parser.add_argument(
+            '--calibrate',
+            action='store_true',
+            help='Print blur scores for increasingly blurred synthetic scans instead',
+        )
+
+    def handle(self, *args, **options):
+        if options['calibrate']:
+            return self._calibrate()
+        if options['camera']:
+            return self._camera(max(1, options['iterations']))
+
+        samples = []
+        if options['images']:
+            for path in options['images']:
+                with open(path, 'rb') as f:
+                    samples.append((path, f.read()))
+        else:
+            for height, width, ext in [(4000, 3000, '.jpg'), (2000, 1500, '.jpg'), (960, 1280, '.png')]:
+                ok, buf = cv2.imencode(ext, synthetic_document(height, width))
+                samples.append((f'synthetic {width}x{height}{ext}', buf.tobytes()))
+
+        warm_up()
+        iterations = max(1, options['iterations'])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Image analysis latency per image (ms, mean / p95 over {iterations} run(s), face check on)'
+        ))
+        self.stdout.write(f'  {"image":<32} {"legacy":>17} {"engine":>17} {"speed-up":>9}')
+        for label, data in samples:
+            legacy_mean, legacy_p95 = _timed(lambda: legacy_analysis(data, True), iterations)
+            engine_mean, engine_p95 = _timed(lambda: analyze_bytes(data, detect_faces=True), iterations)
+            self.stdout.write(
+                f'  {label[:32]:<32} {legacy_mean:>8.1f} / {legacy_p95:>6.1f} '
+                f'{engine_mean:>8.1f} / {engine_p95:>6.1f} {legacy_mean / engine_mean:>8.1f}x'
+            )
+
+    def _calibrate(self):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Laplacian variance: full resolution vs {ANALYSIS_MAX_EDGE}px analysis size'
+        ))
+        self.stdout.write(f'  {"size":<11} {"blur σ":>6} {"full-res":>10} {"analysis":>10} {"σ at analysis":>14}')
+        for height, width in [(4000, 3000), (2000, 1500), (1280, 960)]:
+            gray = cv2.cvtColor(synthetic_document(height, width), cv2.COLOR_BGR2GRAY)
+            for sigma in (0, 1, 2, 3, 4, 6, 8):
+                blurred = cv2.GaussianBlur(gray, (0, 0), sigma) if sigma else gray
+                scale = min(1.0, ANALYSIS_MAX_EDGE / max(height, width))
+                self.stdout.write(
+                    f'  {width}x{height:<6} {sigma:>6} '
+                    f'{cv2.Laplacian(blurred, cv2.CV_64F).var():>10.1f} '
+                    f'{cv2.Laplacian(_fit(blurred), cv2.CV_64F).var():>10.1f} '
+                    f'{sigma * scale:>14.2f}'
+                )
+
+    def _camera(self, iterations):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Camera capture pipeline (ms, mean / p95 over {iterations} run(s); '
+            f'output capped at {CAMERA_MAX_EDGE}px)'
+        ))
+        self.stdout.write(
+            f'  {"frame":<10} {"path":<10} {"latency":>17} {"output":>9} {"PSNR":>7}  stages (mean ms)'
+        )
+        # Canvas captures arrive as PNG; noise roughly that of an indoor webcam
+        for width, height in [(640, 480), (1280, 720), (1920, 1080), (3840, 2160)]:
+            clean = synthetic_document(height, width, noise_sigma=0)
+            frame = cv2.imencode('.png', synthetic_document(height, width, noise_sigma=8))[1].tobytes()
+            label = f'{width}x{height}'
+
+            output = legacy_camera(frame)
+            mean, p95 = _timed(lambda: legacy_camera(frame), iterations)
+            self.stdout.write(
+                f'  {label:<10} {"legacy":<10} {mean:>8.1f} / {p95:>6.1f} '
+                f'{len(output) / 1024:>7.0f}KB {_psnr(output, clean):>6.1f}dB'
+            )
+
+            for denoise in ('bilateral', 'luma'):
+                stage_totals = {}
+
+                def run():
+                    _, timings = process_camera_image(frame, denoise=denoise)
+                    for stage, ms in timings.items():
+                        stage_totals[stage] = stage_totals.get(stage, 0) + ms
+
+                output, _ = process_camera_image(frame, denoise=denoise)
+                mean, p95 = _timed(run, iterations)
+                stages = ' '.join(f'{stage}={ms / iterations:.1f}' for stage, ms in stage_totals.items())
+                self.stdout.write(
+                    f'  {label:<10} {denoise:<10} {mean:>8.1f} / {p95:>6.1f} '
+                    f'{len(output) / 1024:>7.0f}KB {_psnr(output, clean):>6.1f}dB  {stages}'
+                )
@@ -0,0 +1,73 @@
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.certificates import certificate_data, write_merged_pdf, write_zip
+from home.models import ActiveStudentAssistant, Office
+
+
+class Command(BaseCommand):
+    help = (
+        'Render completion certificates for every completed SA matching the '
+        'filters into a ZIP (one PDF each, rendered in parallel) or one merged PDF.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--office', help='Office name or ID (default: all offices)')
+        parser.add_argument(
+            '--semester',
+            choices=[value for value, _ in ActiveStudentAssistant.SEMESTER_CHOICES],
+            help='Only this semester',
+        )
+        parser.add_argument('--academic-year', help='Only this academic year, e.g. 2024-2025')
+        parser.add_argument(
+            '--format',
+            choices=['zip', 'pdf'],
+            default='zip',
+            help='zip: one PDF per SA; pdf: a single merged PDF (default: zip)',
+        )
+        parser.add_argument('--output', help='Output file (default: Completion_Certificates_<date>.<format>)')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for ZIP output (default: number of CPUs)',
+        )
+
+    def handle(self, *args, **options):
+        sas = ActiveStudentAssistant.objects.select_related('assigned_office').filter(status='completed')
+        if options['office']:
+            lookup = {'pk': options['office']} if options['office'].isdigit() else {'name__iexact': options['office']}
+            office = Office.objects.filter(**lookup).first()
+            if office is None:
+                raise CommandError(f'No office matches "{options["office"]}".')
+            sas = sas.filter(assigned_office=office)
+        if options['semester']:
+            sas = sas.filter(semester=options['semester'])
+        if options['academic_year']:
+            sas = sas.filter(academic_year=options['academic_year'])
+
+        certs = certificate_data(sas.order_by('assigned_office__name', 'full_name'))
+        if not certs:
+            self.stdout.write(self.style.WARNING('No completed SAs match those filters.'))
+            return
+
+        fmt = options['format']
+        output = options['output'] or f'Completion_Certificates_{date.today().strftime("%Y%m%d")}.{fmt}'
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Rendering {len(certs)} certificate(s) → {output}'
+        ))
+
+        def progress(done, total):
+            self.stdout.write(f'  … {done}/{total}')
+
+        with open(output, 'wb') as out:
+            if fmt == 'pdf':
+                write_merged_pdf(certs, out, progress=progress)
+            else:
+                write_zip(certs, out, workers=max(1, options['workers']), progress=progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done — {len(certs)} certificate(s), {os.path.getsize(output) / 1024:.1f} KB.'
+        ))
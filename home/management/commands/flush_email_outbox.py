@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from home.models import EmailOutbox
+from home.outbox import flush_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails (report PDFs etc.) and retry ones that failed. Safe to run from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Also re-queue emails that already used up their retry attempts',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Flushing email outbox…'))
+        sent, failed = flush_outbox(include_failed=options['retry_failed'])
+        waiting = EmailOutbox.objects.filter(status='queued').count()
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f'Done — {sent} sent, {failed} failed, {waiting} still queued.'))
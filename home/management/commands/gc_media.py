@@ -0,0 +1,158 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from home.models import DBBlob, DBFile, ImageDerivative
+from home.storage import DatabaseStorage
+
+
+def referenced_file_names():
+    """Every file name stored in a FileField/ImageField of a ``home`` model.
+
+    Derivatives are left out: they're swept separately once their source
+    is no longer referenced.
+    """
+    names = set()
+    for model in apps.get_app_config('home').get_models():
+        if model is ImageDerivative:
+            continue
+        file_fields = [f.name for f in model._meta.get_fields() if isinstance(f, models.FileField)]
+        for field_name in file_fields:
+            names.update(
+                model.objects.exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__isnull': True})
+                .values_list(field_name, flat=True)
+                .iterator()
+            )
+    return names
+
+
+class Command(BaseCommand):
+    help = (
+        'Mark-and-sweep garbage collection for media: deletes DBFile rows, image '
+        'derivatives and camera captures that no model references any more.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting anything',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='DBFile rows examined per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='Never delete anything newer than this many hours (default: 24)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = max(1, options['batch_size'])
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        prefix = '[dry run] ' if dry_run else ''
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{prefix}Marking referenced files…'))
+        referenced = referenced_file_names()
+        self.stdout.write(f'  {len(referenced)} referenced file(s)')
+
+        derivatives_removed = self._sweep_derivatives(referenced, cutoff, dry_run)
+        referenced.update(ImageDerivative.objects.values_list('file', flat=True))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{prefix}Sweeping database files…'))
+        files_scanned, files_removed, bytes_freed = self._sweep_db_files(
+            referenced, cutoff, batch_size, dry_run,
+        )
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{prefix}Sweeping camera captures…'))
+        photos_removed, photo_bytes = self._sweep_camera_photos(cutoff, dry_run)
+
+        verb = 'would be freed' if dry_run else 'freed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}Done — scanned {files_scanned} DBFile row(s): removed {files_removed} '
+            f'({bytes_freed / (1024 * 1024):.1f} MB {verb}), {derivatives_removed} derivative(s), '
+            f'{photos_removed} camera photo(s) ({photo_bytes / (1024 * 1024):.1f} MB {verb}).'
+        ))
+
+    def _sweep_derivatives(self, referenced, cutoff, dry_run):
+        stale = ImageDerivative.objects.exclude(source_name__in=referenced).filter(created_at__lt=cutoff)
+        removed = 0
+        for derivative in stale.iterator():
+            removed += 1
+            if dry_run:
+                self.stdout.write(f'  would remove derivative {derivative.file.name}')
+                continue
+            derivative.file.delete(save=False)
+            derivative.delete()
+        return removed
+
+    def _sweep_db_files(self, referenced, cutoff, batch_size, dry_run):
+        """Bytes freed only count blobs that end up deleted, not ones another name still shares."""
+        storage = DatabaseStorage()
+        scanned = removed = freed = 0
+        released = Counter()  # dry run: blob_id -> names that would drop it
+        last_pk = 0
+        while True:
+            batch = list(
+                DBFile.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'name', 'blob_id', 'size', 'created_at')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            scanned += len(batch)
+            for _, name, blob_id, size, created_at in batch:
+                if name in referenced or created_at >= cutoff:
+                    continue
+                removed += 1
+                if dry_run:
+                    released[blob_id] += 1
+                    self.stdout.write(f'  would remove {name} ({size} bytes)')
+                else:
+                    freed += storage.delete(name)
+            self.stdout.write(f'  … {scanned} scanned, {removed} unreferenced')
+        if dry_run:
+            for blob_id, ref_count, size in (
+                DBBlob.objects.filter(pk__in=released).values_list('pk', 'ref_count', 'size').iterator()
+            ):
+                if released[blob_id] >= ref_count:
+                    freed += size
+        return scanned, removed, freed
+
+    def _sweep_camera_photos(self, cutoff, dry_run):
+        photo_dir = os.path.join(settings.MEDIA_ROOT, 'camera_photos')
+        cutoff_ts = cutoff.timestamp()
+        removed = freed = 0
+        try:
+            entries = list(os.scandir(photo_dir))
+        except FileNotFoundError:
+            return 0, 0
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+            if st.st_mtime >= cutoff_ts:
+                continue  # a capture that may still be attached to a form
+            removed += 1
+            freed += st.st_size
+            if dry_run:
+                self.stdout.write(f'  would remove camera_photos/{entry.name}')
+                continue
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+        return removed, freed
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, InvalidStorageError, storages
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from home.management.commands.gc_media import referenced_file_names
+from home.models import ImageDerivative, MediaMigrationProgress
+
+# Files up to this size are spooled in memory while copying; larger ones go to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _sha256_of(storage, name):
+    sha = hashlib.sha256()
+    with storage.open(name, 'rb') as f:
+        for chunk in f.chunks():
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def copy_file(source, target, name):
+    """
+    Copy *name* from *source* to *target* under the same name and verify it.
+
+    Returns ``(sha256, size)``. Raises on any failure, including a checksum
+    mismatch after the copy.
+    """
+    try:
+        sha = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+            with source.open(name, 'rb') as f:
+                for chunk in f.chunks():
+                    sha.update(chunk)
+                    size += len(chunk)
+                    spool.write(chunk)
+            digest = sha.hexdigest()
+
+            if target.exists(name):
+                if _sha256_of(target, name) == digest:
+                    return digest, size
+                target.delete(name)
+
+            spool.seek(0)
+            saved_name = target.save(name, File(spool, name=name))
+        if saved_name != name:
+            target.delete(saved_name)
+            raise ValueError(f'target stored the file as {saved_name}')
+
+        copied = _sha256_of(target, name)
+        if copied != digest:
+            raise ValueError(f'checksum mismatch after copy ({copied} != {digest})')
+        return digest, size
+    finally:
+        # Worker threads each hold their own DB connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy every referenced media file from one storage backend to another '
+        '(e.g. database → s3), verifying SHA-256 checksums. Progress is recorded '
+        'per file, so an interrupted run picks up where it stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            default='default',
+            help='STORAGES alias to copy from (default: default)',
+        )
+        parser.add_argument(
+            '--target',
+            help='STORAGES alias to copy to, e.g. database, filesystem or s3',
+        )
+        parser.add_argument(
+            '--target-dir',
+            help='Copy into a local directory instead of a STORAGES alias',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of files copied concurrently (default: 4)',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Retry files that failed in a previous run (done files are always skipped)',
+        )
+
+    def _storage(self, alias):
+        try:
+            return storages[alias]
+        except InvalidStorageError:
+            raise CommandError(f'Unknown storage alias "{alias}".')
+
+    def handle(self, *args, **options):
+        if bool(options['target']) == bool(options['target_dir']):
+            raise CommandError('Give exactly one of --target or --target-dir.')
+
+        source_label = options['source']
+        source = self._storage(source_label)
+        if options['target_dir']:
+            target_label = os.path.abspath(options['target_dir'])
+            target = FileSystemStorage(location=target_label)
+        else:
+            target_label = options['target']
+            target = self._storage(target_label)
+        if source_label == target_label:
+            raise CommandError('Source and target are the same storage.')
+
+        names = referenced_file_names()
+        names.update(ImageDerivative.objects.values_list('file', flat=True))
+        progress = MediaMigrationProgress.objects.filter(source=source_label, target=target_label)
+        skip_status = ['done'] if options['retry_failed'] else ['done', 'failed']
+        finished = set(progress.filter(status__in=skip_status).values_list('name', flat=True))
+        pending = sorted(names - finished)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Migrating media {source_label} → {target_label}: {len(pending)} file(s) to copy, '
+            f'{len(names) - len(pending)} already handled.'
+        ))
+
+        copied = failed = total_bytes = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            futures = {pool.submit(copy_file, source, target, name): name for name in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                name = futures[future]
+                defaults = {'status': 'done', 'error': ''}
+                try:
+                    defaults['sha256'], defaults['size'] = future.result()
+                    copied += 1
+                    total_bytes += defaults['size']
+                except Exception as exc:
+                    defaults = {'status': 'failed', 'error': str(exc)}
+                    failed += 1
+                    self.stderr.write(f'  ✗ {name}: {exc}')
+                MediaMigrationProgress.objects.update_or_create(
+                    source=source_label, target=target_label, name=name, defaults=defaults,
+                )
+                if done % 50 == 0 or done == len(pending):
+                    self.stdout.write(f'  … {done}/{len(pending)}')
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Done — {copied} file(s) copied and verified ({total_bytes / (1024 * 1024):.1f} MB), '
+            f'{failed} failed.'
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from home.reports import request_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the department report PDF for the current data if it is not '
+        'cached yet, so the first director to open it gets it instantly.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Pre-rendering department report…'))
+        snapshot = request_snapshot(background=False)
+        if snapshot.status == 'ready':
+            self.stdout.write(self.style.SUCCESS(
+                f'Report {snapshot.version[:12]} is ready ({snapshot.file.name}).'
+            ))
+        elif snapshot.status == 'pending':
+            self.stdout.write(self.style.WARNING(
+                f'Report {snapshot.version[:12]} is already being rendered by another process.'
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'Report {snapshot.version[:12]} failed to render: {snapshot.error}'
+            ))
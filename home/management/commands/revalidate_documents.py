@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from home.models import DocumentValidation, NewApplication, RenewalApplication
+from home.vision import is_image_name
+from home.vision.batch import check_stored_document, init_worker
+
+# Statuses where a bad upload still matters to a reviewer
+FINAL_STATUSES = {'approved', 'rejected'}
+
+
+def _image_documents(model, label_fields, statuses):
+    """Yield ``(label, status, file_name, field_name)`` for every stored image on *model*."""
+    file_fields = [f.name for f in model._meta.get_fields() if isinstance(f, models.FileField)]
+    rows = model.objects.all()
+    if statuses:
+        rows = rows.filter(status__in=statuses)
+    for row in rows.order_by('pk').values('status', *label_fields, *file_fields).iterator():
+        label = ' '.join(str(row[f]) for f in label_fields[:-1])
+        label = f'{label} ({row[label_fields[-1]]})'
+        if model is RenewalApplication:
+            label = f'[Renewal] {label}'
+        for field_name in file_fields:
+            name = row[field_name]
+            if name and is_image_name(name):
+                yield label, row['status'], name, field_name
+
+
+def _iter_documents(statuses):
+    yield from _image_documents(NewApplication, ['first_name', 'last_name', 'student_id'], statuses)
+    yield from _image_documents(RenewalApplication, ['full_name', 'student_id'], statuses)
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-run the blur, blank and face checks on every stored image document '
+        'and refresh DocumentValidation — e.g. after the thresholds change.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: number of CPUs)',
+        )
+        parser.add_argument(
+            '--max-in-flight',
+            type=int,
+            default=0,
+            help='Documents queued or being checked at once; bounds memory (default: 2 × workers)',
+        )
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=[value for value, _ in NewApplication.STATUS_CHOICES],
+            help='Only applications in this status (repeatable; default: all)',
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Skip files that already have a stored validation result (failed attempts are retried)',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        max_in_flight = max(1, options['max_in_flight'] or workers * 2)
+        statuses = options['status']
+
+        documents = _iter_documents(statuses)
+        if options['missing_only']:
+            known = set(DocumentValidation.objects.filter(error='').values_list('file_name', flat=True))
+            documents = (doc for doc in documents if doc[2] not in known)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Re-validating stored image documents with {workers} worker(s)…'
+        ))
+
+        # status -> [documents, flagged, undecodable, failed]
+        summary = defaultdict(lambda: [0, 0, 0, 0])
+        flagged = []
+        checked = 0
+
+        # Spawned, not forked: a forked worker would share this process's open
+        # DB connection (the document query is still being iterated)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+        ) as pool:
+            in_flight = {}
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    doc = next(documents, None)
+                    if doc is None:
+                        exhausted = True
+                        break
+                    in_flight[pool.submit(check_stored_document, doc[2], doc[3])] = doc
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label, status, name, field_name = in_flight.pop(future)
+                    counts = summary[status]
+                    counts[0] += 1
+                    checked += 1
+                    try:
+                        content_hash, result = future.result()
+                    except Exception as exc:
+                        counts[3] += 1
+                        self.stderr.write(f'  ✗ {name}: {exc}')
+                        DocumentValidation.record_failure(name, field_name, str(exc))
+                        continue
+                    DocumentValidation.record(name, content_hash, field_name, result)
+                    if result['warnings']:
+                        counts[1] += 1
+                        if status not in FINAL_STATUSES:
+                            flagged.append((label, status, field_name, result['warnings']))
+                    if not result['checks'].get('decodable', True):
+                        counts[2] += 1
+                    if checked % 100 == 0:
+                        self.stdout.write(f'  … {checked} checked')
+
+        status_labels = dict(NewApplication.STATUS_CHOICES)
+        self.stdout.write(self.style.MIGRATE_HEADING('Results by application status'))
+        self.stdout.write(f'  {"status":<40} {"images":>7} {"flagged":>8} {"corrupt":>8} {"failed":>7}')
+        for status, _ in NewApplication.STATUS_CHOICES:
+            if status not in summary:
+                continue
+            total, bad, corrupt, failed = summary[status]
+            self.stdout.write(
+                f'  {status_labels[status][:40]:<40} {total:>7} {bad:>8} {corrupt:>8} {failed:>7}'
+            )
+
+        if flagged:
+            self.stdout.write(self.style.MIGRATE_HEADING('Flagged documents in open applications'))
+            for label, status, field_name, warnings in sorted(flagged, key=lambda f: (f[1], f[0])):
+                self.stdout.write(
+                    f'  {label} — {status_labels.get(status, status)} — {field_name}: '
+                    f'{"; ".join(warnings)}'
+                )
+
+        failed = sum(c[3] for c in summary.values())
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Done — {checked} image(s) checked, {sum(c[1] for c in summary.values())} flagged, '
+            f'{failed} could not be read.'
+        ))
@@ -0,0 +1,224 @@
+import heapq
+import itertools
+import json
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from home.models import ActiveStudentAssistant, NoDutyDay
+from home.management.commands.send_duty_notifications import (
+    _merge_consecutive_slots, _parse_slot_times,
+    send_upcoming_reminder, mark_absent_if_missing, send_attendance_alerts,
+)
+
+logger = logging.getLogger(__name__)
+
+REMINDER_LEAD = timedelta(minutes=5)   # reminder goes out 5 min before shift start
+ABSENCE_GRACE = timedelta(minutes=1)   # absence check runs 1 min after shift end
+
+EVENT_REMINDER = 'reminder'
+EVENT_ABSENCE = 'absence'
+EVENT_ALERTS = 'alerts'
+
+
+class DaySchedule:
+    """Today's duty events kept in a min-heap ordered by fire time.
+
+    Each SA's events are tagged with a generation number. When an SA's
+    schedule (or a no-duty day affecting it) changes, its generation is
+    bumped and fresh events are pushed; the stale ones are simply skipped
+    when they reach the top of the heap.
+    """
+
+    def __init__(self, day):
+        self.day = day
+        self.day_name = day.strftime('%A')
+        self._heap = []
+        self._seq = itertools.count()
+        self._fingerprints = {}
+        self._generations = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _fingerprint(self, row, no_duty_office_ids):
+        pk, office_id, start_date, end_date, duty_schedule = row
+        off_today = (
+            office_id in no_duty_office_ids
+            or (start_date is not None and self.day < start_date)
+            or (end_date is not None and self.day > end_date)
+        )
+        slots = (duty_schedule or {}).get(self.day_name, [])
+        return (off_today, json.dumps(sorted(slots)))
+
+    def _push(self, when, kind, sa_id, shift_label):
+        generation = self._generations[sa_id]
+        heapq.heappush(self._heap, (when, next(self._seq), kind, sa_id, shift_label, generation))
+
+    def _schedule_sa(self, sa_id, slots, now):
+        tz = timezone.get_current_timezone()
+        last_end = None
+        for shift_label in _merge_consecutive_slots(slots):
+            slot_start, slot_end = _parse_slot_times(shift_label)
+            if not slot_start:
+                continue
+            start_dt = timezone.make_aware(datetime.combine(self.day, slot_start), tz)
+            end_dt = timezone.make_aware(datetime.combine(self.day, slot_end), tz)
+            # Only remind while the 5-minute window is still open
+            if now < start_dt:
+                self._push(max(start_dt - REMINDER_LEAD, now), EVENT_REMINDER, sa_id, shift_label)
+            self._push(end_dt + ABSENCE_GRACE, EVENT_ABSENCE, sa_id, shift_label)
+            last_end = end_dt if last_end is None else max(last_end, end_dt)
+        if last_end is not None:
+            self._push(last_end + ABSENCE_GRACE, EVENT_ALERTS, sa_id, '')
+
+    def refresh(self, now):
+        """Sync the heap with the database. Returns the number of SAs rescheduled.
+
+        Only the SAs whose relevant state changed since the last refresh
+        get new events, so a refresh costs two small projection queries.
+        """
+        if self.day.weekday() >= 5:
+            return 0
+        no_duty = list(NoDutyDay.objects.filter(date=self.day).values_list('office_id', flat=True))
+        rows = ActiveStudentAssistant.objects.filter(
+            status='active', duty_schedule__isnull=False,
+        ).values_list('pk', 'assigned_office_id', 'start_date', 'end_date', 'duty_schedule')
+
+        global_off = None in no_duty
+        no_duty_office_ids = set(no_duty)
+        seen = set()
+        changed = 0
+        for row in rows:
+            sa_id = row[0]
+            seen.add(sa_id)
+            fingerprint = (global_off,) + self._fingerprint(row, no_duty_office_ids)
+            if self._fingerprints.get(sa_id) == fingerprint:
+                continue
+            self._fingerprints[sa_id] = fingerprint
+            self._generations[sa_id] = self._generations.get(sa_id, 0) + 1
+            changed += 1
+            off_today = fingerprint[0] or fingerprint[1]
+            if not off_today:
+                self._schedule_sa(sa_id, (row[4] or {}).get(self.day_name, []), now)
+
+        # SAs that were deactivated or lost their schedule
+        for sa_id in set(self._fingerprints) - seen:
+            del self._fingerprints[sa_id]
+            self._generations[sa_id] += 1
+            changed += 1
+        return changed
+
+    def next_fire_time(self):
+        while self._heap:
+            when, _, _, sa_id, _, generation = self._heap[0]
+            if self._generations.get(sa_id) == generation and sa_id in self._fingerprints:
+                return when
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now):
+        """Pop and return every live event whose fire time has passed."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, kind, sa_id, shift_label, generation = heapq.heappop(self._heap)
+            if self._generations.get(sa_id) == generation and sa_id in self._fingerprints:
+                due.append((kind, sa_id, shift_label))
+        return due
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the duty notifier as a long-lived process: keeps today\'s shift '
+        'reminders and absence checks in a timer heap instead of rescanning '
+        'every SA from cron each minute.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            type=int,
+            default=60,
+            help='Seconds between incremental schedule refreshes (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        refresh_every = timedelta(seconds=max(5, options['refresh']))
+        stop = threading.Event()
+
+        def _request_stop(signum, frame):
+            self.stdout.write(f'Received signal {signum}, shutting down…')
+            stop.set()
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+
+        self.counts = {EVENT_REMINDER: 0, EVENT_ABSENCE: 0, EVENT_ALERTS: 0}
+        schedule = None
+        next_refresh = None
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Duty notifier started.'))
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                now = timezone.localtime()
+
+                if schedule is None or schedule.day != now.date():
+                    schedule = DaySchedule(now.date())
+                    next_refresh = now
+                    self.stdout.write(f'Loading schedule for {schedule.day:%A, %B %d, %Y}')
+
+                if now >= next_refresh:
+                    changed = schedule.refresh(now)
+                    if changed:
+                        logger.info('Duty notifier: %d SA schedule(s) (re)loaded, %d queued event(s).',
+                                    changed, len(schedule))
+                    next_refresh = now + refresh_every
+
+                for kind, sa_id, shift_label in schedule.pop_due(now):
+                    self._fire(kind, sa_id, shift_label, schedule.day)
+
+                # Sleep until the next event, refresh or midnight — whichever is first
+                tomorrow = timezone.make_aware(
+                    datetime.combine(schedule.day + timedelta(days=1), datetime.min.time()),
+                    timezone.get_current_timezone(),
+                )
+                wake = min(filter(None, [schedule.next_fire_time(), next_refresh, tomorrow]))
+                stop.wait(max(0.0, (wake - timezone.localtime()).total_seconds()))
+        finally:
+            connection.close()
+            self.stdout.write(self.style.SUCCESS(
+                f'Duty notifier stopped — {self.counts[EVENT_REMINDER]} reminder(s), '
+                f'{self.counts[EVENT_ABSENCE]} absent notice(s), '
+                f'{self.counts[EVENT_ALERTS]} alert(s) sent.'
+            ))
+
+    def _fire(self, kind, sa_id, shift_label, day):
+        sa = ActiveStudentAssistant.objects.filter(pk=sa_id, status='active').first()
+        if sa is None:
+            return
+        try:
+            if kind == EVENT_REMINDER:
+                if send_upcoming_reminder(sa, day, shift_label):
+                    self.counts[kind] += 1
+                    self.stdout.write(f'  Reminder sent to {sa.full_name} for {shift_label}')
+            elif kind == EVENT_ABSENCE:
+                if mark_absent_if_missing(sa, day, shift_label):
+                    self.counts[kind] += 1
+                    self.stdout.write(f'  Absent notice sent to {sa.full_name} for {shift_label}')
+            elif kind == EVENT_ALERTS:
+                consec_days, late_alert = send_attendance_alerts(sa, day)
+                if consec_days:
+                    self.counts[kind] += 1
+                    self.stdout.write(f'  Consecutive absence alert sent to {sa.full_name} ({consec_days} days)')
+                if late_alert:
+                    self.counts[kind] += 1
+                    late_count, late_month = late_alert
+                    self.stdout.write(f'  Late threshold alert sent to {sa.full_name} ({late_count} in {late_month})')
+        except Exception:
+            logger.exception('Duty notifier: %s event failed for SA %s (%s)', kind, sa_id, shift_label)
@@ -50,6 +50,95 @@ def _merge_consecutive_slots(raw_slots):
     return result
 
 
+def _is_on_duty(sa, today, no_duty_office_ids):
+    """True if *sa* is expected to report for duty on *today*."""
+    if sa.assigned_office_id in no_duty_office_ids:
+        return False
+    if sa.start_date and today < sa.start_date:
+        return False
+    if sa.end_date and today > sa.end_date:
+        return False
+    return True
+
+
+def send_upcoming_reminder(sa, today, shift_label):
+    """Send the pre-shift reminder once per shift. Returns True if an email went out."""
+    _, created = DutyReminder.objects.get_or_create(
+        student_assistant=sa,
+        date=today,
+        shift=shift_label,
+        reminder_type='upcoming',
+    )
+    if created:
+        return bool(send_shift_reminder_email(sa, shift_label))
+    return False
+
+
+def mark_absent_if_missing(sa, today, shift_label):
+    """Record an absence for a finished shift with no clock-in and notify once.
+
+    Returns True if an absent notice was emailed.
+    """
+    has_record = AttendanceRecord.objects.filter(
+        student_assistant=sa, date=today, shift=shift_label,
+    ).exclude(status='absent').exists()
+    if has_record:
+        return False
+
+    AttendanceRecord.objects.get_or_create(
+        student_assistant=sa,
+        date=today,
+        shift=shift_label,
+        defaults={'status': 'absent'},
+    )
+    _, notif_created = DutyReminder.objects.get_or_create(
+        student_assistant=sa,
+        date=today,
+        shift=shift_label,
+        reminder_type='absent',
+    )
+    if notif_created:
+        return bool(send_absent_notification_email(sa, today, shift_label))
+    return False
+
+
+def send_attendance_alerts(sa, today):
+    """Send consecutive-absence / late-threshold alerts (each at most once a day).
+
+    Returns ``(consec_days, late_alert)``: the number of consecutive absent days
+    if that alert went out and ``(late_count, month)`` if the late alert
+    did, each None otherwise.
+    """
+    from home.views import _check_consecutive_absences, _check_late_threshold
+    from home.views import CONSECUTIVE_ABSENCE_THRESHOLD, LATE_MONTHLY_THRESHOLD
+
+    consec_days = late_alert = None
+
+    consec_count, consec_dates = _check_consecutive_absences(sa)
+    if consec_count >= CONSECUTIVE_ABSENCE_THRESHOLD:
+        _, created = DutyReminder.objects.get_or_create(
+            student_assistant=sa,
+            date=today,
+            shift=f'consec_{consec_count}',
+            reminder_type='absent',
+        )
+        if created and send_consecutive_absence_alert(sa, consec_count, consec_dates):
+            consec_days = consec_count
+
+    late_count, late_month = _check_late_threshold(sa)
+    if late_count >= LATE_MONTHLY_THRESHOLD:
+        _, created = DutyReminder.objects.get_or_create(
+            student_assistant=sa,
+            date=today,
+            shift=f'late_{today.year}_{today.month}',
+            reminder_type='upcoming',
+        )
+        if created and send_late_threshold_alert(sa, late_count, late_month):
+            late_alert = (late_count, late_month)
+
+    return consec_days, late_alert
+
+
 class Command(BaseCommand):
     help = 'Send 5-minute shift reminders and absent notifications via email.'
 
@@ -82,11 +171,7 @@ class Command(BaseCommand):
         absent_sent = 0
 
         for sa in active_sas:
-            if sa.assigned_office_id in no_duty_office_ids:
-                continue
-            if sa.start_date and today < sa.start_date:
-                continue
-            if sa.end_date and today > sa.end_date:
+            if not _is_on_duty(sa, today, no_duty_office_ids):
                 continue
 
             raw_slots = (sa.duty_schedule or {}).get(day_name, [])
@@ -102,89 +187,34 @@ class Command(BaseCommand):
                 minutes_until = (shift_start_dt - now_dt).total_seconds() / 60
 
                 if 0 < minutes_until <= 5:
-                    _, created = DutyReminder.objects.get_or_create(
-                        student_assistant=sa,
-                        date=today,
-                        shift=shift_label,
-                        reminder_type='upcoming',
-                    )
-                    if created:
-                        if send_shift_reminder_email(sa, shift_label):
-                            reminders_sent += 1
-                            self.stdout.write(
-                                f'  Reminder sent to {sa.full_name} for {shift_label}'
-                            )
+                    if send_upcoming_reminder(sa, today, shift_label):
+                        reminders_sent += 1
+                        self.stdout.write(
+                            f'  Reminder sent to {sa.full_name} for {shift_label}'
+                        )
 
                 if now_time > slot_end:
-                    has_record = AttendanceRecord.objects.filter(
-                        student_assistant=sa, date=today, shift=shift_label,
-                    ).exclude(status='absent').exists()
-
-                    if not has_record:
-                        record, rec_created = AttendanceRecord.objects.get_or_create(
-                            student_assistant=sa,
-                            date=today,
-                            shift=shift_label,
-                            defaults={'status': 'absent'},
-                        )
-                        # Send absent notification
-                        _, notif_created = DutyReminder.objects.get_or_create(
-                            student_assistant=sa,
-                            date=today,
-                            shift=shift_label,
-                            reminder_type='absent',
+                    if mark_absent_if_missing(sa, today, shift_label):
+                        absent_sent += 1
+                        self.stdout.write(
+                            f'  Absent notice sent to {sa.full_name} for {shift_label}'
                         )
-                        if notif_created:
-                            if send_absent_notification_email(sa, today, shift_label):
-                                absent_sent += 1
-                                self.stdout.write(
-                                    f'  Absent notice sent to {sa.full_name} for {shift_label}'
-                                )
 
         # ── Consecutive absence & late threshold alerts (once per day) ──
-        from home.views import _check_consecutive_absences, _check_late_threshold
-        from home.views import CONSECUTIVE_ABSENCE_THRESHOLD, LATE_MONTHLY_THRESHOLD
-
         consec_alerts = 0
         late_alerts = 0
 
         for sa in active_sas:
-            if sa.assigned_office_id in no_duty_office_ids:
+            if not _is_on_duty(sa, today, no_duty_office_ids):
                 continue
-            if sa.start_date and today < sa.start_date:
-                continue
-            if sa.end_date and today > sa.end_date:
-                continue
-
-            # Consecutive absences
-            consec_count, consec_dates = _check_consecutive_absences(sa)
-            if consec_count >= CONSECUTIVE_ABSENCE_THRESHOLD:
-                key = f'consec_{consec_count}'
-                _, created = DutyReminder.objects.get_or_create(
-                    student_assistant=sa,
-                    date=today,
-                    shift=key,
-                    reminder_type='absent',
-                )
-                if created:
-                    if send_consecutive_absence_alert(sa, consec_count, consec_dates):
-                        consec_alerts += 1
-                        self.stdout.write(f'  Consecutive absence alert sent to {sa.full_name} ({consec_count} days)')
-
-            # Late threshold
-            late_count, late_month = _check_late_threshold(sa)
-            if late_count >= LATE_MONTHLY_THRESHOLD:
-                key = f'late_{today.year}_{today.month}'
-                _, created = DutyReminder.objects.get_or_create(
-                    student_assistant=sa,
-                    date=today,
-                    shift=key,
-                    reminder_type='upcoming',
-                )
-                if created:
-                    if send_late_threshold_alert(sa, late_count, late_month):
-                        late_alerts += 1
-                        self.stdout.write(f'  Late threshold alert sent to {sa.full_name} ({late_count} in {late_month})')
+            consec_days, late_alert = send_attendance_alerts(sa, today)
+            if consec_days:
+                consec_alerts += 1
+                self.stdout.write(f'  Consecutive absence alert sent to {sa.full_name} ({consec_days} days)')
+            if late_alert:
+                late_alerts += 1
+                late_count, late_month = late_alert
+                self.stdout.write(f'  Late threshold alert sent to {sa.full_name} ({late_count} in {late_month})')
 
         self.stdout.write(self.style.SUCCESS(
             f'Done — {reminders_sent} reminder(s), {absent_sent} absent notice(s), '
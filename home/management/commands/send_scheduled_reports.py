@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from home.subscriptions import due_subscriptions, send_due_reports
+
+
+class Command(BaseCommand):
+    help = (
+        'Email every report subscription whose last daily / weekly / monthly '
+        'window has not been delivered yet. Run from cron at least once a day.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the subscriptions that are due without sending anything',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            due = due_subscriptions()
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{len(due)} subscription(s) due'))
+            for sub, start, end in due:
+                self.stdout.write(f'  {sub} — {start} to {end} → {len(sub.recipient_list())} recipient(s)')
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Sending scheduled reports…'))
+        deliveries, sent, failed = send_due_reports()
+        for subject, recipients in deliveries:
+            self.stdout.write(f'  {subject} → {recipients} recipient(s)')
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Done — {len(deliveries)} report(s) rendered, {sent} email(s) sent, {failed} failed.'
+        ))
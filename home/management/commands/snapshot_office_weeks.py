@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from home.models import AttendanceRecord
+from home.reports import snapshot_week, week_start_for
+
+
+class Command(BaseCommand):
+    help = (
+        'Write per-office weekly snapshots for the trend reports. Run weekly '
+        '(e.g. Monday morning) to record the week that just ended.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--week',
+            help='Any date in the week to snapshot, YYYY-MM-DD (default: last week)',
+        )
+        parser.add_argument(
+            '--backfill',
+            type=int,
+            default=0,
+            metavar='WEEKS',
+            help='Also rewrite this many weeks before it (0 = just the one week)',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Backfill every week since the first attendance record',
+        )
+        parser.add_argument(
+            '--include-current',
+            action='store_true',
+            help='Also snapshot the current, unfinished week',
+        )
+
+    def handle(self, *args, **options):
+        this_week = week_start_for(date.today())
+        if options['week']:
+            try:
+                last = week_start_for(date.fromisoformat(options['week']))
+            except ValueError:
+                raise CommandError('--week must be a date in YYYY-MM-DD format.')
+        else:
+            last = this_week if options['include_current'] else this_week - timedelta(weeks=1)
+
+        first = last - timedelta(weeks=max(0, options['backfill']))
+        if options['all']:
+            earliest = AttendanceRecord.objects.aggregate(first=Min('date'))['first']
+            if earliest:
+                first = min(first, week_start_for(earliest))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Snapshotting office metrics for the weeks of {first} to {last}…'
+        ))
+        week, weeks, rows = first, 0, 0
+        while week <= last:
+            rows += snapshot_week(week)
+            weeks += 1
+            week += timedelta(weeks=1)
+        self.stdout.write(self.style.SUCCESS(f'Done — {weeks} week(s), {rows} office snapshot(s) written.'))
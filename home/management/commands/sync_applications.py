@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from home.models import Application, NewApplication, RenewalApplication
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the unified Application table from NewApplication and RenewalApplication '
+        '(e.g. after loaddata, which skips the sync signal).'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Syncing applications…'))
+        synced = 0
+        with transaction.atomic():
+            for model in (NewApplication, RenewalApplication):
+                for app in model.objects.order_by().iterator():
+                    Application.sync(app)
+                    synced += 1
+        self.stdout.write(self.style.SUCCESS(f'Done — {synced} application(s) synced.'))
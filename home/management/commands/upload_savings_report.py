@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from home.models import NormalizedUpload
+
+
+def _mb(n):
+    return f'{(n or 0) / (1024 * 1024):.1f} MB'
+
+
+class Command(BaseCommand):
+    help = 'Report how many bytes upload normalization has saved, per document type.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=0,
+            help='Only count uploads from the last N days (default: all time)',
+        )
+
+    def handle(self, *args, **options):
+        uploads = NormalizedUpload.objects.all()
+        if options['days']:
+            uploads = uploads.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        rows = (
+            uploads.values('field_name')
+            .annotate(
+                count=Count('id'),
+                original=Sum('original_size'),
+                normalized=Sum('normalized_size'),
+                saved=Sum(F('original_size') - F('normalized_size')),
+            )
+            .order_by('-saved')
+        )
+
+        period = f'last {options["days"]} day(s)' if options['days'] else 'all time'
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Upload normalization savings ({period})'))
+
+        total_count = total_original = total_normalized = 0
+        for row in rows:
+            total_count += row['count']
+            total_original += row['original'] or 0
+            total_normalized += row['normalized'] or 0
+            self.stdout.write(
+                f'  {row["field_name"]:<24} {row["count"]:>6} file(s)  '
+                f'{_mb(row["original"]):>10} → {_mb(row["normalized"]):>10}  '
+                f'saved {_mb(row["saved"])}'
+            )
+
+        if not total_count:
+            self.stdout.write('  No normalized uploads recorded.')
+            return
+
+        saved = total_original - total_normalized
+        self.stdout.write(self.style.SUCCESS(
+            f'Total: {total_count} file(s), {_mb(total_original)} → {_mb(total_normalized)} '
+            f'— saved {_mb(saved)} ({saved / total_original * 100:.0f}%).'
+        ))
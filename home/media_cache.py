@@ -0,0 +1,206 @@
+"""
+Node-local, size-bounded disk cache in front of DatabaseStorage.
+
+All gunicorn workers on a node share the same directory:
+
+    <MEDIA_CACHE_DIR>/files/ab/<key>     file contents, keyed by name + updated_at
+    <MEDIA_CACHE_DIR>/meta/ab/<key>.json file metadata (size, timestamps, …)
+
+Content files are written to a temp file and ``os.replace``d into place,
+so readers never see a partial file. A hit bumps the file's mtime and
+eviction drops the least recently used files once the directory grows
+past MEDIA_CACHE_MAX_BYTES; each worker tracks the size as it writes and
+only lists the directory when that estimate says it may be full.
+Metadata entries expire after MEDIA_CACHE_META_TTL seconds and are
+dropped on save/delete.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of the limit so we don't rescan on every store
+EVICT_TARGET = 0.9
+# store() keeps a running estimate of the cache size instead of listing the
+# directory on every write. Other workers' writes only show up at the next
+# scan: once the estimate crosses the limit, or this long after the last one.
+RESCAN_SECONDS = 300
+
+_estimated_bytes = None
+_scanned_at = 0.0
+
+
+def enabled():
+    return getattr(settings, 'MEDIA_CACHE_MAX_BYTES', 0) > 0
+
+
+def _root():
+    return settings.MEDIA_CACHE_DIR
+
+
+def _key(*parts):
+    return hashlib.sha256('\0'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def _path(kind, key, suffix=''):
+    return os.path.join(_root(), kind, key[:2], key + suffix)
+
+
+def _atomic_write(path, chunks):
+    """Write *chunks* to *path* via a temp file in the same directory."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# ── Metadata ─────────────────────────────────────────────────────
+
+def get_meta(name):
+    """Return the cached metadata dict for *name*, or None if missing/expired."""
+    if not enabled():
+        return None
+    path = _path('meta', _key(name), '.json')
+    try:
+        if time.time() - os.path.getmtime(path) > settings.MEDIA_CACHE_META_TTL:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def set_meta(name, meta):
+    if not enabled():
+        return
+    try:
+        _atomic_write(_path('meta', _key(name), '.json'), [json.dumps(meta).encode()])
+    except OSError:
+        logger.warning('Media cache: could not write metadata for %s', name, exc_info=True)
+
+
+def invalidate(name):
+    """Forget cached metadata for *name* (content is keyed by updated_at and ages out)."""
+    try:
+        os.unlink(_path('meta', _key(name), '.json'))
+    except OSError:
+        pass
+
+
+# ── Contents ─────────────────────────────────────────────────────
+
+def get_path(name, updated_at):
+    """Return the cached file path for this version of *name*, or None on a miss."""
+    if not enabled():
+        return None
+    path = _path('files', _key(name, updated_at))
+    try:
+        os.utime(path)  # LRU: a hit makes the entry most recently used
+    except OSError:
+        return None
+    return path
+
+
+def store(name, updated_at, chunks):
+    """
+    Write this version of *name* into the cache and return its path.
+
+    Returns None if the cache is disabled or the write failed.
+    """
+    if not enabled():
+        return None
+    path = _path('files', _key(name, updated_at))
+    try:
+        _atomic_write(path, chunks)
+    except OSError:
+        logger.warning('Media cache: could not store %s', name, exc_info=True)
+        return None
+    _note_write(path)
+    return path
+
+
+def _note_write(path):
+    """Add a new entry to the size estimate, scanning and evicting only when needed."""
+    global _estimated_bytes
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    if (
+        _estimated_bytes is None
+        or _estimated_bytes + size > settings.MEDIA_CACHE_MAX_BYTES
+        or time.monotonic() - _scanned_at > RESCAN_SECONDS
+    ):
+        evict()
+    else:
+        _estimated_bytes += size
+
+
+def iter_file(f, start, end, chunk_size=256 * 1024):
+    """Yield bytes ``start..end`` (inclusive) of an open cached file, then close it."""
+    with f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def evict():
+    """Delete least recently used content files until under the size limit."""
+    global _estimated_bytes, _scanned_at
+    limit = settings.MEDIA_CACHE_MAX_BYTES
+    entries = []
+    total = 0
+    files_root = os.path.join(_root(), 'files')
+    try:
+        shards = list(os.scandir(files_root))
+    except OSError:
+        return 0
+    for shard in shards:
+        try:
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        except OSError:
+            continue
+    _scanned_at = time.monotonic()
+    _estimated_bytes = total
+    if total <= limit:
+        return 0
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= limit * EVICT_TARGET:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue  # another worker got there first
+        total -= size
+        removed += 1
+    _estimated_bytes = total
+    return removed
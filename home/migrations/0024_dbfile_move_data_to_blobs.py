@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:13
+
+import hashlib
+
+from django.db import migrations
+
+
+def move_data_to_blobs(apps, schema_editor):
+    """Hash every existing DBFile and point it at a shared DBBlob."""
+    DBFile = apps.get_model("home", "DBFile")
+    DBBlob = apps.get_model("home", "DBBlob")
+
+    for pk in DBFile.objects.filter(blob__isnull=True).values_list("pk", flat=True).iterator():
+        data = bytes(DBFile.objects.filter(pk=pk).values_list("data", flat=True).get())
+        digest = hashlib.sha256(data).hexdigest()
+        blob, created = DBBlob.objects.get_or_create(
+            sha256=digest,
+            defaults={"data": data, "size": len(data)},
+        )
+        DBBlob.objects.filter(pk=blob.pk).update(ref_count=blob.ref_count + 1)
+        DBFile.objects.filter(pk=pk).update(blob=blob, size=len(data))
+
+
+def restore_data_from_blobs(apps, schema_editor):
+    DBFile = apps.get_model("home", "DBFile")
+    DBBlob = apps.get_model("home", "DBBlob")
+
+    for db_file in DBFile.objects.select_related("blob").iterator():
+        DBFile.objects.filter(pk=db_file.pk).update(data=db_file.blob.data)
+    DBFile.objects.update(blob=None)
+    DBBlob.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0023_dbblob"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_data_to_blobs, restore_data_from_blobs),
+    ]
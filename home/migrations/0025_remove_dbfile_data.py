@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0024_dbfile_move_data_to_blobs"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="dbfile",
+            name="data",
+        ),
+        migrations.AlterField(
+            model_name="dbfile",
+            name="blob",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="files",
+                to="home.dbblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import BinaryField
+from django.db.models.functions import Substr
+
+CHUNK_SIZE = 256 * 1024
+
+
+def split_blobs_into_chunks(apps, schema_editor):
+    """Copy each single-row blob into fixed-size chunk rows, one slice at a time."""
+    DBBlob = apps.get_model("home", "DBBlob")
+    DBBlobChunk = apps.get_model("home", "DBBlobChunk")
+
+    for blob_id, size in DBBlob.objects.values_list("pk", "size").iterator():
+        for index, offset in enumerate(range(0, size, CHUNK_SIZE)):
+            data = (
+                DBBlob.objects.filter(pk=blob_id)
+                .annotate(
+                    chunk=Substr("data", offset + 1, CHUNK_SIZE, output_field=BinaryField())
+                )
+                .values_list("chunk", flat=True)
+                .get()
+            )
+            DBBlobChunk.objects.create(blob_id=blob_id, index=index, data=bytes(data))
+
+
+def join_chunks_into_blobs(apps, schema_editor):
+    DBBlob = apps.get_model("home", "DBBlob")
+    DBBlobChunk = apps.get_model("home", "DBBlobChunk")
+
+    for blob_id in DBBlob.objects.values_list("pk", flat=True).iterator():
+        data = b"".join(
+            bytes(chunk)
+            for chunk in DBBlobChunk.objects.filter(blob_id=blob_id)
+            .order_by("index")
+            .values_list("data", flat=True)
+        )
+        DBBlob.objects.filter(pk=blob_id).update(data=data)
+    DBBlobChunk.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0025_remove_dbfile_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DBBlobChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                ("data", models.BinaryField()),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="home.dbblob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["blob", "index"],
+                "unique_together": {("blob", "index")},
+            },
+        ),
+        migrations.RunPython(split_blobs_into_chunks, join_chunks_into_blobs),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0026_dbblobchunk"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="dbblob",
+            name="data",
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0027_remove_dbblob_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageDerivative",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source_sha256", models.CharField(max_length=64)),
+                ("source_name", models.CharField(db_index=True, max_length=500)),
+                (
+                    "variant",
+                    models.CharField(
+                        choices=[
+                            ("avatar", "Avatar"),
+                            ("card", "Card"),
+                            ("full", "Full"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("webp", "WebP"), ("jpeg", "JPEG")], max_length=4
+                    ),
+                ),
+                ("file", models.FileField(max_length=500, upload_to="derivatives/")),
+                ("width", models.PositiveIntegerField(default=0)),
+                ("height", models.PositiveIntegerField(default=0)),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "unique_together": {("source_sha256", "variant", "format")},
+            },
+        ),
+    ]
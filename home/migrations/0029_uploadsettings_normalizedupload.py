@@ -0,0 +1,84 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:05
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0028_imagederivative"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NormalizedUpload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field_name", models.CharField(max_length=50)),
+                ("stored_name", models.CharField(max_length=500)),
+                ("original_name", models.CharField(max_length=255)),
+                ("original_size", models.PositiveIntegerField()),
+                ("normalized_size", models.PositiveIntegerField()),
+                ("original_width", models.PositiveIntegerField(default=0)),
+                ("original_height", models.PositiveIntegerField(default=0)),
+                ("width", models.PositiveIntegerField(default=0)),
+                ("height", models.PositiveIntegerField(default=0)),
+                (
+                    "original_file",
+                    models.FileField(
+                        blank=True, max_length=500, upload_to="originals/"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="UploadSettings",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "keep_originals",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Also store the untouched original of every normalized upload.",
+                    ),
+                ),
+                (
+                    "quality",
+                    models.PositiveSmallIntegerField(
+                        default=80,
+                        help_text="JPEG quality used when re-encoding uploaded images (40–95).",
+                        validators=[
+                            django.core.validators.MinValueValidator(40),
+                            django.core.validators.MaxValueValidator(95),
+                        ],
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Upload Settings",
+                "verbose_name_plural": "Upload Settings",
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0029_uploadsettings_normalizedupload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaMigrationProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=200)),
+                ("target", models.CharField(max_length=200)),
+                ("name", models.CharField(max_length=500)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("done", "Done"), ("failed", "Failed")], max_length=10
+                    ),
+                ),
+                ("sha256", models.CharField(blank=True, default="", max_length=64)),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Media Migration Progress",
+                "verbose_name_plural": "Media Migration Progress",
+                "unique_together": {("source", "target", "name")},
+            },
+        ),
+    ]
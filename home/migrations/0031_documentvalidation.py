@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0030_mediamigrationprogress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentValidation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("file_name", models.CharField(db_index=True, max_length=500)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("field_name", models.CharField(max_length=50)),
+                (
+                    "result",
+                    models.JSONField(
+                        default=dict, help_text='{"warnings": [...], "checks": {...}}'
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "unique_together": {("file_name", "content_hash")},
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:20
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Start existing rows at their creation time rather than at migration time."""
+    for model_name, created_field in [
+        ("NewApplication", "submitted_at"),
+        ("RenewalApplication", "submitted_at"),
+        ("ActiveStudentAssistant", "created_at"),
+        ("AttendanceRecord", "created_at"),
+        ("PerformanceEvaluation", "evaluated_at"),
+    ]:
+        apps.get_model("home", model_name).objects.update(updated_at=F(created_field))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0031_documentvalidation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletedRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        help_text='Delta export feed, e.g. "attendance"', max_length=30
+                    ),
+                ),
+                ("object_pk", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "ordering": ["deleted_at", "id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="activestudentassistant",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="attendancerecord",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="newapplication",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="performanceevaluation",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="renewalapplication",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0033_reportsnapshot_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfficeWeeklySnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "week_start",
+                    models.DateField(db_index=True, help_text="Monday of the week"),
+                ),
+                (
+                    "semester",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Most common among the SAs on duty",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "academic_year",
+                    models.CharField(blank=True, default="", max_length=20),
+                ),
+                (
+                    "sa_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="SAs whose duty period overlaps the week"
+                    ),
+                ),
+                ("att_total", models.PositiveIntegerField(default=0)),
+                ("att_present", models.PositiveIntegerField(default=0)),
+                ("att_late", models.PositiveIntegerField(default=0)),
+                ("att_absent", models.PositiveIntegerField(default=0)),
+                ("att_excused", models.PositiveIntegerField(default=0)),
+                (
+                    "hours_worked",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=9),
+                ),
+                (
+                    "eval_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Evaluations submitted during the week"
+                    ),
+                ),
+                (
+                    "eval_overall_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=9),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "office",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_snapshots",
+                        to="home.office",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Office Weekly Snapshot",
+                "verbose_name_plural": "Office Weekly Snapshots",
+                "ordering": ["week_start", "office"],
+                "unique_together": {("office", "week_start")},
+            },
+        ),
+    ]
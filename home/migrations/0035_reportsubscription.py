@@ -0,0 +1,148 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:10
+
+import django.db.models.deletion
+import home.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0034_officeweeklysnapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="reportsnapshot",
+            old_name="pdf",
+            new_name="file",
+        ),
+        migrations.AddField(
+            model_name="reportsnapshot",
+            name="content_type",
+            field=models.CharField(default="application/pdf", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="emailoutbox",
+            name="snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Report whose file is attached",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="emails",
+                to="home.reportsnapshot",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ReportSubscription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=150)),
+                (
+                    "report",
+                    models.CharField(
+                        choices=[
+                            ("department", "Department-Level Reports (PDF)"),
+                            ("attendance", "Attendance Export (CSV)"),
+                            ("payroll", "Payroll Summary (CSV)"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "cadence",
+                    models.CharField(
+                        choices=[
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly (Monday)"),
+                            ("monthly", "Monthly (1st)"),
+                        ],
+                        default="weekly",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "recipients",
+                    models.TextField(
+                        help_text="Email addresses, separated by commas or new lines",
+                        validators=[home.models.validate_recipient_list],
+                    ),
+                ),
+                (
+                    "semester",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("1st", "1st Semester"),
+                            ("2nd", "2nd Semester"),
+                            ("summer", "Summer"),
+                        ],
+                        default="",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("present", "Present"),
+                            ("late", "Late"),
+                            ("absent", "Absent"),
+                            ("excused", "Excused"),
+                        ],
+                        default="",
+                        help_text="Attendance status (attendance report only)",
+                        max_length=15,
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "last_window",
+                    models.DateField(
+                        blank=True,
+                        help_text="Start of the last window delivered",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="report_subscriptions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "office",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Leave blank for all offices",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="report_subscriptions",
+                        to="home.office",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Subscription",
+                "verbose_name_plural": "Report Subscriptions",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0035_reportsubscription"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activestudentassistant",
+            index=models.Index(
+                fields=["student_id", "-created_at"],
+                name="activesa_student_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activestudentassistant",
+            index=models.Index(
+                fields=["status", "full_name"], name="activesa_status_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activestudentassistant",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["end_date"],
+                name="activesa_active_end_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendancerecord",
+            index=models.Index(
+                fields=["student_assistant", "status", "date"],
+                name="attendance_sa_status_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendancerecord",
+            index=models.Index(
+                fields=["-date", "-time_in"], name="attendance_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newapplication",
+            index=models.Index(
+                fields=["status", "-submitted_at"], name="newapp_status_submitted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newapplication",
+            index=models.Index(
+                fields=["email", "-submitted_at"], name="newapp_email_submitted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newapplication",
+            index=models.Index(
+                condition=models.Q(("status__in", ["office_assigned", "approved"])),
+                fields=["assigned_office"],
+                name="newapp_filled_slot_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nodutyday",
+            index=models.Index(
+                fields=["office", "date"], name="nodutyday_office_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="renewalapplication",
+            index=models.Index(
+                fields=["status", "-submitted_at"], name="renewal_status_submitted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="renewalapplication",
+            index=models.Index(
+                fields=["email", "-submitted_at"], name="renewal_email_submitted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="renewalapplication",
+            index=models.Index(
+                condition=models.Q(("status__in", ["office_assigned", "approved"])),
+                fields=["assigned_office"],
+                name="renewal_filled_slot_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,189 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_applications(apps, schema_editor):
+    """One Application row per existing new / renewal application (mirrors Application.sync)."""
+    Application = apps.get_model("home", "Application")
+    shared = [
+        "student_id",
+        "email",
+        "course",
+        "semester",
+        "preferred_office_id",
+        "assigned_office",
+        "availability_schedule",
+        "interview_date",
+        "start_date",
+        "status",
+        "submitted_at",
+        "updated_at",
+    ]
+    rows = []
+    for app in apps.get_model("home", "NewApplication").objects.order_by().iterator():
+        rows.append(
+            Application(
+                kind="new",
+                new_application_id=app.pk,
+                full_name=f"{app.first_name} {app.last_name}",
+                **{f: getattr(app, f) for f in shared},
+            )
+        )
+    for app in (
+        apps.get_model("home", "RenewalApplication").objects.order_by().iterator()
+    ):
+        rows.append(
+            Application(
+                kind="renewal",
+                renewal_application_id=app.pk,
+                full_name=app.full_name,
+                **{f: getattr(app, f) for f in shared},
+            )
+        )
+    Application.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0036_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Application",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("new", "New"), ("renewal", "Renewal")], max_length=10
+                    ),
+                ),
+                ("student_id", models.CharField(max_length=8)),
+                ("full_name", models.CharField(max_length=200)),
+                ("email", models.EmailField(max_length=254)),
+                ("course", models.CharField(max_length=100)),
+                (
+                    "semester",
+                    models.CharField(
+                        choices=[("1st", "1st Semester"), ("2nd", "2nd Semester")],
+                        max_length=5,
+                    ),
+                ),
+                (
+                    "assigned_office",
+                    models.CharField(blank=True, default="", max_length=200),
+                ),
+                ("availability_schedule", models.JSONField(blank=True, null=True)),
+                ("interview_date", models.DateTimeField(blank=True, null=True)),
+                ("start_date", models.DateField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("under_review", "Under Review"),
+                            (
+                                "schedule_mismatch",
+                                "Schedule Mismatch — Re-input Required",
+                            ),
+                            ("documents_requested", "Additional Documents Requested"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_done", "Interview Done"),
+                            ("office_assigned", "Office Assigned"),
+                            ("approved", "Approved"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("submitted_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "new_application",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="base",
+                        to="home.newapplication",
+                    ),
+                ),
+                (
+                    "preferred_office",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="applications",
+                        to="home.office",
+                    ),
+                ),
+                (
+                    "renewal_application",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="base",
+                        to="home.renewalapplication",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-submitted_at"],
+                "indexes": [
+                    models.Index(fields=["-submitted_at"], name="app_submitted_idx"),
+                    models.Index(
+                        fields=["status", "-submitted_at"],
+                        name="app_status_submitted_idx",
+                    ),
+                    models.Index(
+                        fields=["student_id", "-submitted_at"],
+                        name="app_student_submitted_idx",
+                    ),
+                    models.Index(
+                        fields=["email", "-submitted_at"],
+                        name="app_email_submitted_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(
+                            ("status__in", ["office_assigned", "approved"])
+                        ),
+                        fields=["assigned_office"],
+                        name="app_filled_slot_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(
+                                ("kind", "new"),
+                                ("new_application__isnull", False),
+                                ("renewal_application__isnull", True),
+                            ),
+                            models.Q(
+                                ("kind", "renewal"),
+                                ("new_application__isnull", True),
+                                ("renewal_application__isnull", False),
+                            ),
+                            _connector="OR",
+                        ),
+                        name="application_one_detail_row",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+def mark_error_rows(apps, schema_editor):
+    """Rows written for failed validations so far have a blank content hash and an "error" key."""
+    DocumentValidation = apps.get_model("home", "DocumentValidation")
+    for row in DocumentValidation.objects.filter(content_hash=""):
+        row.error = row.result.pop("error", "") or "Validation failed"
+        row.save(update_fields=["error", "result"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0037_application"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentvalidation",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="documentvalidation",
+            name="error",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Why the last attempt failed; blank on success",
+            ),
+        ),
+        migrations.AddField(
+            model_name="documentvalidation",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(mark_error_rows, migrations.RunPython.noop),
+    ]
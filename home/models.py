@@ -1,14 +1,50 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.validators import MinLengthValidator, RegexValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import (
+    MaxValueValidator, MinLengthValidator, MinValueValidator, RegexValidator, validate_email,
+)
 from datetime import date as _date, timedelta
 
 
 
+class DBBlob(models.Model):
+    """File contents stored once per distinct SHA-256 digest.
+
+    ``ref_count`` is the number of DBFile names pointing at this blob;
+    the blob is deleted when the last name referencing it goes away.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Database Blob'
+        verbose_name_plural = 'Database Blobs'
+
+    def __str__(self):
+        return self.sha256
+
+
+class DBBlobChunk(models.Model):
+    """One fixed-size slice of a blob's bytes, ordered by ``index``."""
+    blob = models.ForeignKey(DBBlob, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        unique_together = ['blob', 'index']
+        ordering = ['blob', 'index']
+
+    def __str__(self):
+        return f"{self.blob_id} #{self.index}"
+
+
 class DBFile(models.Model):
-    """Stores uploaded files as binary data in the database."""
+    """A stored file name pointing at its (deduplicated) contents."""
     name = models.CharField(max_length=500, unique=True, db_index=True)
-    data = models.BinaryField()
+    blob = models.ForeignKey(DBBlob, on_delete=models.PROTECT, related_name='files')
     content_type = models.CharField(max_length=100, default='application/octet-stream')
     size = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -22,6 +58,177 @@ class DBFile(models.Model):
         return self.name
 
 
+class ImageDerivative(models.Model):
+    """A resized WebP/JPEG rendition of an uploaded image (see home/derivatives.py)."""
+    VARIANT_CHOICES = [
+        ('avatar', 'Avatar'),
+        ('card', 'Card'),
+        ('full', 'Full'),
+    ]
+    FORMAT_CHOICES = [
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+    ]
+
+    source_sha256 = models.CharField(max_length=64)
+    source_name = models.CharField(max_length=500, db_index=True)
+    variant = models.CharField(max_length=10, choices=VARIANT_CHOICES)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    file = models.FileField(upload_to='derivatives/', max_length=500)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['source_sha256', 'variant', 'format']
+
+    def __str__(self):
+        return f"{self.source_name} ({self.variant}, {self.format})"
+
+
+class UploadSettings(models.Model):
+    """Staff-editable knobs for upload normalization (single row, see home/uploads.py)."""
+    keep_originals = models.BooleanField(
+        default=False,
+        help_text='Also store the untouched original of every normalized upload.',
+    )
+    quality = models.PositiveSmallIntegerField(
+        default=80,
+        validators=[MinValueValidator(40), MaxValueValidator(95)],
+        help_text='JPEG quality used when re-encoding uploaded images (40–95).',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Upload Settings'
+        verbose_name_plural = 'Upload Settings'
+
+    def __str__(self):
+        return 'Upload Settings'
+
+    @classmethod
+    def load(cls):
+        obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
+
+
+class NormalizedUpload(models.Model):
+    """Log of an uploaded image that was downscaled / re-encoded before storage."""
+    field_name = models.CharField(max_length=50)
+    stored_name = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255)
+    original_size = models.PositiveIntegerField()
+    normalized_size = models.PositiveIntegerField()
+    original_width = models.PositiveIntegerField(default=0)
+    original_height = models.PositiveIntegerField(default=0)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    original_file = models.FileField(upload_to='originals/', max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def bytes_saved(self):
+        return self.original_size - self.normalized_size
+
+    def __str__(self):
+        return f"{self.stored_name} ({self.original_size} → {self.normalized_size} bytes)"
+
+
+class MediaMigrationProgress(models.Model):
+    """Per-file checkpoint for ``manage.py migrate_media`` so runs can resume."""
+    STATUS_CHOICES = [
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    source = models.CharField(max_length=200)
+    target = models.CharField(max_length=200)
+    name = models.CharField(max_length=500)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    sha256 = models.CharField(max_length=64, blank=True, default='')
+    size = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['source', 'target', 'name']
+        verbose_name = 'Media Migration Progress'
+        verbose_name_plural = 'Media Migration Progress'
+
+    def __str__(self):
+        return f"{self.name}: {self.source} → {self.target} ({self.status})"
+
+
+class DocumentValidation(models.Model):
+    """Stored OpenCV quality-check result for one uploaded document version.
+
+    A file that couldn't be read or checked gets an error row instead
+    (``content_hash`` blank, ``error`` set). It counts as not validated
+    yet and is retried with exponential backoff until MAX_ATTEMPTS, after
+    which its "could not validate" result is shown as final.
+    """
+    MAX_ATTEMPTS = 5
+    RETRY_SECONDS = 60  # doubled after every failed attempt
+
+    file_name = models.CharField(max_length=500, db_index=True)
+    content_hash = models.CharField(max_length=64)
+    field_name = models.CharField(max_length=50)
+    result = models.JSONField(default=dict, help_text='{"warnings": [...], "checks": {...}}')
+    error = models.TextField(blank=True, default='', help_text='Why the last attempt failed; blank on success')
+    attempts = models.PositiveSmallIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['file_name', 'content_hash']
+
+    def __str__(self):
+        if self.error:
+            return f"{self.file_name} (failed {self.attempts}x: {self.error})"
+        return f"{self.file_name} ({len(self.result.get('warnings', []))} warning(s))"
+
+    @property
+    def gave_up(self):
+        return bool(self.error) and self.attempts >= self.MAX_ATTEMPTS
+
+    def retry_due(self, now):
+        """True if this error row has waited out its backoff and has attempts left."""
+        if not self.error or self.gave_up:
+            return False
+        return now - self.updated_at >= timedelta(seconds=self.RETRY_SECONDS * 2 ** (self.attempts - 1))
+
+    @classmethod
+    def record(cls, file_name, content_hash, field_name, result):
+        """Save a successful result for this version of *file_name*, clearing earlier failures."""
+        cls.objects.update_or_create(
+            file_name=file_name,
+            content_hash=content_hash,
+            defaults={'field_name': field_name, 'result': result, 'error': '', 'attempts': 1},
+        )
+        cls.objects.filter(file_name=file_name).exclude(error='').delete()
+
+    @classmethod
+    def record_failure(cls, file_name, field_name, error):
+        """Count a failed attempt at validating *file_name*."""
+        row, created = cls.objects.get_or_create(
+            file_name=file_name,
+            content_hash='',
+            defaults={
+                'field_name': field_name,
+                'result': {'warnings': ['Could not validate this file.'], 'checks': {}},
+                'error': error,
+            },
+        )
+        if not created:
+            row.attempts = models.F('attempts') + 1
+            row.error = error
+            row.save(update_fields=['attempts', 'error', 'updated_at'])
+
+
 class Office(models.Model):
     """Campus office that can accept student assistants."""
     name = models.CharField(max_length=200, unique=True)
@@ -270,10 +477,22 @@ class NewApplication(models.Model):
 
     # ── Meta ──
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='pending')
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            # Status tabs/counts and the approved list, newest first
+            models.Index(fields=['status', '-submitted_at'], name='newapp_status_submitted_idx'),
+            # Tracking page lookup by the signed-in user's email
+            models.Index(fields=['email', '-submitted_at'], name='newapp_email_submitted_idx'),
+            # Filled-slot counts per office only ever look at these two statuses
+            models.Index(
+                fields=['assigned_office'], name='newapp_filled_slot_idx',
+                condition=models.Q(status__in=['office_assigned', 'approved']),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_id})"
@@ -371,15 +590,132 @@ class RenewalApplication(models.Model):
 
     # ── Meta ──
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='pending')
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['status', '-submitted_at'], name='renewal_status_submitted_idx'),
+            models.Index(fields=['email', '-submitted_at'], name='renewal_email_submitted_idx'),
+            models.Index(
+                fields=['assigned_office'], name='renewal_filled_slot_idx',
+                condition=models.Q(status__in=['office_assigned', 'approved']),
+            ),
+        ]
 
     def __str__(self):
         return f"[Renewal] {self.full_name} ({self.student_id})"
 
 
+class Application(models.Model):
+    """
+    One row per application of either type, holding the fields shared by
+    NewApplication and RenewalApplication (which stay the detail tables).
+
+    Cross-type listings, counts and lookups query this table once instead
+    of querying both models and merging in Python. Rows are written by
+    ``Application.sync()`` from the detail models' post_save signal; the
+    detail row's deletion cascades here.
+    """
+
+    KIND_CHOICES = [
+        ('new', 'New'),
+        ('renewal', 'Renewal'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    new_application = models.OneToOneField(
+        NewApplication, null=True, blank=True, on_delete=models.CASCADE,
+        related_name='base',
+    )
+    renewal_application = models.OneToOneField(
+        RenewalApplication, null=True, blank=True, on_delete=models.CASCADE,
+        related_name='base',
+    )
+
+    # ── Shared fields (mirrored from the detail row) ──
+    student_id = models.CharField(max_length=8)
+    full_name = models.CharField(max_length=200)
+    email = models.EmailField()
+    course = models.CharField(max_length=100)
+    semester = models.CharField(max_length=5, choices=NewApplication.SEMESTER_CHOICES)
+    preferred_office = models.ForeignKey(
+        Office, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='applications',
+    )
+    assigned_office = models.CharField(max_length=200, blank=True, default='')
+    availability_schedule = models.JSONField(blank=True, null=True)
+    interview_date = models.DateTimeField(null=True, blank=True)
+    start_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=30, choices=NewApplication.STATUS_CHOICES)
+    submitted_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at'], name='app_submitted_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='app_status_submitted_idx'),
+            models.Index(fields=['student_id', '-submitted_at'], name='app_student_submitted_idx'),
+            models.Index(fields=['email', '-submitted_at'], name='app_email_submitted_idx'),
+            models.Index(
+                fields=['assigned_office'], name='app_filled_slot_idx',
+                condition=models.Q(status__in=['office_assigned', 'approved']),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(kind='new', new_application__isnull=False, renewal_application__isnull=True)
+                    | models.Q(kind='renewal', new_application__isnull=True, renewal_application__isnull=False)
+                ),
+                name='application_one_detail_row',
+            ),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_kind_display()}] {self.full_name} ({self.student_id})"
+
+    @property
+    def is_renewal(self):
+        return self.kind == 'renewal'
+
+    @property
+    def detail(self):
+        """The NewApplication or RenewalApplication this row mirrors."""
+        return self.renewal_application if self.is_renewal else self.new_application
+
+    @staticmethod
+    def mirrored_values(app):
+        """The shared-field values for a NewApplication / RenewalApplication."""
+        is_renewal = isinstance(app, RenewalApplication)
+        return {
+            'kind': 'renewal' if is_renewal else 'new',
+            'student_id': app.student_id,
+            'full_name': app.full_name if is_renewal else f"{app.first_name} {app.last_name}",
+            'email': app.email,
+            'course': app.course,
+            'semester': app.semester,
+            'preferred_office_id': app.preferred_office_id,
+            'assigned_office': app.assigned_office,
+            'availability_schedule': app.availability_schedule,
+            'interview_date': app.interview_date,
+            'start_date': app.start_date,
+            'status': app.status,
+            'submitted_at': app.submitted_at,
+            'updated_at': app.updated_at,
+        }
+
+    @classmethod
+    def sync(cls, app, created=False):
+        """Create or refresh the row for *app* (a NewApplication or RenewalApplication)."""
+        link = 'renewal_application' if isinstance(app, RenewalApplication) else 'new_application'
+        values = cls.mirrored_values(app)
+        if created or not cls.objects.filter(**{link: app}).update(**values):
+            cls.objects.create(**{link: app}, **values)
+
+
 class ApplicationNote(models.Model):
     """Audit-trail log of all notes, remarks, and status changes."""
 
@@ -471,6 +807,7 @@ class ActiveStudentAssistant(models.Model):
     # ── Status ──
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='active')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # ── Duty schedule (set by student) ──
     duty_schedule = models.JSONField(
@@ -480,6 +817,14 @@ class ActiveStudentAssistant(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Tracking/portal lookup of a student's SA records, latest first
+            models.Index(fields=['student_id', '-created_at'], name='activesa_student_created_idx'),
+            # Status filters/counts and the active SA list ordered by name
+            models.Index(fields=['status', 'full_name'], name='activesa_status_name_idx'),
+            # Daily auto-expiry only scans active SAs
+            models.Index(fields=['end_date'], name='activesa_active_end_idx', condition=models.Q(status='active')),
+        ]
         verbose_name = 'Active Student Assistant'
         verbose_name_plural = 'Active Student Assistants'
 
@@ -548,10 +893,18 @@ class AttendanceRecord(models.Model):
         related_name='attendance_logs',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ['-date', '-time_in']
         unique_together = ['student_assistant', 'date', 'shift']
+        indexes = [
+            # Per-SA status counts (e.g. late this month); the unique
+            # constraint already covers student_assistant + date
+            models.Index(fields=['student_assistant', 'status', 'date'], name='attendance_sa_status_date_idx'),
+            # Date-range exports, reports and weekly snapshots
+            models.Index(fields=['-date', '-time_in'], name='attendance_date_idx'),
+        ]
         verbose_name = 'Attendance Record'
         verbose_name_plural = 'Attendance Records'
 
@@ -561,15 +914,24 @@ class AttendanceRecord(models.Model):
     @property
     def hours_worked(self):
         """Calculate hours worked from time_in and time_out, capped at 4 hours per day."""
-        if self.time_in and self.time_out:
-            from datetime import datetime, timedelta
-            dt_in = datetime.combine(self.date, self.time_in)
-            dt_out = datetime.combine(self.date, self.time_out)
-            if dt_out < dt_in:  # overnight
-                dt_out += timedelta(days=1)
-            diff = (dt_out - dt_in).total_seconds() / 3600
-            return round(min(diff, 4.0), 2)
-        return 0
+        return compute_hours_worked(self.date, self.time_in, self.time_out)
+
+
+def compute_hours_worked(date, time_in, time_out):
+    """Hours between *time_in* and *time_out* on *date*, capped at 4 hours per day.
+
+    Shared by ``AttendanceRecord.hours_worked`` and code that reads raw
+    ``values_list`` rows instead of model instances.
+    """
+    if time_in and time_out:
+        from datetime import datetime, timedelta
+        dt_in = datetime.combine(date, time_in)
+        dt_out = datetime.combine(date, time_out)
+        if dt_out < dt_in:  # overnight
+            dt_out += timedelta(days=1)
+        diff = (dt_out - dt_in).total_seconds() / 3600
+        return round(min(diff, 4.0), 2)
+    return 0
 
 
 class PerformanceEvaluation(models.Model):
@@ -616,6 +978,7 @@ class PerformanceEvaluation(models.Model):
         related_name='evaluations_given',
     )
     evaluated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ['-evaluated_at']
@@ -656,6 +1019,11 @@ class NoDutyDay(models.Model):
     class Meta:
         ordering = ['-date']
         unique_together = ['date', 'office']
+        indexes = [
+            # "this office or all offices" lookups; exact (date, office)
+            # lookups use the unique constraint's index
+            models.Index(fields=['office', 'date'], name='nodutyday_office_date_idx'),
+        ]
         verbose_name = 'No-Duty Day'
         verbose_name_plural = 'No-Duty Days'
 
@@ -664,6 +1032,204 @@ class NoDutyDay(models.Model):
         return f"{self.date} — {self.reason} ({scope})"
 
 
+# ================================================================
+#  Delta exports — deletion tombstones
+# ================================================================
+
+class DeletedRecord(models.Model):
+    """Tombstone left when an exported record is deleted, so delta syncs can drop it too."""
+    entity = models.CharField(max_length=30, help_text='Delta export feed, e.g. "attendance"')
+    object_pk = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_pk} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+# ================================================================
+#  Report snapshots & email outbox
+# ================================================================
+
+class ReportSnapshot(models.Model):
+    """
+    A rendered report for one data version (see home/reports.py) or one
+    scheduled-delivery window (see home/subscriptions.py).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Generating'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, default='department')
+    version = models.CharField(max_length=64, help_text='Hash of the data the report was built from')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    file = models.FileField(upload_to='reports/', max_length=500, blank=True)
+    content_type = models.CharField(max_length=100, default='application/pdf')
+    summary = models.JSONField(default=dict, blank=True, help_text='Global totals, for the email body')
+    error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        unique_together = ['kind', 'version']
+
+    def __str__(self):
+        return f"{self.kind} report {self.version[:8]} ({self.get_status_display()})"
+
+
+class EmailOutbox(models.Model):
+    """An email waiting to be sent by ``flush_email_outbox`` / the background flusher."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default='', help_text='Built from the snapshot when empty')
+    snapshot = models.ForeignKey(
+        ReportSnapshot, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='emails', help_text='Report whose file is attached',
+    )
+    attachment_name = models.CharField(max_length=200, blank=True, default='')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Outgoing Email'
+        verbose_name_plural = 'Email Outbox'
+
+    def __str__(self):
+        return f"{self.subject} → {self.to_email} ({self.get_status_display()})"
+
+
+def split_recipients(value):
+    """Email addresses from a comma-, semicolon- or newline-separated list."""
+    return [part.strip() for part in value.replace(';', ',').replace('\n', ',').split(',') if part.strip()]
+
+
+def validate_recipient_list(value):
+    bad = []
+    for address in split_recipients(value):
+        try:
+            validate_email(address)
+        except ValidationError:
+            bad.append(address)
+    if bad:
+        raise ValidationError(f"Invalid email address(es): {', '.join(bad)}")
+    if not split_recipients(value):
+        raise ValidationError('Enter at least one email address.')
+
+
+class ReportSubscription(models.Model):
+    """
+    A report emailed automatically on a schedule by ``send_scheduled_reports``.
+    Each report covers the last complete cadence window (yesterday, last
+    week or last month); the department report is always all-time.
+    """
+    REPORT_CHOICES = [
+        ('department', 'Department-Level Reports (PDF)'),
+        ('attendance', 'Attendance Export (CSV)'),
+        ('payroll', 'Payroll Summary (CSV)'),
+    ]
+    CADENCE_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly (Monday)'),
+        ('monthly', 'Monthly (1st)'),
+    ]
+
+    name = models.CharField(max_length=150)
+    report = models.CharField(max_length=20, choices=REPORT_CHOICES)
+    cadence = models.CharField(max_length=10, choices=CADENCE_CHOICES, default='weekly')
+    recipients = models.TextField(
+        validators=[validate_recipient_list],
+        help_text='Email addresses, separated by commas or new lines',
+    )
+
+    # ── Filters (attendance and payroll reports) ──
+    office = models.ForeignKey(
+        Office, null=True, blank=True, on_delete=models.CASCADE,
+        related_name='report_subscriptions', help_text='Leave blank for all offices',
+    )
+    semester = models.CharField(
+        max_length=10, blank=True, default='', choices=ActiveStudentAssistant.SEMESTER_CHOICES,
+    )
+    status = models.CharField(
+        max_length=15, blank=True, default='', choices=AttendanceRecord.STATUS_CHOICES,
+        help_text='Attendance status (attendance report only)',
+    )
+
+    is_active = models.BooleanField(default=True)
+    last_window = models.DateField(
+        null=True, blank=True, help_text='Start of the last window delivered',
+    )
+    created_by = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name='report_subscriptions',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Report Subscription'
+        verbose_name_plural = 'Report Subscriptions'
+
+    def __str__(self):
+        return f"{self.name} ({self.get_report_display()}, {self.get_cadence_display()})"
+
+    def recipient_list(self):
+        return split_recipients(self.recipients)
+
+
+# ================================================================
+#  Weekly office snapshots (trend reports)
+# ================================================================
+
+class OfficeWeeklySnapshot(models.Model):
+    """
+    One office's metrics for one Monday–Sunday week, written by the
+    ``snapshot_office_weeks`` job. Trend pages read only this table.
+    Counts and sums are stored so weeks and offices can be combined.
+    """
+    office = models.ForeignKey(Office, on_delete=models.CASCADE, related_name='weekly_snapshots')
+    week_start = models.DateField(db_index=True, help_text='Monday of the week')
+    semester = models.CharField(max_length=10, blank=True, default='', help_text='Most common among the SAs on duty')
+    academic_year = models.CharField(max_length=20, blank=True, default='')
+
+    sa_count = models.PositiveIntegerField(default=0, help_text='SAs whose duty period overlaps the week')
+    att_total = models.PositiveIntegerField(default=0)
+    att_present = models.PositiveIntegerField(default=0)
+    att_late = models.PositiveIntegerField(default=0)
+    att_absent = models.PositiveIntegerField(default=0)
+    att_excused = models.PositiveIntegerField(default=0)
+    hours_worked = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    eval_count = models.PositiveIntegerField(default=0, help_text='Evaluations submitted during the week')
+    eval_overall_sum = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['week_start', 'office']
+        unique_together = ['office', 'week_start']
+        verbose_name = 'Office Weekly Snapshot'
+        verbose_name_plural = 'Office Weekly Snapshots'
+
+    def __str__(self):
+        return f"{self.office.name} — week of {self.week_start}"
+
+
 # ================================================================
 #  Duty period helper
 # ================================================================
@@ -707,17 +1273,18 @@ def recalculate_end_dates_for_office(office=None):
         )
         no_duty_dates = list(ndd_qs.values_list('date', flat=True))
         sa.end_date = calculate_end_date(sa.start_date, duty_days=80, no_duty_dates=no_duty_dates)
-        sa.save(update_fields=['end_date'])
+        sa.save(update_fields=['end_date', 'updated_at'])
 
 
 def auto_expire_student_assistants():
     """Mark any active SA whose end_date has passed as expired."""
+    from django.utils import timezone
     today = _date.today()
     ActiveStudentAssistant.objects.filter(
         status='active',
         end_date__isnull=False,
         end_date__lt=today,
-    ).update(status='expired')
+    ).update(status='expired', updated_at=timezone.now())
 
 
 def generate_absent_records_for_yesterday():
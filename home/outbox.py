@@ -0,0 +1,167 @@
+"""
+Outgoing email queue.
+
+Views add an EmailOutbox row and return straight away; ``flush_outbox()``
+sends everything queued over one SMTP connection. It runs on a background
+thread after the request commits and from the ``flush_email_outbox``
+command (cron), which also retries failures and picks up anything a
+restarted worker dropped. Rows are claimed with a conditional UPDATE, so
+two flushers never send the same email.
+
+An email tied to a ReportSnapshot waits until the snapshot is ready and
+attaches its file; a department report email with a blank body gets one
+written from the snapshot's summary.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# A row stuck in 'sending' this long belonged to a flusher that died
+SENDING_STALE_SECONDS = 600
+# How long the background flusher waits for a report snapshot to render
+SNAPSHOT_WAIT_SECONDS = 120
+
+
+def queue_email(to_email, subject, body='', snapshot=None, attachment_name=''):
+    """Add an email to the outbox and return the row."""
+    return EmailOutbox.objects.create(
+        to_email=to_email, subject=subject, body=body,
+        snapshot=snapshot, attachment_name=attachment_name,
+    )
+
+
+def _report_body(snapshot):
+    stats = snapshot.summary
+    date_str = timezone.localtime(snapshot.finished_at).strftime('%B %d, %Y')
+    return (
+        f'Good day,\n\n'
+        f'Please find attached the Department-Level Reports generated on {date_str}.\n\n'
+        f'Summary:\n'
+        f'  • Total SAs: {stats["total_sas"]}\n'
+        f'  • Active SAs: {stats["active_sas"]}\n'
+        f'  • Attendance Rate: {stats["attendance_rate"]}%\n'
+        f'  • Avg Hours/SA: {stats["avg_hours"]}\n'
+        f'  • Avg Performance Rating: {stats["avg_overall"]}/5\n'
+        f'  • Total Evaluations: {stats["eval_count"]}\n\n'
+        f'This is an automated report from the CHMSU SA Application System.'
+    )
+
+
+def _build_message(item, conn):
+    email = EmailMessage(
+        subject=item.subject,
+        body=item.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[item.to_email],
+        connection=conn,
+    )
+    snapshot = item.snapshot
+    if snapshot is not None:
+        if not email.body and snapshot.kind == 'department':
+            email.body = _report_body(snapshot)
+        with snapshot.file.open('rb') as f:
+            email.attach(
+                item.attachment_name or snapshot.file.name.rsplit('/', 1)[-1], f.read(), snapshot.content_type,
+            )
+    return email
+
+
+def _fail(item, error):
+    item.attempts += 1
+    item.last_error = error
+    item.status = 'failed' if item.attempts >= MAX_ATTEMPTS else 'queued'
+    item.save(update_fields=['attempts', 'last_error', 'status', 'updated_at'])
+
+
+def flush_outbox(include_failed=False):
+    """
+    Send every queued email whose attachment is ready.
+
+    Returns ``(sent, failed)``. Emails whose snapshot is still rendering
+    are left queued; ones whose snapshot failed are retried up to
+    MAX_ATTEMPTS times, like SMTP errors. Snapshots orphaned by a dead
+    renderer are recovered first, so their emails aren't skipped
+    forever. *include_failed* re-queues rows that already used up their
+    attempts.
+    """
+    from .reports import recover_stale_snapshots
+
+    recover_stale_snapshots()
+    now = timezone.now()
+    EmailOutbox.objects.filter(
+        status='sending', updated_at__lt=now - timedelta(seconds=SENDING_STALE_SECONDS),
+    ).update(status='queued', updated_at=now)
+    if include_failed:
+        EmailOutbox.objects.filter(status='failed').update(status='queued', attempts=0, updated_at=now)
+
+    candidates = list(
+        EmailOutbox.objects.filter(status='queued')
+        .exclude(snapshot__status='pending')
+        .values_list('pk', flat=True)
+    )
+    sent = failed = 0
+    if not candidates:
+        return sent, failed
+
+    conn = get_connection()
+    try:
+        for pk in candidates:
+            # Claim the row; another flusher may have got there first
+            if not EmailOutbox.objects.filter(pk=pk, status='queued').update(
+                status='sending', updated_at=timezone.now(),
+            ):
+                continue
+            item = EmailOutbox.objects.select_related('snapshot').get(pk=pk)
+            if item.snapshot is not None and item.snapshot.status != 'ready':
+                _fail(item, item.snapshot.error or 'Report could not be generated.')
+                failed += 1
+                continue
+            try:
+                conn.send_messages([_build_message(item, conn)])
+            except Exception as e:
+                logger.exception('Sending outbox email %s to %s failed', item.pk, item.to_email)
+                _fail(item, str(e))
+                failed += 1
+                continue
+            item.status = 'sent'
+            item.sent_at = timezone.now()
+            item.attempts += 1
+            item.last_error = ''
+            item.save(update_fields=['status', 'sent_at', 'attempts', 'last_error', 'updated_at'])
+            sent += 1
+    finally:
+        conn.close()
+    return sent, failed
+
+
+def flush_in_background(snapshot=None):
+    """
+    Flush the outbox on a background thread once the current transaction
+    commits, first waiting (up to SNAPSHOT_WAIT_SECONDS) for *snapshot* to
+    finish rendering.
+    """
+    def _run():
+        from .reports import wait_for_snapshot
+
+        try:
+            if snapshot is not None:
+                wait_for_snapshot(snapshot, SNAPSHOT_WAIT_SECONDS, interval=1)
+            flush_outbox()
+        except Exception:
+            logger.exception('Background outbox flush failed')
+        finally:
+            connection.close()
+
+    transaction.on_commit(
+        lambda: threading.Thread(target=_run, name='email-outbox', daemon=True).start()
+    )
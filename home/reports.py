@@ -0,0 +1,487 @@
+"""
+Department-level report engine (Module 7.1).
+
+Every per-office metric comes from three grouped queries — SA aggregates
+by office, attendance counts by office and status, evaluation sums by
+office — and the global totals are summed from the same groups (SAs
+without an office or in inactive offices are counted globally, as
+before). Averages are carried as sums and counts so they add up
+exactly. The HTML page, the PDF and the emailed report all use this.
+
+Trend pages read OfficeWeeklySnapshot rows instead: ``snapshot_week()``
+aggregates one week of attendance and evaluations per office (run
+weekly by ``snapshot_office_weeks``) and ``weekly_trends()`` turns the
+stored rows into per-week series without touching AttendanceRecord.
+
+Rendered PDFs are kept as ReportSnapshot rows keyed by ``data_version()``,
+a hash of the newest change to everything the report reads. A request
+for a version nobody has rendered yet creates the row — the unique
+``(kind, version)`` constraint lets exactly one request across all
+workers win — and the winner renders in a background thread while
+everyone else waits on the same row (single-flight).
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    ActiveStudentAssistant, AttendanceRecord, DeletedRecord, Office, OfficeWeeklySnapshot,
+    PerformanceEvaluation, ReportSnapshot, compute_hours_worked,
+)
+
+logger = logging.getLogger(__name__)
+
+# A pending snapshot older than this is assumed orphaned (worker restarted)
+SNAPSHOT_STALE_SECONDS = 300
+# Ready snapshots kept per kind; older PDFs are deleted
+SNAPSHOTS_KEPT = 5
+
+ATTENDED_STATUSES = ('present', 'late', 'excused')
+EVAL_CRITERIA = ('work_quality', 'punctuality', 'initiative', 'cooperation', 'communication')
+# report key -> PerformanceEvaluation field
+EVAL_AVERAGES = {
+    'avg_quality': 'work_quality',
+    'avg_punctuality': 'punctuality',
+    'avg_initiative': 'initiative',
+    'avg_cooperation': 'cooperation',
+    'avg_communication': 'communication',
+}
+
+
+def _r(v):
+    return round(float(v), 2) if v else 0
+
+
+def _div(total, count):
+    return float(total) / count if count else 0.0
+
+
+def _sa_groups():
+    """``{office_id: {sa_count, active_count, total_hours, required_hours}}``."""
+    rows = (
+        ActiveStudentAssistant.objects.order_by()
+        .values('assigned_office')
+        .annotate(
+            sa_count=Count('id'),
+            active_count=Count('id', filter=Q(status='active')),
+            total_hours=Sum('total_hours'),
+            required_hours=Sum('required_hours'),
+        )
+    )
+    return {row.pop('assigned_office'): row for row in rows}
+
+
+def _attendance_groups():
+    """``{office_id: {status: count}}``."""
+    groups = defaultdict(dict)
+    rows = (
+        AttendanceRecord.objects.order_by()
+        .values('student_assistant__assigned_office', 'status')
+        .annotate(n=Count('id'))
+    )
+    for row in rows:
+        groups[row['student_assistant__assigned_office']][row['status']] = row['n']
+    return groups
+
+
+def _evaluation_groups():
+    """``{office_id: {count, overall_count, overall_sum, <criterion>_sum...}}``."""
+    rows = (
+        PerformanceEvaluation.objects.order_by()
+        .values('student_assistant__assigned_office')
+        .annotate(
+            count=Count('id'),
+            overall_count=Count('overall_rating'),
+            overall_sum=Sum('overall_rating'),
+            **{f'{field}_sum': Sum(field) for field in EVAL_CRITERIA},
+        )
+    )
+    return {row.pop('student_assistant__assigned_office'): row for row in rows}
+
+
+def _attendance_metrics(by_status):
+    total = sum(by_status.values())
+    attended = sum(by_status.get(s, 0) for s in ATTENDED_STATUSES)
+    return {
+        'att_total': total,
+        'att_present': by_status.get('present', 0),
+        'att_late': by_status.get('late', 0),
+        'att_absent': by_status.get('absent', 0),
+        'att_excused': by_status.get('excused', 0),
+        'attendance_rate': round(attended / total * 100, 1) if total else 0,
+    }
+
+
+def _hours_metrics(sa):
+    avg_hours = round(_div(sa['total_hours'] or 0, sa['sa_count']), 1)
+    avg_required = round(_div(sa['required_hours'] or 0, sa['sa_count']), 1)
+    return {
+        'sa_count': sa['sa_count'],
+        'active_count': sa['active_count'],
+        'avg_hours': avg_hours,
+        'total_hours': round(float(sa['total_hours'] or 0), 1),
+        'avg_required': avg_required,
+        'avg_completion': round(avg_hours / avg_required * 100, 1) if avg_required else 0,
+    }
+
+
+def _evaluation_metrics(ev):
+    metrics = {
+        key: _r(_div(ev[f'{field}_sum'] or 0, ev['count'])) for key, field in EVAL_AVERAGES.items()
+    }
+    metrics['eval_count'] = ev['count']
+    metrics['avg_overall'] = _r(_div(ev['overall_sum'] or 0, ev['overall_count']))
+    return metrics
+
+
+def build_department_report():
+    """
+    Return ``(report, global_stats)``.
+
+    *report* has one dict per active office, in name order, with the Office
+    itself under ``office`` plus ``office_name`` / ``building`` / ``head``
+    for the PDF.
+    """
+    empty_sa = {'sa_count': 0, 'active_count': 0, 'total_hours': 0, 'required_hours': 0}
+    empty_eval = {'count': 0, 'overall_count': 0, 'overall_sum': 0,
+                  **{f'{field}_sum': 0 for field in EVAL_CRITERIA}}
+
+    sa_groups = _sa_groups()
+    att_groups = _attendance_groups()
+    eval_groups = _evaluation_groups()
+
+    report = []
+    for office in Office.objects.filter(is_active=True).order_by('name'):
+        report.append({
+            'office': office,
+            'office_name': office.name,
+            'building': office.building,
+            'head': office.head or '—',
+            **_hours_metrics(sa_groups.get(office.pk, empty_sa)),
+            **_attendance_metrics(att_groups.get(office.pk, {})),
+            **_evaluation_metrics(eval_groups.get(office.pk, empty_eval)),
+        })
+
+    # Global totals: every group, including SAs with no (or an inactive) office
+    all_sa = {key: sum(g[key] or 0 for g in sa_groups.values()) for key in empty_sa}
+    all_att = defaultdict(int)
+    for by_status in att_groups.values():
+        for status, n in by_status.items():
+            all_att[status] += n
+    all_eval = {key: sum(g[key] or 0 for g in eval_groups.values()) for key in empty_eval}
+
+    hours = _hours_metrics(all_sa)
+    global_stats = {
+        'total_sas': all_sa['sa_count'],
+        'active_sas': all_sa['active_count'],
+        'attendance_rate': _attendance_metrics(all_att)['attendance_rate'],
+        'avg_hours': hours['avg_hours'],
+        'total_hours': hours['total_hours'],
+        'avg_overall': _evaluation_metrics(all_eval)['avg_overall'],
+        'eval_count': all_eval['count'],
+    }
+    return report, global_stats
+
+
+# ── Snapshots ────────────────────────────────────────────────────
+
+def data_version():
+    """
+    Hash of the newest change to every table the report reads.
+
+    Inserts and edits move ``updated_at``, deletions add a DeletedRecord,
+    office edits change the office rows themselves, and the date is
+    included because the PDF prints it. Only indexed MAX() lookups.
+    """
+    parts = [date.today().isoformat()]
+    for model in (ActiveStudentAssistant, AttendanceRecord, PerformanceEvaluation):
+        parts.append(model.objects.aggregate(last=Max('updated_at'))['last'])
+    parts.append(DeletedRecord.objects.aggregate(last=Max('id'))['last'])
+    parts.append(list(
+        Office.objects.filter(is_active=True).order_by('pk').values_list('pk', 'name', 'building', 'head')
+    ))
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def render_snapshot(snapshot_id):
+    """
+    Build the report, render the PDF and mark the snapshot ready (or
+    failed). The PDF is drawn inside a 'pdf' slot of the shared CPU budget,
+    waiting for one if web requests hold them all.
+    """
+    from .limiter import cpu_slot
+    from .views import _render_department_report_pdf
+
+    snapshot = ReportSnapshot.objects.get(pk=snapshot_id)
+    try:
+        report, global_stats = build_department_report()
+        with cpu_slot('pdf'):
+            pdf_bytes = _render_department_report_pdf(report, global_stats)
+        snapshot.file.save(f'department_{snapshot.version[:16]}.pdf', ContentFile(pdf_bytes), save=False)
+        snapshot.summary = global_stats
+        snapshot.status = 'ready'
+    except Exception as e:
+        logger.exception('Rendering %s report snapshot %s failed', snapshot.kind, snapshot.version)
+        snapshot.status = 'failed'
+        snapshot.error = str(e)
+    snapshot.finished_at = timezone.now()
+    snapshot.save(update_fields=['file', 'summary', 'status', 'error', 'finished_at'])
+    if snapshot.status == 'ready':
+        _prune_snapshots(snapshot.kind)
+    return snapshot
+
+
+def _prune_snapshots(kind):
+    """Delete all but the newest SNAPSHOTS_KEPT ready snapshots not attached to unsent email."""
+    keep = list(
+        ReportSnapshot.objects.filter(kind=kind, status='ready')
+        .order_by('-finished_at').values_list('pk', flat=True)[:SNAPSHOTS_KEPT]
+    )
+    old = (
+        ReportSnapshot.objects.filter(kind=kind).exclude(pk__in=keep).exclude(status='pending')
+        .exclude(emails__status__in=['queued', 'sending'])
+    )
+    for snapshot in old:
+        if snapshot.file:
+            snapshot.file.delete(save=False)
+        snapshot.delete()
+
+
+def _render_in_background(snapshot_id):
+    def _run():
+        try:
+            render_snapshot(snapshot_id)
+        finally:
+            connection.close()
+
+    transaction.on_commit(
+        lambda: threading.Thread(target=_run, name='report-snapshot', daemon=True).start()
+    )
+
+
+def claim_snapshot(snapshot):
+    """
+    Take over *snapshot* for rendering if it failed or has been pending
+    longer than SNAPSHOT_STALE_SECONDS (its renderer died). Returns True,
+    with *snapshot* refreshed and pending again, when this caller won it.
+    """
+    stale = timezone.now() - timedelta(seconds=SNAPSHOT_STALE_SECONDS)
+    retry = Q(status='failed') | Q(status='pending', started_at__lt=stale)
+    claimed = ReportSnapshot.objects.filter(retry, pk=snapshot.pk).update(
+        status='pending', error='', started_at=timezone.now(),
+    ) == 1
+    if claimed:
+        snapshot.refresh_from_db()
+    return claimed
+
+
+def recover_stale_snapshots():
+    """
+    Finish snapshots orphaned mid-render so emails waiting on them don't
+    wait forever. A department report is re-rendered from the current
+    data; other kinds can't be rebuilt from the row alone and are marked
+    failed. Returns the number of snapshots recovered.
+    """
+    stale = timezone.now() - timedelta(seconds=SNAPSHOT_STALE_SECONDS)
+    recovered = 0
+    for snapshot in ReportSnapshot.objects.filter(status='pending', started_at__lt=stale):
+        if not claim_snapshot(snapshot):
+            continue  # another flusher took it
+        logger.warning('Recovering orphaned %s report snapshot %s', snapshot.kind, snapshot.version)
+        if snapshot.kind == 'department':
+            render_snapshot(snapshot.pk)
+        else:
+            snapshot.status = 'failed'
+            snapshot.error = 'Rendering was interrupted.'
+            snapshot.finished_at = timezone.now()
+            snapshot.save(update_fields=['status', 'error', 'finished_at'])
+        recovered += 1
+    return recovered
+
+
+def request_snapshot(kind='department', background=True):
+    """
+    Return the snapshot for the current data, starting a render if needed.
+
+    Only the request that creates the row (or takes over a failed or
+    orphaned one) renders; everyone else gets the same pending row. With
+    ``background=False`` the render happens in this thread.
+    """
+    version = data_version()
+    snapshot, created = ReportSnapshot.objects.get_or_create(kind=kind, version=version)
+    claimed = created or (snapshot.status != 'ready' and claim_snapshot(snapshot))
+    if claimed:
+        if background:
+            _render_in_background(snapshot.pk)
+        else:
+            snapshot = render_snapshot(snapshot.pk)
+    return snapshot
+
+
+def wait_for_snapshot(snapshot, timeout, interval=0.25):
+    """Poll until *snapshot* leaves 'pending' or *timeout* seconds pass; returns it refreshed."""
+    deadline = time.monotonic() + timeout
+    while snapshot.status == 'pending' and time.monotonic() < deadline:
+        time.sleep(interval)
+        snapshot.refresh_from_db(fields=['status', 'file', 'summary', 'error', 'finished_at'])
+    return snapshot
+
+
+# ── Weekly trends ────────────────────────────────────────────────
+
+SNAPSHOT_COUNTS = ('att_total', 'att_present', 'att_late', 'att_absent', 'att_excused', 'eval_count')
+SNAPSHOT_SUMS = ('hours_worked', 'eval_overall_sum')
+SEMESTER_LABELS = dict(ActiveStudentAssistant.SEMESTER_CHOICES)
+
+
+def week_start_for(day):
+    """Monday of the week containing *day*."""
+    return day - timedelta(days=day.weekday())
+
+
+def snapshot_week(week_start):
+    """
+    Write (or rewrite) the OfficeWeeklySnapshot of every active office for
+    the week starting *week_start*; returns the number of rows written.
+    """
+    week_end = week_start + timedelta(days=6)
+    metrics = defaultdict(lambda: {
+        **{key: 0 for key in SNAPSHOT_COUNTS},
+        **{key: Decimal('0') for key in SNAPSHOT_SUMS},
+        'sa_count': 0, 'terms': Counter(),
+    })
+
+    # SAs whose duty period overlaps the week (and who existed by then)
+    on_duty = (
+        ActiveStudentAssistant.objects.order_by()
+        .filter(assigned_office__isnull=False, created_at__date__lte=week_end)
+        .filter(Q(start_date__isnull=True) | Q(start_date__lte=week_end))
+        .filter(Q(end_date__isnull=True) | Q(end_date__gte=week_start))
+        .values('assigned_office', 'semester', 'academic_year')
+        .annotate(n=Count('id'))
+    )
+    for row in on_duty:
+        m = metrics[row['assigned_office']]
+        m['sa_count'] += row['n']
+        m['terms'][(row['semester'], row['academic_year'])] += row['n']
+
+    records = (
+        AttendanceRecord.objects.order_by()
+        .filter(date__range=(week_start, week_end), student_assistant__assigned_office__isnull=False)
+        .values_list('student_assistant__assigned_office', 'status', 'date', 'time_in', 'time_out')
+    )
+    for office_id, status, day, time_in, time_out in records.iterator():
+        m = metrics[office_id]
+        m['att_total'] += 1
+        if f'att_{status}' in m:
+            m[f'att_{status}'] += 1
+        m['hours_worked'] += Decimal(str(compute_hours_worked(day, time_in, time_out)))
+
+    evaluations = (
+        PerformanceEvaluation.objects.order_by()
+        .filter(evaluated_at__date__range=(week_start, week_end))
+        .values('student_assistant__assigned_office')
+        .annotate(n=Count('id'), overall=Sum('overall_rating'))
+    )
+    for row in evaluations:
+        if row['student_assistant__assigned_office'] is None:
+            continue
+        m = metrics[row['student_assistant__assigned_office']]
+        m['eval_count'] = row['n']
+        m['eval_overall_sum'] = row['overall'] or Decimal('0')
+
+    written = 0
+    with transaction.atomic():
+        for office_id in Office.objects.filter(is_active=True).values_list('pk', flat=True):
+            m = metrics[office_id]
+            terms = m.pop('terms')
+            semester, academic_year = terms.most_common(1)[0][0] if terms else ('', '')
+            OfficeWeeklySnapshot.objects.update_or_create(
+                office_id=office_id, week_start=week_start,
+                defaults={'semester': semester, 'academic_year': academic_year, **m},
+            )
+            written += 1
+    return written
+
+
+def _trend_point(week_start, totals, previous):
+    attended = totals['att_present'] + totals['att_late'] + totals['att_excused']
+    semester, academic_year = totals['terms'].most_common(1)[0][0] if totals['terms'] else ('', '')
+    point = {
+        'week_start': week_start,
+        'term': ' '.join(filter(None, [SEMESTER_LABELS.get(semester, semester), academic_year])),
+        'sa_count': totals['sa_count'],
+        'att_total': totals['att_total'],
+        'att_present': totals['att_present'],
+        'att_late': totals['att_late'],
+        'att_absent': totals['att_absent'],
+        'att_excused': totals['att_excused'],
+        'attendance_rate': round(attended / totals['att_total'] * 100, 1) if totals['att_total'] else None,
+        'hours_worked': round(float(totals['hours_worked']), 1),
+        'eval_count': totals['eval_count'],
+        'avg_overall': _r(_div(totals['eval_overall_sum'], totals['eval_count'])) or None,
+    }
+    # Week-over-week change; None where either week has no data
+    for key in ('attendance_rate', 'hours_worked'):
+        before = previous[key] if previous else None
+        point[f'{key}_change'] = (
+            round(point[key] - before, 1) if point[key] is not None and before is not None else None
+        )
+    return point
+
+
+def _series(rows):
+    """Fold snapshot rows (any number of offices) into one point per week."""
+    by_week = defaultdict(lambda: {
+        **{key: 0 for key in SNAPSHOT_COUNTS},
+        **{key: Decimal('0') for key in SNAPSHOT_SUMS},
+        'sa_count': 0, 'terms': Counter(),
+    })
+    for row in rows:
+        totals = by_week[row['week_start']]
+        for key in ('sa_count', *SNAPSHOT_COUNTS, *SNAPSHOT_SUMS):
+            totals[key] += row[key]
+        if row['semester']:
+            totals['terms'][(row['semester'], row['academic_year'])] += row['sa_count']
+    series, previous = [], None
+    for week_start in sorted(by_week):
+        previous = _trend_point(week_start, by_week[week_start], previous)
+        series.append(previous)
+    return series
+
+
+def weekly_trends(weeks=52, office_id=None):
+    """
+    Per-week series from the stored snapshots only:
+    ``{'overall': [...], 'offices': [{'office_id', 'name', 'series': [...]}]}``,
+    covering the last *weeks* weeks, optionally for a single office.
+    """
+    since = week_start_for(date.today()) - timedelta(weeks=weeks)
+    snapshots = OfficeWeeklySnapshot.objects.filter(week_start__gte=since)
+    if office_id:
+        snapshots = snapshots.filter(office_id=office_id)
+    rows = list(snapshots.order_by('week_start').values(
+        'office_id', 'office__name', 'week_start', 'semester', 'academic_year', 'sa_count',
+        *SNAPSHOT_COUNTS, *SNAPSHOT_SUMS,
+    ))
+
+    by_office = defaultdict(list)
+    for row in rows:
+        by_office[(row['office__name'], row['office_id'])].append(row)
+    return {
+        'overall': _series(rows),
+        'offices': [
+            {'office_id': office_id, 'name': name, 'series': _series(office_rows)}
+            for (name, office_id), office_rows in sorted(by_office.items())
+        ],
+    }
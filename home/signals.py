@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+
+from .delta_export import MODEL_FEEDS
+from .models import Application, DeletedRecord, NewApplication, RenewalApplication
+
+
+def record_deletion(sender, instance, **kwargs):
+    """Leave a tombstone for a deleted row of a delta-exported model.
+
+    Also fires for rows removed by cascade (e.g. an SA's attendance).
+    """
+    DeletedRecord.objects.create(entity=MODEL_FEEDS[sender], object_pk=instance.pk)
+
+
+# Connected per model: a receiver without a sender would turn off Django's
+# fast-delete path for every cascade in the project.
+for _model in MODEL_FEEDS:
+    post_delete.connect(
+        record_deletion, sender=_model, dispatch_uid=f'delta-tombstone-{_model.__name__}',
+    )
+
+
+def sync_application(sender, instance, created, raw, **kwargs):
+    """Mirror a saved NewApplication / RenewalApplication into Application.
+
+    Skipped for fixture loads (``raw``); ``sync_applications`` rebuilds
+    the table afterwards.
+    """
+    if not raw:
+        Application.sync(instance, created=created)
+
+
+for _model in (NewApplication, RenewalApplication):
+    post_save.connect(
+        sync_application, sender=_model, dispatch_uid=f'application-sync-{_model.__name__}',
+    )
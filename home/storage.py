@@ -1,11 +1,259 @@
 import hashlib
 import mimetypes
-from io import BytesIO
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BufferedReader, RawIOBase
 
 from django.core.files.base import ContentFile, File
 from django.core.files.storage import Storage
 from django.utils.deconstruct import deconstructible
 
+# Fixed size of each DBBlobChunk row. Reads and writes move one row at a
+# time, so a request never holds more than a chunk or two of a file.
+DB_FILE_CHUNK_SIZE = 256 * 1024
+
+
+def iter_db_file(file_id, start=0, end=None):
+    """
+    Return an iterator over the bytes ``start..end`` (inclusive) of a
+    DBFile, one chunk row per query, so the full blob is never loaded into
+    the Python process. Raises FileNotFoundError if the row is gone; the
+    iterator raises IOError if a chunk row is missing.
+    """
+    from home.models import DBFile
+
+    row = DBFile.objects.filter(pk=file_id).values_list('blob_id', 'size').first()
+    if row is None:
+        raise FileNotFoundError(f"DBFile {file_id} no longer exists")
+    blob_id, size = row
+    if end is None:
+        end = size - 1
+    return _iter_blob(blob_id, start, end)
+
+
+def _iter_blob(blob_id, start, end):
+    from home.models import DBBlobChunk
+
+    for index in range(start // DB_FILE_CHUNK_SIZE, end // DB_FILE_CHUNK_SIZE + 1):
+        chunk = (
+            DBBlobChunk.objects.filter(blob_id=blob_id, index=index)
+            .values_list('data', flat=True)
+            .first()
+        )
+        if chunk is None:
+            # Don't let a short body pass for the whole file (or get cached as it)
+            raise IOError(f'blob {blob_id} missing chunk {index}')
+        offset = index * DB_FILE_CHUNK_SIZE
+        yield bytes(chunk[max(start - offset, 0):end - offset + 1])
+
+
+class DBBlobReader(RawIOBase):
+    """
+    Lazy, seekable reader over a blob's chunk rows.
+
+    Only the chunk under the current position is kept in memory; wrap it
+    in ``io.BufferedReader`` for efficient small reads.
+    """
+
+    def __init__(self, blob_id, size):
+        self.blob_id = blob_id
+        self.size = size
+        self._pos = 0
+        self._chunk_index = None
+        self._chunk = b''
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def _load_chunk(self, index):
+        from home.models import DBBlobChunk
+        if index != self._chunk_index:
+            data = (
+                DBBlobChunk.objects.filter(blob_id=self.blob_id, index=index)
+                .values_list('data', flat=True)
+                .first()
+            )
+            if data is None:
+                raise IOError(f'blob {self.blob_id} missing chunk {index}')
+            self._chunk = bytes(data)
+            self._chunk_index = index
+        return self._chunk
+
+    def readinto(self, buffer):
+        if self._pos >= self.size:
+            return 0
+        index, offset = divmod(self._pos, DB_FILE_CHUNK_SIZE)
+        piece = self._load_chunk(index)[offset:offset + len(buffer)]
+        n = len(piece)
+        buffer[:n] = piece
+        self._pos += n
+        return n
+
+
+class DBBlobWriter:
+    """
+    Streaming writer that stores bytes as fixed-size DBBlobChunk rows while
+    hashing them.
+
+    ``close()`` deduplicates: if a blob with the same digest already exists
+    the freshly written rows are dropped and the existing blob is shared.
+    It returns the blob with its reference count bumped for the caller.
+    Must be used inside a transaction.
+    """
+
+    def __init__(self):
+        from uuid import uuid4
+        from home.models import DBBlob
+
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._index = 0
+        self._size = 0
+        # Placeholder digest until the content hash is known
+        self.blob = DBBlob.objects.create(sha256=f'pending-{uuid4().hex}')
+
+    def write(self, data):
+        self._hash.update(data)
+        self._size += len(data)
+        self._buffer += data
+        while len(self._buffer) >= DB_FILE_CHUNK_SIZE:
+            self._flush(bytes(self._buffer[:DB_FILE_CHUNK_SIZE]))
+            del self._buffer[:DB_FILE_CHUNK_SIZE]
+        return len(data)
+
+    def _flush(self, data):
+        from home.models import DBBlobChunk
+        DBBlobChunk.objects.create(blob=self.blob, index=self._index, data=data)
+        self._index += 1
+
+    def close(self):
+        from django.db import IntegrityError, transaction
+        from django.db.models import F
+        from home.models import DBBlob
+
+        if self._buffer:
+            self._flush(bytes(self._buffer))
+            self._buffer.clear()
+
+        digest = self._hash.hexdigest()
+        updated = DBBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    DBBlob.objects.filter(pk=self.blob.pk).update(
+                        sha256=digest, size=self._size, ref_count=1,
+                    )
+                    self.blob.sha256, self.blob.size, self.blob.ref_count = digest, self._size, 1
+                    return self.blob
+            except IntegrityError:
+                # Another upload of the same bytes won the race — share its blob
+                DBBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+        self.blob.delete()
+        self.blob = DBBlob.objects.only('pk', 'sha256', 'size').get(sha256=digest)
+        return self.blob
+
+
+def _release_blob(blob_id):
+    """
+    Drop one reference to a blob, deleting it once nothing points at it.
+    Returns the number of bytes freed: the blob's size if it was deleted,
+    otherwise 0.
+    """
+    from django.db.models import F
+    from home.models import DBBlob
+
+    DBBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+    unused = DBBlob.objects.filter(pk=blob_id, ref_count__lte=0, files__isnull=True)
+    size = unused.values_list('size', flat=True).first()
+    if size is None:
+        return 0
+    unused.delete()
+    return size
+
+
+def db_file_meta(name):
+    """
+    Return metadata for the DBFile called *name*, or None if it doesn't exist.
+
+    The dict (pk, blob_id, sha256, size, content_type, created_at and
+    updated_at as POSIX timestamps) is served from the node-local media
+    cache when fresh, so repeated exists/size/mtime lookups skip the DB.
+    """
+    from home import media_cache
+    from home.models import DBFile
+
+    meta = media_cache.get_meta(name)
+    if meta is not None:
+        return meta
+    row = (
+        DBFile.objects.filter(name=name)
+        .values('pk', 'blob_id', 'blob__sha256', 'size', 'content_type', 'created_at', 'updated_at')
+        .first()
+    )
+    if row is None:
+        # Misses aren't cached: a stale "doesn't exist" could make
+        # get_available_name() hand out a name another node just used.
+        return None
+    meta = {
+        'pk': row['pk'],
+        'blob_id': row['blob_id'],
+        'sha256': row['blob__sha256'],
+        'size': row['size'],
+        'content_type': row['content_type'],
+        'created_at': row['created_at'].timestamp(),
+        'updated_at': row['updated_at'].timestamp(),
+    }
+    media_cache.set_meta(name, meta)
+    return meta
+
+
+def cached_db_file_path(name, meta):
+    """
+    Return a local path holding the contents described by *meta*, filling
+    the disk cache from the database on a miss. None if caching is off.
+    Raises FileNotFoundError if *meta* was cached but the row is gone.
+    """
+    from home import media_cache
+
+    if not media_cache.enabled():
+        return None
+    path = media_cache.get_path(name, meta['updated_at'])
+    if path is None:
+        try:
+            chunks = iter_db_file(meta['pk'])
+        except FileNotFoundError:
+            media_cache.invalidate(name)  # deleted on another node
+            raise
+        path = media_cache.store(name, meta['updated_at'], chunks)
+    return path
+
+
+def _forget(name):
+    from django.db import transaction
+    from home import media_cache
+
+    media_cache.invalidate(name)
+    # Another worker may re-cache the old row before we commit
+    transaction.on_commit(lambda: media_cache.invalidate(name))
+
 
 @deconstructible
 class DatabaseStorage(Storage):
@@ -14,45 +262,77 @@ class DatabaseStorage(Storage):
     """
 
     def _open(self, name, mode='rb'):
-        from home.models import DBFile
-        try:
-            db_file = DBFile.objects.get(name=name)
-            return ContentFile(db_file.data, name=name)
-        except DBFile.DoesNotExist:
+        meta = db_file_meta(name)
+        if meta is None:
             raise FileNotFoundError(f"File not found: {name}")
+        path = cached_db_file_path(name, meta)
+        if path is not None:
+            try:
+                return File(open(path, 'rb'), name=name)
+            except OSError:
+                pass  # evicted between lookup and open
+        reader = BufferedReader(DBBlobReader(meta['blob_id'], meta['size']), DB_FILE_CHUNK_SIZE)
+        db_file = File(reader, name=name)
+        db_file.size = meta['size']
+        return db_file
 
     def _save(self, name, content):
+        from django.db import transaction
         from home.models import DBFile
 
-        # Read data
-        if hasattr(content, 'read'):
-            data = content.read()
-        else:
-            data = content
+        if not hasattr(content, 'chunks'):
+            content = ContentFile(content)
 
         # Guess content type
         content_type, _ = mimetypes.guess_type(name)
         content_type = content_type or 'application/octet-stream'
 
-        # Create or update
-        db_file, created = DBFile.objects.update_or_create(
-            name=name,
-            defaults={
-                'data': data,
-                'content_type': content_type,
-                'size': len(data),
-            }
-        )
+        # Identical bytes share one blob; the name just points at it
+        with transaction.atomic():
+            writer = DBBlobWriter()
+            for piece in content.chunks(DB_FILE_CHUNK_SIZE):
+                writer.write(piece)
+            blob = writer.close()
+            previous_blob_id = (
+                DBFile.objects.select_for_update()
+                .filter(name=name)
+                .values_list('blob_id', flat=True)
+                .first()
+            )
+            DBFile.objects.update_or_create(
+                name=name,
+                defaults={
+                    'blob': blob,
+                    'content_type': content_type,
+                    'size': blob.size,
+                }
+            )
+            if previous_blob_id is not None:
+                _release_blob(previous_blob_id)
+            _forget(name)
 
         return name
 
     def delete(self, name):
+        """Delete *name*; returns the bytes freed (0 while its blob is still shared)."""
+        from django.db import transaction
         from home.models import DBFile
-        DBFile.objects.filter(name=name).delete()
+        with transaction.atomic():
+            blob_id = (
+                DBFile.objects.select_for_update()
+                .filter(name=name)
+                .values_list('blob_id', flat=True)
+                .first()
+            )
+            if blob_id is None:
+                return 0
+            DBFile.objects.filter(name=name).delete()
+            freed = _release_blob(blob_id)
+            _forget(name)
+        return freed
 
     def exists(self, name):
-        from home.models import DBFile
-        return DBFile.objects.filter(name=name).exists()
+        return db_file_meta(name) is not None
 
     def listdir(self, path):
         from home.models import DBFile
@@ -60,27 +340,26 @@ class DatabaseStorage(Storage):
         return [], list(files)
 
     def size(self, name):
-        from home.models import DBFile
-        try:
-            return DBFile.objects.get(name=name).size
-        except DBFile.DoesNotExist:
-            return 0
+        meta = db_file_meta(name)
+        return meta['size'] if meta else 0
 
     def url(self, name):
         from django.urls import reverse
         return reverse('home:serve_db_file', kwargs={'file_path': name})
 
-    def get_accessed_time(self, name):
+    def _timestamp(self, name, field):
+        from datetime import datetime, timezone
         from home.models import DBFile
-        db_file = DBFile.objects.get(name=name)
-        return db_file.updated_at
+        meta = db_file_meta(name)
+        if meta is None:
+            raise DBFile.DoesNotExist(f"File not found: {name}")
+        return datetime.fromtimestamp(meta[field], tz=timezone.utc)
+
+    def get_accessed_time(self, name):
+        return self._timestamp(name, 'updated_at')
 
     def get_created_time(self, name):
-        from home.models import DBFile
-        db_file = DBFile.objects.get(name=name)
-        return db_file.created_at
+        return self._timestamp(name, 'created_at')
 
     def get_modified_time(self, name):
-        from home.models import DBFile
-        db_file = DBFile.objects.get(name=name)
-        return db_file.updated_at
+        return self._timestamp(name, 'updated_at')
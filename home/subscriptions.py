@@ -0,0 +1,261 @@
+"""
+Scheduled report delivery.
+
+``send_due_reports()`` (the ``send_scheduled_reports`` command, run from
+cron at least daily) finds active ReportSubscriptions whose last complete
+cadence window hasn't been delivered yet. Subscriptions asking for the
+same report, window and filters share one rendered file, stored as a
+ReportSnapshot; every recipient gets an EmailOutbox row pointing at it,
+and the outbox is flushed once at the end so all messages go out over a
+single SMTP connection.
+
+Each group of subscriptions is claimed (a conditional UPDATE of
+``last_window``), rendered and queued in one transaction, so overlapping
+runs never send a window twice. If the render fails, or the process dies
+part-way, the claim is rolled back with it and the next run retries that
+window instead of treating it as delivered.
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ActiveStudentAssistant, AttendanceRecord, ReportSnapshot, ReportSubscription, compute_hours_worked,
+)
+from .outbox import flush_outbox, queue_email
+
+logger = logging.getLogger(__name__)
+
+# Same ₱35/hr the SA payout summaries use
+HOURLY_RATE = Decimal('35.00')
+
+
+def cadence_window(cadence, today):
+    """``(start, end)`` of the last complete daily / weekly / monthly window before *today*."""
+    if cadence == 'daily':
+        day = today - timedelta(days=1)
+        return day, day
+    if cadence == 'weekly':
+        start = today - timedelta(days=today.weekday() + 7)
+        return start, start + timedelta(days=6)
+    end = today.replace(day=1) - timedelta(days=1)
+    return end.replace(day=1), end
+
+
+def _period_label(cadence, start):
+    """e.g. "October 18, 2026", "Week of October 12, 2026", "September 2026"."""
+    if cadence == 'daily':
+        return start.strftime('%B %d, %Y')
+    if cadence == 'weekly':
+        return f"Week of {start.strftime('%B %d, %Y')}"
+    return start.strftime('%B %Y')
+
+
+def _export_filters(sub, start, end):
+    """The filter dict ``views._apply_export_filters`` expects."""
+    return {
+        'date_from': start,
+        'date_to': end,
+        'office': sub.office_id,
+        'status': sub.status if sub.report == 'attendance' else '',
+        'semester': sub.semester,
+    }
+
+
+def _csv_bytes(header, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue().encode('utf-8')
+
+
+# ── Renderers: filters -> (content, content_type, row count) ────
+
+def _render_attendance(filters):
+    from .views import _attendance_export
+
+    header, rows = _attendance_export(filters)
+    rows = list(rows)
+    return _csv_bytes(header, rows), 'text/csv', len(rows)
+
+
+def _render_payroll(filters):
+    """Hours and payout per SA for attendance inside the window."""
+    from .views import _apply_export_filters
+
+    records = _apply_export_filters(
+        AttendanceRecord.objects.order_by(), filters,
+        'date', 'student_assistant__assigned_office_id', 'status', 'student_assistant__semester',
+    ).values_list('student_assistant_id', 'status', 'date', 'time_in', 'time_out')
+
+    per_sa = defaultdict(lambda: {'present': 0, 'late': 0, 'absent': 0, 'excused': 0, 'hours': Decimal('0')})
+    for sa_id, status, day, time_in, time_out in records.iterator():
+        totals = per_sa[sa_id]
+        if status in totals:
+            totals[status] += 1
+        totals['hours'] += Decimal(str(compute_hours_worked(day, time_in, time_out)))
+
+    sas = (
+        ActiveStudentAssistant.objects.filter(pk__in=per_sa)
+        .order_by('assigned_office__name', 'full_name')
+        .values_list('pk', 'student_id', 'full_name', 'assigned_office__name')
+    )
+    header = [
+        'Student ID', 'Full Name', 'Office', 'Present', 'Late', 'Absent', 'Excused',
+        'Hours Worked', 'Hourly Rate', 'Payout',
+    ]
+    rows, total_hours, total_payout = [], Decimal('0'), Decimal('0')
+    for pk, student_id, full_name, office in sas:
+        t = per_sa[pk]
+        payout = round(t['hours'] * HOURLY_RATE, 2)
+        total_hours += t['hours']
+        total_payout += payout
+        rows.append([
+            student_id, full_name, office or '', t['present'], t['late'], t['absent'], t['excused'],
+            t['hours'], HOURLY_RATE, payout,
+        ])
+    count = len(rows)
+    rows.append(['', 'TOTAL', '', '', '', '', '', total_hours, '', total_payout])
+    return _csv_bytes(header, rows), 'text/csv', count
+
+
+RENDERERS = {
+    'attendance': ('Attendance Export', 'attendance_export', _render_attendance),
+    'payroll': ('Payroll Summary', 'payroll_summary', _render_payroll),
+}
+
+
+def _window_snapshot(report, filters):
+    """Render (or reuse) the file for one report/window/filters combination."""
+    from .reports import _prune_snapshots, claim_snapshot
+
+    key = json.dumps([report, filters], default=str, sort_keys=True)
+    version = hashlib.sha256(key.encode()).hexdigest()
+    snapshot, created = ReportSnapshot.objects.get_or_create(kind=report, version=version)
+    claimed = created or (snapshot.status != 'ready' and claim_snapshot(snapshot))
+    if not claimed:
+        return snapshot  # ready, or another run is rendering it (the outbox waits)
+
+    _, file_prefix, render = RENDERERS[report]
+    try:
+        content, content_type, count = render(filters)
+        name = f'{file_prefix}_{filters["date_from"]}_{filters["date_to"]}.csv'
+        snapshot.file.save(name, ContentFile(content), save=False)
+        snapshot.content_type = content_type
+        snapshot.summary = {'rows': count, 'from': str(filters['date_from']), 'to': str(filters['date_to'])}
+        snapshot.status = 'ready'
+    except Exception as e:
+        logger.exception('Rendering scheduled %s report failed', report)
+        snapshot.status = 'failed'
+        snapshot.error = str(e)
+    snapshot.finished_at = timezone.now()
+    snapshot.save(update_fields=['file', 'content_type', 'summary', 'status', 'error', 'finished_at'])
+    if snapshot.status == 'ready':
+        _prune_snapshots(report)
+    return snapshot
+
+
+def _scope_label(sub):
+    parts = []
+    if sub.office_id:
+        parts.append(sub.office.name)
+    if sub.semester:
+        parts.append(sub.get_semester_display())
+    if sub.status and sub.report == 'attendance':
+        parts.append(f'{sub.get_status_display()} only')
+    return f" ({', '.join(parts)})" if parts else ''
+
+
+def due_subscriptions(today=None):
+    """``[(subscription, window_start, window_end), ...]`` not yet delivered for their last window."""
+    today = today or date.today()
+    due = []
+    for sub in ReportSubscription.objects.filter(is_active=True).select_related('office'):
+        start, end = cadence_window(sub.cadence, today)
+        if sub.last_window != start:
+            due.append((sub, start, end))
+    return due
+
+
+def _deliver(subs):
+    """
+    Render the report shared by *subs* and queue one email per recipient.
+    Returns ``(subject, recipient_count)``, or None if the render failed.
+    """
+    from .reports import request_snapshot
+
+    sub, start, end = subs[0]
+    recipients = sorted({address.lower() for s, _, _ in subs for address in s.recipient_list()})
+
+    if sub.report == 'department':
+        snapshot = request_snapshot(background=False)
+        subject = f"Department-Level Reports — {date.today().strftime('%B %d, %Y')}"
+        attachment_name = f"Department_Reports_{date.today().strftime('%Y%m%d')}.pdf"
+        body = ''  # the outbox writes it from the snapshot summary
+    else:
+        title, file_prefix, _ = RENDERERS[sub.report]
+        snapshot = _window_snapshot(sub.report, _export_filters(sub, start, end))
+        period = _period_label(sub.cadence, start)
+        subject = f'{title} — {period}{_scope_label(sub)}'
+        attachment_name = f'{file_prefix}_{start}_{end}.csv'
+        body = (
+            f'Good day,\n\n'
+            f'Please find attached the {title} for {start:%B %d, %Y} to {end:%B %d, %Y}{_scope_label(sub)}.\n\n'
+            f'This is an automated report from the CHMSU SA Application System. '
+            f'You receive it because of a scheduled report subscription.'
+        )
+    if snapshot.status == 'failed':
+        logger.warning('Scheduled report "%s" not sent: %s', subject, snapshot.error)
+        return None
+
+    for address in recipients:
+        queue_email(address, subject, body=body, snapshot=snapshot, attachment_name=attachment_name)
+    return subject, len(recipients)
+
+
+def send_due_reports(today=None):
+    """
+    Render and queue every due subscription, then flush the outbox once.
+    Returns ``(deliveries, sent, failed)`` where *deliveries* lists
+    ``(subject, recipient_count)`` per rendered report.
+    """
+    groups = defaultdict(list)
+    for sub, start, end in due_subscriptions(today):
+        if sub.report == 'department':
+            key = ('department',)
+        else:
+            key = (sub.report, sub.cadence, start, end, sub.office_id, sub.semester,
+                   sub.status if sub.report == 'attendance' else '')
+        groups[key].append((sub, start, end))
+
+    deliveries = []
+    for due in groups.values():
+        with transaction.atomic():
+            # Claim the windows; a concurrent run that got here first wins
+            subs = [
+                (sub, start, end) for sub, start, end in due
+                if ReportSubscription.objects.filter(pk=sub.pk).exclude(last_window=start).update(
+                    last_window=start,
+                )
+            ]
+            if not subs:
+                continue
+            delivery = _deliver(subs)
+            if delivery is None:
+                # Roll the claims back so the next run renders this window again
+                transaction.set_rollback(True)
+                continue
+        deliveries.append(delivery)
+
+    sent, failed = flush_outbox() if deliveries else (0, 0)
+    return deliveries, sent, failed
@@ -52,3 +52,13 @@ def mask_sid(student_id, own_id=''):
     if len(sid) > 3:
         return sid[:3] + '*' * (len(sid) - 3)
     return sid
+
+
+@register.filter
+def derivative(field_file, variant='card'):
+    """URL of a resized WebP/JPEG variant of an image field.
+
+    Usage: <img src="{{ announcement.image|derivative:'card' }}">
+    """
+    from home.derivatives import derivative_url
+    return derivative_url(field_file, variant)
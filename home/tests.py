@@ -1 +1,276 @@
-from django.test import TestCase
\ No newline at end of file
+import re
+from datetime import date, time, timedelta
+
+from django.db import connection
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import (
+    ActiveStudentAssistant, Application, AttendanceRecord, NewApplication, NoDutyDay, Office, RenewalApplication,
+)
+
+FILLED_STATUSES = ['office_assigned', 'approved']
+
+
+def sequential_scans(queryset):
+    """
+    Tables *queryset* reads with a full sequential scan, per the database's
+    EXPLAIN output. On PostgreSQL sequential scans are disabled for the
+    query first, so one only appears when no index can serve it — a small
+    test table would otherwise be scanned whatever indexes exist. Only
+    PostgreSQL and SQLite plans are parsed; QueryPlanTests skips other
+    backends before calling this.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return set(re.findall(r'Seq Scan on (\w+)', queryset.explain()))
+    if connection.vendor == 'sqlite':
+        scans = set()
+        for line in queryset.explain().splitlines():
+            # "SCAN t" is a table scan; "SCAN t USING [COVERING] INDEX i" walks an index
+            match = re.search(r'\bSCAN (\w+)\s*$', line)
+            if match:
+                scans.add(match.group(1))
+        return scans
+
+
+class QueryPlanTests(TestCase):
+    """
+    The hot view queries must stay on an index. Each case mirrors a query
+    from views.py / models.py; if a change to the query or to Meta.indexes
+    drops it back to a sequential scan, the test names the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            return
+        statuses = [code for code, _ in NewApplication.STATUS_CHOICES]
+        cls.offices = Office.objects.bulk_create(
+            [Office(name=f'Office {i}', total_slots=5) for i in range(8)]
+        )
+        NewApplication.objects.bulk_create([
+            NewApplication(
+                first_name=f'First{i}', middle_initial='M', last_name=f'Last{i}',
+                date_of_birth=date(2004, 1, 1), gender='female', contact_number='09170000000',
+                email=f'new{i}@example.com', address='Talisay City', student_id=f'1{i:07d}',
+                course='BSIT', year_level=1 + i % 4, semester='1st',
+                preferred_office=cls.offices[i % 8], status=statuses[i % len(statuses)],
+                assigned_office=cls.offices[i % 8].name if statuses[i % len(statuses)] in FILLED_STATUSES else '',
+            )
+            for i in range(400)
+        ])
+        RenewalApplication.objects.bulk_create([
+            RenewalApplication(
+                student_id=f'2{i:07d}', full_name=f'Renewal {i}', email=f'renew{i}@example.com',
+                contact_number='09170000000', address='Talisay City', course='BSIT',
+                year_level=2 + i % 3, semester='1st', hours_rendered=200,
+                preferred_office=cls.offices[i % 8], status=statuses[i % len(statuses)],
+                assigned_office=cls.offices[i % 8].name if statuses[i % len(statuses)] in FILLED_STATUSES else '',
+            )
+            for i in range(200)
+        ])
+        # bulk_create skips post_save, so fill the unified table directly
+        for model in (NewApplication, RenewalApplication):
+            for app in model.objects.all():
+                Application.sync(app)
+        cls.today = date(2026, 10, 19)
+        sas = ActiveStudentAssistant.objects.bulk_create([
+            ActiveStudentAssistant(
+                student_id=f'3{i:07d}', full_name=f'SA {i:03d}', email=f'sa{i}@example.com',
+                assigned_office=cls.offices[i % 8], semester='1st', academic_year='2026-2027',
+                start_date=date(2026, 6, 1), end_date=date(2026, 6, 1) + timedelta(days=100 + i),
+                status=['active', 'completed', 'expired'][i % 3],
+            )
+            for i in range(150)
+        ])
+        cls.sa = sas[0]
+        attendance_statuses = [code for code, _ in AttendanceRecord.STATUS_CHOICES]
+        AttendanceRecord.objects.bulk_create([
+            AttendanceRecord(
+                student_assistant=sa, date=date(2026, 6, 1) + timedelta(days=day), shift='8:00 AM - 9:00 AM',
+                time_in=time(8, 0), time_out=time(9, 0),
+                status=attendance_statuses[(sa.pk + day) % len(attendance_statuses)],
+            )
+            for sa in sas
+            for day in range(0, 140, 2)
+        ])
+        NoDutyDay.objects.bulk_create(
+            [NoDutyDay(date=date(2026, 6, 1) + timedelta(days=7 * i), reason='Holiday') for i in range(20)]
+            + [
+                NoDutyDay(date=date(2026, 6, 3) + timedelta(days=7 * i), reason='Office Closed', office=office)
+                for i in range(20)
+                for office in cls.offices
+            ]
+        )
+
+    def setUp(self):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest(f'No EXPLAIN parser for {connection.vendor}')
+
+    def assertUsesIndex(self, queryset, table):
+        self.assertNotIn(
+            table, sequential_scans(queryset),
+            f'Sequential scan on {table}:\n{queryset.query}\n\n{queryset.explain()}',
+        )
+
+    def test_applications_by_status(self):
+        for model in (NewApplication, RenewalApplication):
+            table = model._meta.db_table
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(model.objects.filter(status='approved').order_by('-submitted_at'), table)
+                self.assertUsesIndex(model.objects.filter(status='pending'), table)
+                self.assertUsesIndex(
+                    model.objects.filter(status__in=['approved', 'rejected']).order_by('-submitted_at')[:10], table,
+                )
+
+    def test_applications_by_email(self):
+        for model, email in ((NewApplication, 'new7@example.com'), (RenewalApplication, 'renew7@example.com')):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.filter(email=email).order_by('-submitted_at'), model._meta.db_table,
+                )
+
+    def test_applications_by_student_id(self):
+        for model, student_id in ((NewApplication, '10000007'), (RenewalApplication, '20000007')):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.filter(student_id=student_id).order_by('-submitted_at'), model._meta.db_table,
+                )
+
+    def test_filled_office_slots(self):
+        for model in (NewApplication, RenewalApplication):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.filter(assigned_office='Office 3', status__in=FILLED_STATUSES),
+                    model._meta.db_table,
+                )
+
+    def test_unified_applications(self):
+        table = Application._meta.db_table
+        self.assertUsesIndex(Application.objects.all()[:25], table)
+        self.assertUsesIndex(Application.objects.filter(status__in=['approved', 'rejected'])[:10], table)
+        self.assertUsesIndex(Application.objects.filter(student_id='20000007').order_by('kind', '-submitted_at'), table)
+        self.assertUsesIndex(Application.objects.filter(email='renew7@example.com'), table)
+        self.assertUsesIndex(
+            Application.objects.filter(status__in=FILLED_STATUSES).exclude(assigned_office='')
+            .order_by().values_list('assigned_office'),
+            table,
+        )
+
+    def test_active_sa_lookups(self):
+        table = ActiveStudentAssistant._meta.db_table
+        self.assertUsesIndex(
+            ActiveStudentAssistant.objects.filter(student_id='30000007').order_by('-created_at'), table,
+        )
+        self.assertUsesIndex(
+            ActiveStudentAssistant.objects.select_related('assigned_office')
+            .filter(status='active').order_by('full_name'),
+            table,
+        )
+        self.assertUsesIndex(ActiveStudentAssistant.objects.filter(status='completed'), table)
+        self.assertUsesIndex(
+            ActiveStudentAssistant.objects.filter(status='active', end_date__isnull=False, end_date__lt=self.today),
+            table,
+        )
+
+    def test_attendance_for_sa(self):
+        table = AttendanceRecord._meta.db_table
+        self.assertUsesIndex(self.sa.attendance_records.all(), table)
+        self.assertUsesIndex(self.sa.attendance_records.filter(date=self.today), table)
+        self.assertUsesIndex(
+            self.sa.attendance_records.filter(status='late', date__year=2026, date__month=7), table,
+        )
+
+    def test_attendance_date_range(self):
+        self.assertUsesIndex(
+            AttendanceRecord.objects.filter(date__gte=date(2026, 7, 1), date__lte=date(2026, 7, 31))
+            .order_by('-date', '-time_in'),
+            AttendanceRecord._meta.db_table,
+        )
+
+    def test_no_duty_days(self):
+        table = NoDutyDay._meta.db_table
+        office = self.offices[2]
+        self.assertUsesIndex(
+            NoDutyDay.objects.filter(Q(office=office) | Q(office__isnull=True), date=self.today), table,
+        )
+        self.assertUsesIndex(
+            NoDutyDay.objects.filter(Q(office=office) | Q(office__isnull=True), date__gte=self.today)
+            .order_by('date'),
+            table,
+        )
+        self.assertUsesIndex(NoDutyDay.objects.filter(date=self.today), table)
+
+    def test_detects_sequential_scan(self):
+        # Guard against the parser silently never matching
+        self.assertIn(
+            NewApplication._meta.db_table,
+            sequential_scans(NewApplication.objects.filter(address__contains='Talisay')),
+        )
+
+
+class ApplicationSyncTests(TestCase):
+    """The unified Application table follows saves and deletes of both detail models."""
+
+    def test_new_and_renewal_rows(self):
+        office = Office.objects.create(name='Library', total_slots=3)
+        new = NewApplication.objects.create(
+            first_name='Ana', middle_initial='B', last_name='Cruz', date_of_birth=date(2004, 1, 1),
+            gender='female', contact_number='09170000000', email='ana@example.com', address='Talisay City',
+            student_id='12345678', course='BSIT', year_level=1, semester='1st', preferred_office=office,
+        )
+        renewal = RenewalApplication.objects.create(
+            student_id='87654321', full_name='Ben Reyes', email='ben@example.com', contact_number='09170000000',
+            address='Talisay City', course='BSCS', year_level=3, semester='2nd', hours_rendered=120,
+        )
+        self.assertEqual(
+            list(Application.objects.values_list('kind', 'student_id', 'full_name', 'status')),
+            [('renewal', '87654321', 'Ben Reyes', 'pending'), ('new', '12345678', 'Ana Cruz', 'pending')],
+        )
+        self.assertEqual(new.base.detail, new)
+        self.assertEqual(renewal.base.preferred_office, None)
+
+        new.status = 'approved'
+        new.assigned_office = office.name
+        new.save(update_fields=['status', 'assigned_office', 'updated_at'])
+        base = Application.objects.get(new_application=new)
+        self.assertEqual((base.status, base.assigned_office), ('approved', 'Library'))
+
+        renewal.delete()
+        self.assertEqual(list(Application.objects.values_list('kind', flat=True)), ['new'])
+
+
+@override_settings(MEDIA_CACHE_MAX_BYTES=0)
+class ServeDbFileRangeTests(TestCase):
+    """Range / If-Range handling in serve_db_file."""
+
+    def setUp(self):
+        from .storage import DatabaseStorage, db_file_meta
+
+        name = DatabaseStorage().save('tests/range.txt', ContentFile(b'0123456789'))
+        self.url = reverse('home:serve_db_file', kwargs={'file_path': name})
+        self.etag = f'"{db_file_meta(name)["sha256"]}"'
+
+    def get(self, **headers):
+        response = self.client.get(self.url, secure=True, **headers)
+        return response, b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE=self.etag)
+        self.assertEqual((response.status_code, body), (206, b'234'))
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+
+    def test_unsatisfiable_range_with_matching_if_range(self):
+        response, _ = self.get(HTTP_RANGE='bytes=20-30', HTTP_IF_RANGE=self.etag)
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_stale_if_range_sends_whole_file(self):
+        for byte_range in ('bytes=2-4', 'bytes=20-30'):
+            with self.subTest(byte_range=byte_range):
+                response, body = self.get(HTTP_RANGE=byte_range, HTTP_IF_RANGE='"stale"')
+                self.assertEqual((response.status_code, body), (200, b'0123456789'))
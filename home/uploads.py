@@ -0,0 +1,118 @@
+"""
+Upload normalization for application documents.
+
+Phone photos and camera captures are downscaled to a per-document pixel
+cap, EXIF is dropped (after applying its orientation) and the image is
+re-encoded as JPEG at the quality set in UploadSettings. PDFs pass
+through untouched. Each normalized file is logged in NormalizedUpload so
+``upload_savings_report`` can show how many bytes were saved.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+# Longest edge (px) kept per document. Scans need enough resolution for
+# staff to read small print; the ID picture only needs to be a portrait.
+DOCUMENT_MAX_PIXELS = {
+    'id_picture': 1200,
+}
+DEFAULT_MAX_PIXELS = 2200
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class NormalizedFile(ContentFile):
+    """Re-encoded upload that remembers what it replaced."""
+
+    def __init__(self, content, name, original):
+        super().__init__(content, name=name)
+        self.original = original
+
+
+def normalize_upload(uploaded, field_name, quality):
+    """
+    Return a normalized copy of *uploaded*, or *uploaded* itself when it's
+    not an image or re-encoding wouldn't help.
+
+    The returned NormalizedFile carries an ``original`` dict (name, bytes,
+    size, dimensions) for the upload log.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    base, ext = os.path.splitext(uploaded.name)
+    if ext.lower() not in IMAGE_EXTENSIONS:
+        return uploaded
+
+    uploaded.seek(0)
+    data = uploaded.read()
+    uploaded.seek(0)
+    max_px = DOCUMENT_MAX_PIXELS.get(field_name, DEFAULT_MAX_PIXELS)
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            original_size = img.size
+            had_exif = bool(img.info.get('exif'))
+            # Let the JPEG decoder skip straight to a smaller scale when it can
+            img.draft('RGB', (max_px, max_px))
+            img = ImageOps.exif_transpose(img)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                img = img.convert('RGBA')
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel('A'))
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.thumbnail((max_px, max_px), Image.LANCZOS)
+
+            out = BytesIO()
+            img.save(out, 'JPEG', quality=quality, optimize=True, progressive=True)
+            width, height = img.size
+    except (UnidentifiedImageError, OSError):
+        return uploaded  # let the form's own validation deal with it
+
+    normalized = out.getvalue()
+    resized = max(original_size) > max_px
+    if len(normalized) >= len(data) and not resized and not had_exif:
+        return uploaded
+
+    return NormalizedFile(normalized, name=f'{base}.jpg', original={
+        'name': uploaded.name,
+        'data': data,
+        'size': len(data),
+        'width': original_size[0],
+        'height': original_size[1],
+        'normalized_size': len(normalized),
+        'normalized_width': width,
+        'normalized_height': height,
+    })
+
+
+def log_normalized_uploads(instance, originals):
+    """
+    Record a NormalizedUpload row for each normalized file now saved on
+    *instance*, keeping the original bytes if UploadSettings asks for it.
+
+    *originals* maps field name -> the ``original`` dict of the
+    NormalizedFile that was assigned to that field.
+    """
+    from .models import NormalizedUpload, UploadSettings
+
+    if not originals:
+        return
+    keep_originals = UploadSettings.load().keep_originals
+    for field_name, original in originals.items():
+        log = NormalizedUpload(
+            field_name=field_name,
+            stored_name=getattr(instance, field_name).name,
+            original_name=original['name'],
+            original_size=original['size'],
+            normalized_size=original['normalized_size'],
+            original_width=original['width'],
+            original_height=original['height'],
+            width=original['normalized_width'],
+            height=original['normalized_height'],
+        )
+        if keep_originals:
+            log.original_file.save(original['name'], ContentFile(original['data']), save=False)
+        log.save()
@@ -12,8 +12,9 @@ urlpatterns = [
     path('apply/camera-photo/', views.process_camera_photo, name='process_camera_photo'),
     path('apply/validate-document/', views.validate_document, name='validate_document'),
 
-    # ---- Database File Serving (production) ----
+    # ---- Database File Serving (production) & Image Variants ----
     re_path(r'^media/(?P<file_path>.+)$', views.serve_db_file, name='serve_db_file'),
+    path('img/<str:variant>/<str:digest>/<path:name>', views.image_derivative, name='image_derivative'),
 
     # ---- Student Auth & Dashboard ----
     path('student/login/', views.student_login, name='student_login'),
@@ -55,6 +56,9 @@ urlpatterns = [
     path('staff/offices/<int:pk>/delete/', views.staff_delete_office, name='staff_delete_office'),
     path('staff/offices/<int:pk>/json/', views.staff_get_office_json, name='staff_get_office_json'),
 
+    # ---- Staff: Load-shedding stats ----
+    path('staff/concurrency/json/', views.staff_concurrency_stats, name='staff_concurrency_stats'),
+
     # ---- Director: Move Office Marker ----
     path('director/offices/<int:pk>/move/', views.director_move_office, name='director_move_office'),
 
@@ -71,10 +75,13 @@ urlpatterns = [
     path('director/sa/<int:pk>/attendance/', views.director_log_attendance, name='director_log_attendance'),
     path('director/sa/<int:pk>/evaluate/', views.director_evaluate_sa, name='director_evaluate_sa'),
     path('director/sa/<int:pk>/status/', views.director_update_sa_status, name='director_update_sa_status'),
+    path('director/sa/certificates/', views.director_bulk_certificates, name='director_bulk_certificates'),
     path('sa/<int:pk>/certificate/', views.sa_completion_certificate, name='sa_completion_certificate'),
     path('director/reports/', views.director_department_reports, name='director_department_reports'),
     path('director/reports/pdf/', views.director_department_reports_pdf, name='director_department_reports_pdf'),
     path('director/reports/email/', views.director_department_reports_email, name='director_department_reports_email'),
+    path('director/reports/trends/', views.director_department_trends, name='director_department_trends'),
+    path('director/reports/trends/json/', views.director_department_trends_json, name='director_department_trends_json'),
 
     # ---- Student: Schedule & Document Resubmission ----
     path('resubmit-schedule/<str:app_type>/<int:pk>/', views.resubmit_schedule, name='resubmit_schedule'),
@@ -96,4 +103,7 @@ urlpatterns = [
     path('staff/export/active-sa/', views.staff_export_active_sa_csv, name='staff_export_active_sa_csv'),
     path('staff/export/attendance/', views.staff_export_attendance_csv, name='staff_export_attendance_csv'),
     path('director/export/evaluations/', views.director_export_evaluations_csv, name='director_export_evaluations_csv'),
+
+    # ---- Delta export API (registrar / finance sync) ----
+    path('api/export/<str:feed>/', views.export_api_delta, name='export_api_delta'),
 ]
@@ -9,11 +9,11 @@ from django.conf import settings
 from django.utils import timezone
 from .models import (
     StudentProfile, Document, ApplicationStep,
-    UpcomingDate, Reminder, Announcement, NewApplication, RenewalApplication, Office,
+    UpcomingDate, Reminder, Announcement, Application, NewApplication, RenewalApplication, Office,
     ActiveStudentAssistant, AttendanceRecord, PerformanceEvaluation,
     ApplicationNote, NoDutyDay, DutyReminder, DBFile,
     calculate_end_date, recalculate_end_dates_for_office, auto_expire_student_assistants,
-    generate_absent_records_for_yesterday,
+    generate_absent_records_for_yesterday, compute_hours_worked,
 )
 from .forms import (
     ReminderForm, UpcomingDateForm, AnnouncementForm, NewApplicationForm,
@@ -27,6 +27,8 @@ from .email_utils import (
     send_schedule_mismatch_email, send_document_request_email,
     send_verification_email,
 )
+from .uploads import log_normalized_uploads
+from .limiter import concurrency_limit
 from datetime import date as _date, datetime as _datetime, timedelta
 import json
 import csv
@@ -36,8 +38,11 @@ from decimal import Decimal
 import base64
 import os
 import uuid
+import logging
 from django.core.files.base import ContentFile
 
+logger = logging.getLogger(__name__)
+
 
 def _inject_camera_photos(request, doc_fields):
     """Move camera-captured photos from hidden POST fields into request.FILES.
@@ -85,79 +90,144 @@ def _urgency_for_days(days_left):
     return 'normal'
 
 
-def _validate_uploaded_file(file_field, field_name):
-    """Run OpenCV quality checks on stored uploaded file. Returns dict with results."""
-    import cv2
-    import numpy as np
-    result = {'warnings': [], 'checks': {}}
-    try:
-        if not file_field or not file_field.name:
-            return result
-        ext = ''
-        if '.' in file_field.name:
-            ext = ('.' + file_field.name.rsplit('.', 1)[-1]).lower()
-        is_image = ext in ('.jpg', '.jpeg', '.png')
-        if not is_image:
-            return result
-
-        file_field.open('rb')
-        file_bytes = file_field.read()
-        file_field.close()
-
-        np_arr = np.frombuffer(file_bytes, np.uint8)
-        img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        if img is None:
-            result['warnings'].append('Could not decode image — file may be corrupted.')
-            result['checks']['decodable'] = False
-            return result
-
-        result['checks']['decodable'] = True
-        h, w = img.shape[:2]
-        result['checks']['resolution'] = f'{w}x{h}'
-
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-        # Blur detection
-        lap_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-        result['checks']['blur_score'] = round(lap_var, 2)
-        if lap_var < 50.0:
-            result['warnings'].append(f'Blurry (sharpness: {lap_var:.0f})')
-            result['checks']['blur_ok'] = False
-        else:
-            result['checks']['blur_ok'] = True
-
-        # Blank detection
-        std_dev = gray.std()
-        result['checks']['contrast_score'] = round(std_dev, 2)
-        if std_dev < 15.0:
-            result['warnings'].append('Appears blank or nearly blank')
-            result['checks']['blank_ok'] = False
-        else:
-            result['checks']['blank_ok'] = True
+def _store_document_validation(storage, name, field_name):
+    """Validate one stored document and save the result in DocumentValidation."""
+    import hashlib
+    from .models import DocumentValidation
+    from .vision import is_image_name, validate_image_bytes
 
-        # Face detection for ID pictures
-        if field_name == 'id_picture':
-            try:
-                cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-                face_cascade = cv2.CascadeClassifier(cascade_path)
-                faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
-                num = len(faces) if faces is not None else 0
-                result['checks']['faces_detected'] = num
-                if num == 0:
-                    result['warnings'].append('No face detected')
-                    result['checks']['face_ok'] = False
-                elif num > 1:
-                    result['warnings'].append(f'{num} faces detected (expected 1)')
-                    result['checks']['face_ok'] = False
-                else:
-                    result['checks']['face_ok'] = True
-            except Exception:
-                pass
-    except Exception:
-        pass
+    with storage.open(name, 'rb') as f:
+        file_bytes = f.read()
+    content_hash = hashlib.sha256(file_bytes).hexdigest()
+    if is_image_name(name):
+        result = validate_image_bytes(file_bytes, field_name)
+    else:
+        result = {'warnings': [], 'checks': {}}
+    DocumentValidation.record(name, content_hash, field_name, result)
     return result
 
 
+# ── Background document validation ──
+# One worker thread per process drains the queue; a file already queued
+# (or being validated) in this process isn't queued again.
+_validation_queue = None
+_validation_queued = set()
+_validation_lock = None
+_validation_worker = None
+
+
+def _validation_loop():
+    from django.db import connection
+    from .models import DocumentValidation
+
+    while True:
+        storage, name, field_name = _validation_queue.get()
+        try:
+            try:
+                _store_document_validation(storage, name, field_name)
+            except Exception as e:
+                logger.exception('Document validation failed for %s', name)
+                DocumentValidation.record_failure(name, field_name, str(e))
+        except Exception:
+            logger.exception('Could not record validation failure for %s', name)
+        finally:
+            with _validation_lock:
+                _validation_queued.discard(name)
+            if _validation_queue.empty():
+                connection.close()
+
+
+def _enqueue_validations(storage, pending):
+    global _validation_queue, _validation_lock, _validation_worker
+    import queue
+    import threading
+
+    if _validation_lock is None:
+        _validation_lock = threading.Lock()
+    with _validation_lock:
+        if _validation_queue is None:
+            _validation_queue = queue.Queue()
+        for name, field_name in pending:
+            if name not in _validation_queued:
+                _validation_queued.add(name)
+                _validation_queue.put((storage, name, field_name))
+        if _validation_worker is None or not _validation_worker.is_alive():
+            _validation_worker = threading.Thread(
+                target=_validation_loop, name='document-validation', daemon=True,
+            )
+            _validation_worker.start()
+
+
+def _validate_documents_in_background(storage, pending):
+    """Validate ``[(file_name, field_name), ...]`` on the background worker.
+
+    Queued after the current transaction commits, so the files it reads
+    are visible. A file that can't be validated gets an error result, so
+    it isn't retried on every page view. Anything lost (e.g. a worker
+    restart) is picked up again the next time a reviewer opens the
+    application.
+    """
+    from django.db import transaction
+
+    if not pending:
+        return
+    transaction.on_commit(lambda: _enqueue_validations(storage, pending))
+
+
+def _queue_document_validation(app, field_names):
+    """Schedule validation for the documents just uploaded on *app*."""
+    pending = []
+    storage = None
+    for field_name in field_names:
+        file_field = getattr(app, field_name, None)
+        if file_field:
+            pending.append((file_field.name, field_name))
+            storage = file_field.storage
+    _validate_documents_in_background(storage, pending)
+
+
+def _stored_document_validations(app, field_names):
+    """Return ``{field_name: result}`` from DocumentValidation for *app*'s files.
+
+    Review pages only read this table; documents without a stored result
+    yet are queued for background validation and show as pending. So do
+    documents whose validation failed, until DocumentValidation.MAX_ATTEMPTS
+    is used up; they're re-queued once their backoff has passed.
+    """
+    from .models import DocumentValidation
+
+    names = {}
+    storage = None
+    for field_name in field_names:
+        file_field = getattr(app, field_name, None)
+        if file_field:
+            names[file_field.name] = field_name
+            storage = file_field.storage
+    if not names:
+        return {}
+
+    results = {}
+    backing_off = set()
+    now = timezone.now()
+    for row in (
+        DocumentValidation.objects.filter(file_name__in=names)
+        .order_by('created_at')
+        .only('file_name', 'result', 'error', 'attempts', 'updated_at')
+    ):
+        if row.error and not row.gave_up:
+            if not row.retry_due(now):
+                backing_off.add(row.file_name)
+            continue
+        results[names[row.file_name]] = row.result  # newest row wins
+
+    missing = [
+        (name, field) for name, field in names.items()
+        if field not in results and name not in backing_off
+    ]
+    _validate_documents_in_background(storage, missing)
+    return results
+
+
 def _create_active_sa_from_application(app):
     """
     Create an ActiveStudentAssistant record from an approved application.
@@ -343,6 +413,26 @@ STATUS_DISPLAY_MAP = {
 }
 
 
+def _applications_with_details():
+    """All applications of both types, newest first, each with its detail row joined (one query)."""
+    return Application.objects.select_related(
+        'new_application__preferred_office', 'renewal_application__preferred_office',
+    )
+
+
+def _filled_slots_by_office():
+    """``{office name: filled slots}`` — office_assigned/approved applications of both types."""
+    from django.db.models import Count
+
+    return dict(
+        Application.objects.filter(status__in=['office_assigned', 'approved'])
+        .exclude(assigned_office='')
+        .order_by()
+        .values_list('assigned_office')
+        .annotate(n=Count('pk'))
+    )
+
+
 def home(request):
     """Home/dashboard view for student applicants."""
     today = _date.today()
@@ -355,9 +445,7 @@ def home(request):
         track_sid = request.POST.get('track_student_id', '').strip()
         if track_sid:
             # Verify the student ID actually exists before storing
-            exists_new = NewApplication.objects.filter(student_id=track_sid).exists()
-            exists_renew = RenewalApplication.objects.filter(student_id=track_sid).exists()
-            if exists_new or exists_renew:
+            if Application.objects.filter(student_id=track_sid).exists():
                 tracked = request.session.get('tracked_student_ids', [])
                 if track_sid not in tracked:
                     tracked.append(track_sid)
@@ -385,19 +473,10 @@ def home(request):
 
     # 2. If authenticated, also find by email
     if request.user.is_authenticated:
-        email_new = NewApplication.objects.filter(
-            email=request.user.email
-        ).order_by('-submitted_at')
-        for a in email_new:
-            if a not in new_apps:
-                new_apps.append(a)
-
-        email_renewal = RenewalApplication.objects.filter(
-            email=request.user.email
-        ).order_by('-submitted_at')
-        for a in email_renewal:
-            if a not in renewal_apps:
-                renewal_apps.append(a)
+        for entry in _applications_with_details().filter(email=request.user.email):
+            found = renewal_apps if entry.is_renewal else new_apps
+            if entry.detail not in found:
+                found.append(entry.detail)
 
     # 3. If a session-based new app exists, find matching renewals & vice-versa
     session_student_ids = set()
@@ -414,21 +493,15 @@ def home(request):
     for sid in tracked_ids:
         session_student_ids.add(sid)
 
-    if session_student_ids:
-        for a in NewApplication.objects.filter(student_id__in=session_student_ids).order_by('-submitted_at'):
-            if a not in new_apps:
-                new_apps.append(a)
-        for a in RenewalApplication.objects.filter(student_id__in=session_student_ids).order_by('-submitted_at'):
-            if a not in renewal_apps:
-                renewal_apps.append(a)
-
-    if session_emails:
-        for a in NewApplication.objects.filter(email__in=session_emails).order_by('-submitted_at'):
-            if a not in new_apps:
-                new_apps.append(a)
-        for a in RenewalApplication.objects.filter(email__in=session_emails).order_by('-submitted_at'):
-            if a not in renewal_apps:
-                renewal_apps.append(a)
+    if session_student_ids or session_emails:
+        from django.db.models import Q
+        matches = _applications_with_details().filter(
+            Q(student_id__in=session_student_ids) | Q(email__in=session_emails)
+        )
+        for entry in matches:
+            found = renewal_apps if entry.is_renewal else new_apps
+            if entry.detail not in found:
+                found.append(entry.detail)
 
     # ── Build unified application cards ──
     applications = []
@@ -572,35 +645,16 @@ def home(request):
 
     # ── All Applications (public list for Application History table) ──
     all_applications = []
-    for app in NewApplication.objects.all().order_by('-submitted_at'):
-        student_name = f"{app.first_name} {app.last_name}"
-        documents = _build_documents_from_app(app)
-        display_status, status_message = STATUS_DISPLAY_MAP.get(
-            app.status,
-            ('Under Review', "Your documents are currently being verified.")
-        )
-        total_docs = len(documents)
-        completed_docs = sum(1 for d in documents if d['status'] in ('uploaded', 'done'))
-        all_applications.append({
-            'obj': app,
-            'app_type': 'New Application',
-            'app_type_icon': 'fa-file-circle-plus',
-            'app_type_class': 'new',
-            'app_type_key': 'new',
-            'student_name': student_name,
-            'application_id': app.student_id,
-            'documents': documents,
-            'application_status': display_status,
-            'raw_status': app.status,
-            'total_docs': total_docs,
-            'completed_docs': completed_docs,
-            'submitted_at': app.submitted_at,
-            'schedule_mismatch_note': app.schedule_mismatch_note if app.status == 'schedule_mismatch' else '',
-            'requested_documents_note': app.requested_documents_note if app.status == 'documents_requested' else '',
-            'assigned_office': app.assigned_office or (app.preferred_office.name if app.preferred_office else '—'),
-        })
-    for app in RenewalApplication.objects.all().order_by('-submitted_at'):
-        documents = _build_documents_from_renewal(app)
+    for entry in _applications_with_details():
+        app = entry.detail
+        if entry.is_renewal:
+            documents = _build_documents_from_renewal(app)
+            app_type, app_type_icon = 'Renewal Application', 'fa-arrows-rotate'
+            assigned_office = app.assigned_office or '—'
+        else:
+            documents = _build_documents_from_app(app)
+            app_type, app_type_icon = 'New Application', 'fa-file-circle-plus'
+            assigned_office = app.assigned_office or (app.preferred_office.name if app.preferred_office else '—')
         display_status, status_message = STATUS_DISPLAY_MAP.get(
             app.status,
             ('Under Review', "Your documents are currently being verified.")
@@ -609,11 +663,11 @@ def home(request):
         completed_docs = sum(1 for d in documents if d['status'] in ('uploaded', 'done'))
         all_applications.append({
             'obj': app,
-            'app_type': 'Renewal Application',
-            'app_type_icon': 'fa-arrows-rotate',
-            'app_type_class': 'renewal',
-            'app_type_key': 'renewal',
-            'student_name': app.full_name,
+            'app_type': app_type,
+            'app_type_icon': app_type_icon,
+            'app_type_class': entry.kind,
+            'app_type_key': entry.kind,
+            'student_name': entry.full_name,
             'application_id': app.student_id,
             'documents': documents,
             'application_status': display_status,
@@ -623,33 +677,21 @@ def home(request):
             'submitted_at': app.submitted_at,
             'schedule_mismatch_note': app.schedule_mismatch_note if app.status == 'schedule_mismatch' else '',
             'requested_documents_note': app.requested_documents_note if app.status == 'documents_requested' else '',
-            'assigned_office': app.assigned_office or '—',
+            'assigned_office': assigned_office,
         })
-    all_applications.sort(key=lambda x: x['submitted_at'], reverse=True)
 
     # ── Approved Student Assistants (public list) ──
-    approved_new = NewApplication.objects.filter(status='approved').order_by('-submitted_at')
-    approved_renewal = RenewalApplication.objects.filter(status='approved').order_by('-submitted_at')
-    approved_students = []
-    for app in approved_new:
-        approved_students.append({
-            'name': f"{app.first_name} {app.last_name}",
-            'student_id': app.student_id,
-            'course': app.course,
-            'office': app.assigned_office or '—',
-            'start_date': app.start_date,
-            'submitted_at': app.submitted_at,
-        })
-    for app in approved_renewal:
-        approved_students.append({
+    approved_students = [
+        {
             'name': app.full_name,
             'student_id': app.student_id,
             'course': app.course,
             'office': app.assigned_office or '—',
             'start_date': app.start_date,
             'submitted_at': app.submitted_at,
-        })
-    approved_students.sort(key=lambda x: x['submitted_at'], reverse=True)
+        }
+        for app in Application.objects.filter(status='approved')
+    ]
 
     # Get logged-in student's ID for unmasking their own data
     logged_in_student_id = ''
@@ -676,21 +718,16 @@ def home(request):
 
 def available_offices(request):
     """GIS campus map with available offices — real data from DB."""
+    from .derivatives import derivative_url
+
     offices_qs = Office.objects.filter(is_active=True)
 
     # Count filled slots per office from both application types
     # (students with status office_assigned or approved)
+    filled_slots = _filled_slots_by_office()
     offices_data = []
     for office in offices_qs:
-        filled_new = NewApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled_renewal = RenewalApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled = filled_new + filled_renewal
+        filled = filled_slots.get(office.name, 0)
         available = max(0, office.total_slots - filled)
 
         if filled >= office.total_slots:
@@ -711,7 +748,7 @@ def available_offices(request):
                 'student_id': app.student_id,
                 'status': app.get_status_display(),
                 'status_key': app.status,
-                'photo': app.id_picture.url if app.id_picture else '',
+                'photo': derivative_url(app.id_picture, 'avatar'),
             })
         for app in RenewalApplication.objects.filter(
             assigned_office=office.name,
@@ -722,7 +759,7 @@ def available_offices(request):
                 'student_id': app.student_id,
                 'status': app.get_status_display(),
                 'status_key': app.status,
-                'photo': app.id_picture.url if app.id_picture else '',
+                'photo': derivative_url(app.id_picture, 'avatar'),
             })
 
         offices_data.append({
@@ -788,6 +825,8 @@ def apply_new(request):
             if request.user.is_authenticated and hasattr(request.user, 'student_profile'):
                 application.user = request.user
             application.save()
+            log_normalized_uploads(application, getattr(form, 'normalized_uploads', {}))
+            _queue_document_validation(application, list(request.FILES))
             request.session['application_pk'] = application.pk
             # Persist student_id in session for reliable lookup
             tracked = request.session.get('tracked_student_ids', [])
@@ -805,17 +844,10 @@ def apply_new(request):
         form = NewApplicationForm()
 
     # Build available offices list with slot info for the template
+    filled_slots = _filled_slots_by_office()
     available_offices_list = []
     for office in Office.objects.filter(is_active=True).order_by('name'):
-        filled_new = NewApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled_renewal = RenewalApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled = filled_new + filled_renewal
+        filled = filled_slots.get(office.name, 0)
         available = max(0, office.total_slots - filled)
         available_offices_list.append({
             'id': office.pk,
@@ -847,6 +879,8 @@ def apply_renew(request):
             if request.user.is_authenticated and hasattr(request.user, 'student_profile'):
                 application.user = request.user
             application.save()
+            log_normalized_uploads(application, getattr(form, 'normalized_uploads', {}))
+            _queue_document_validation(application, list(request.FILES))
             request.session['renewal_pk'] = application.pk
             # Persist student_id in session for reliable lookup
             tracked = request.session.get('tracked_student_ids', [])
@@ -864,17 +898,10 @@ def apply_renew(request):
         form = RenewalApplicationForm()
 
     # Build available offices list with slot info for the template
+    filled_slots = _filled_slots_by_office()
     available_offices_list = []
     for office in Office.objects.filter(is_active=True).order_by('name'):
-        filled_new = NewApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled_renewal = RenewalApplication.objects.filter(
-            assigned_office=office.name,
-            status__in=['office_assigned', 'approved'],
-        ).count()
-        filled = filled_new + filled_renewal
+        filled = filled_slots.get(office.name, 0)
         available = max(0, office.total_slots - filled)
         available_offices_list.append({
             'id': office.pk,
@@ -896,8 +923,12 @@ def check_student_id(request):
     if not student_id or not student_id.isdigit():
         return JsonResponse({'exists': False})
 
-    # Look up in NewApplication (the most recent matching record)
-    app = NewApplication.objects.filter(student_id=student_id).order_by('-submitted_at').first()
+    # One lookup across both types; a new application takes precedence over a renewal
+    entry = (
+        Application.objects.select_related('new_application', 'renewal_application__previous_office')
+        .filter(student_id=student_id).order_by('kind', '-submitted_at').first()
+    )
+    app = entry.new_application if entry else None
 
     if app:
         # Build a full name from separate fields
@@ -941,8 +972,7 @@ def check_student_id(request):
             },
         })
 
-    # Also check RenewalApplication
-    renewal = RenewalApplication.objects.filter(student_id=student_id).order_by('-submitted_at').first()
+    renewal = entry.renewal_application if entry else None
     if renewal:
         # Look up ActiveStudentAssistant for hours and supervisor
         sa = ActiveStudentAssistant.objects.filter(student_id=student_id).order_by('-created_at').first()
@@ -977,60 +1007,100 @@ def check_student_id(request):
     return JsonResponse({'exists': False})
 
 
-@require_POST
-def process_camera_photo(request):
-    """Receive a base64 webcam image, process with OpenCV (cv2), and save."""
-    import cv2
-    import numpy as np
+def _camera_upload_buffer(request, limit):
+    """Return the capture bytes of a raw or multipart camera upload as a memoryview.
+
+    Raw bodies are read from the request stream straight into one
+    preallocated buffer; multipart blobs kept in memory are exposed without
+    copying. Returns None when there's no image or it exceeds *limit* bytes.
+    """
+    if request.content_type == 'multipart/form-data':
+        uploaded = request.FILES.get('image')
+        if uploaded is None or uploaded.size > limit:
+            return None
+        if hasattr(uploaded.file, 'getbuffer'):
+            return uploaded.file.getbuffer()
+        return memoryview(uploaded.read())
+
     try:
-        data = json.loads(request.body)
-        image_data = data.get('image', '')
-        field_name = data.get('field', 'photo')
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return None
+    if not 0 < length <= limit:
+        return None
+    buf = memoryview(bytearray(length))
+    received = 0
+    while received < length:
+        chunk = request.read(min(64 * 1024, length - received))
+        if not chunk:
+            break
+        buf[received:received + len(chunk)] = chunk
+        received += len(chunk)
+    return buf[:received]
 
-        # Strip the data URL prefix (e.g. "data:image/png;base64,")
-        if ',' in image_data:
-            image_data = image_data.split(',', 1)[1]
 
-        # Decode base64 to bytes
-        img_bytes = base64.b64decode(image_data)
+@require_POST
+@concurrency_limit('camera_photo', json_response=True)
+def process_camera_photo(request):
+    """Receive a webcam image, enhance it with OpenCV (cv2), and save it as JPEG.
 
-        # Convert to numpy array and decode with OpenCV
-        np_arr = np.frombuffer(img_bytes, np.uint8)
-        img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+    Accepts a raw ``image/jpeg`` / ``image/png`` body or a multipart
+    ``image`` blob (field name in the ``field`` query/POST parameter), and
+    still the older JSON body with a base64 data URL. Captures are capped
+    to ``CAMERA_MAX_EDGE`` before processing; per-stage timings are logged
+    and returned in a ``Server-Timing`` header.
+    """
+    from .vision.camera import CAMERA_MAX_UPLOAD_BYTES, process_camera_image
+    try:
+        if request.content_type in ('image/jpeg', 'image/png', 'multipart/form-data'):
+            field_name = request.GET.get('field') or request.POST.get('field') or 'photo'
+            img_bytes = _camera_upload_buffer(request, CAMERA_MAX_UPLOAD_BYTES)
+            if img_bytes is None:
+                return JsonResponse({'status': 'error', 'message': 'Missing or oversized image'}, status=400)
+        else:
+            data = json.loads(request.body)
+            image_data = data.get('image', '')
+            field_name = data.get('field', 'photo')
 
-        if img is None:
-            return JsonResponse({'status': 'error', 'message': 'Invalid image data'}, status=400)
+            # Strip the data URL prefix (e.g. "data:image/png;base64,")
+            if ',' in image_data:
+                image_data = image_data.split(',', 1)[1]
 
-        # --- OpenCV processing ---
-        # Auto-adjust brightness/contrast
-        lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        img = cv2.merge([l, a, b])
-        img = cv2.cvtColor(img, cv2.COLOR_LAB2BGR)
+            # Decode base64 to bytes
+            img_bytes = base64.b64decode(image_data)
+        field_name = os.path.basename(field_name)
 
-        # Light denoise
-        img = cv2.fastNlMeansDenoisingColored(img, None, 5, 5, 7, 21)
+        # --- OpenCV processing: decode → resize → denoise → CLAHE → JPEG ---
+        jpeg_bytes, timings = process_camera_image(img_bytes)
+        if jpeg_bytes is None:
+            return JsonResponse({'status': 'error', 'message': 'Invalid image data'}, status=400)
 
         # Save processed image
         upload_dir = os.path.join(settings.MEDIA_ROOT, 'camera_photos')
         os.makedirs(upload_dir, exist_ok=True)
 
-        filename = f"{field_name}_{uuid.uuid4().hex[:8]}.png"
+        filename = f"{field_name}_{uuid.uuid4().hex[:8]}.jpg"
         filepath = os.path.join(upload_dir, filename)
-        cv2.imwrite(filepath, img)
+        with open(filepath, 'wb') as fh:
+            fh.write(jpeg_bytes)
 
-        return JsonResponse({
+        logger.info(
+            'camera photo %s processed in %.1f ms (%s)', filename, sum(timings.values()),
+            ', '.join(f'{stage} {ms:.1f}' for stage, ms in timings.items()),
+        )
+        response = JsonResponse({
             'status': 'ok',
             'filename': filename,
             'path': f"{settings.MEDIA_URL}camera_photos/{filename}",
         })
+        response['Server-Timing'] = ', '.join(f'{stage};dur={ms}' for stage, ms in timings.items())
+        return response
     except Exception as e:
         return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
 @require_POST
+@concurrency_limit('validate_document', json_response=True)
 def validate_document(request):
     """AJAX endpoint — validate an uploaded file with OpenCV checks.
 
@@ -1041,9 +1111,8 @@ def validate_document(request):
       • For all images: blur detection (Laplacian variance) & blank page detection
     Returns JSON with ``valid``, ``warnings`` list, and ``checks`` dict.
     """
-    import cv2
-    import numpy as np
     from .forms import MAX_FILE_SIZE_MB, ALLOWED_DOC_EXTENSIONS, ALLOWED_IMAGE_EXTENSIONS
+    from .vision import BLUR_THRESHOLD, analyze_bytes
 
     uploaded = request.FILES.get('file')
     field_name = request.POST.get('field', '')
@@ -1082,73 +1151,39 @@ def validate_document(request):
         try:
             file_bytes = uploaded.read()
             uploaded.seek(0)
-            np_arr = np.frombuffer(file_bytes, np.uint8)
-            img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+            image_checks = analyze_bytes(file_bytes, detect_faces=(field_name == 'id_picture'))
+            checks.update(image_checks)
 
-            if img is None:
+            if not image_checks['decodable']:
                 warnings.append('Could not decode image. The file may be corrupted.')
-                checks['decodable'] = False
             else:
-                checks['decodable'] = True
-                h, w = img.shape[:2]
-                checks['resolution'] = f'{w}x{h}'
-
                 # ── Blur detection (Laplacian variance) ──
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-                checks['blur_score'] = round(laplacian_var, 2)
-                BLUR_THRESHOLD = 50.0
-                if laplacian_var < BLUR_THRESHOLD:
+                if not image_checks['blur_ok']:
                     warnings.append(
-                        f'Image appears blurry (sharpness score: {laplacian_var:.0f}, '
+                        f'Image appears blurry (sharpness score: {image_checks["blur_score"]:.0f}, '
                         f'minimum recommended: {BLUR_THRESHOLD:.0f}). '
                         'Please upload a clearer photo.'
                     )
-                    checks['blur_ok'] = False
-                else:
-                    checks['blur_ok'] = True
 
                 # ── Blank page detection (low std-dev = mostly uniform) ──
-                std_dev = gray.std()
-                checks['contrast_score'] = round(std_dev, 2)
-                BLANK_THRESHOLD = 15.0
-                if std_dev < BLANK_THRESHOLD:
+                if not image_checks['blank_ok']:
                     warnings.append(
                         'Image appears to be blank or nearly blank. '
                         'Please upload the correct document.'
                     )
-                    checks['blank_ok'] = False
-                else:
-                    checks['blank_ok'] = True
 
                 # ── Face detection for id_picture ──
-                if field_name == 'id_picture':
-                    try:
-                        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-                        face_cascade = cv2.CascadeClassifier(cascade_path)
-                        faces = face_cascade.detectMultiScale(
-                            gray,
-                            scaleFactor=1.1,
-                            minNeighbors=5,
-                            minSize=(30, 30),
+                if image_checks.get('face_ok') is False:
+                    num_faces = image_checks['faces_detected']
+                    if num_faces == 0:
+                        warnings.append(
+                            'No face detected in the ID photo. '
+                            'Please upload a clear, front-facing photo.'
+                        )
+                    else:
+                        warnings.append(
+                            f'{num_faces} faces detected. The ID photo should contain exactly one face.'
                         )
-                        num_faces = len(faces) if faces is not None else 0
-                        checks['faces_detected'] = num_faces
-                        if num_faces == 0:
-                            warnings.append(
-                                'No face detected in the ID photo. '
-                                'Please upload a clear, front-facing photo.'
-                            )
-                            checks['face_ok'] = False
-                        elif num_faces > 1:
-                            warnings.append(
-                                f'{num_faces} faces detected. The ID photo should contain exactly one face.'
-                            )
-                            checks['face_ok'] = False
-                        else:
-                            checks['face_ok'] = True
-                    except Exception:
-                        checks['face_ok'] = None  # cascade not available
 
         except Exception as e:
             warnings.append(f'Image analysis error: {str(e)}')
@@ -1209,52 +1244,70 @@ def staff_dashboard(request):
     auto_expire_student_assistants()
 
     # ── Real application data from NewApplication + RenewalApplication ──
+    from django.db.models import Count, Q
     new_apps = NewApplication.objects.all()
-    renewal_apps = RenewalApplication.objects.all()
 
-    total_new = new_apps.count()
-    total_renewal = renewal_apps.count()
-    total_applications = total_new + total_renewal
+    def _status_count(*statuses):
+        return Count('pk', filter=Q(status__in=statuses))
 
-    pending_count = (
-        new_apps.filter(status='pending').count()
-        + renewal_apps.filter(status='pending').count()
-    )
-    under_review_count = (
-        new_apps.filter(status='under_review').count()
-        + renewal_apps.filter(status='under_review').count()
-    )
-    interview_count = (
-        new_apps.filter(status__in=['interview_scheduled', 'interview_done']).count()
-        + renewal_apps.filter(status__in=['interview_scheduled', 'interview_done']).count()
-    )
-    office_assigned_count = (
-        new_apps.filter(status='office_assigned').count()
-        + renewal_apps.filter(status='office_assigned').count()
-    )
-    approved_count = (
-        new_apps.filter(status='approved').count()
-        + renewal_apps.filter(status='approved').count()
-    )
-    rejected_count = (
-        new_apps.filter(status='rejected').count()
-        + renewal_apps.filter(status='rejected').count()
+    counts = Application.objects.aggregate(
+        total=Count('pk'),
+        pending_review=_status_count('pending', 'under_review'),
+        interview=_status_count('interview_scheduled', 'interview_done'),
+        office_assigned=_status_count('office_assigned'),
+        approved=_status_count('approved'),
+        rejected=_status_count('rejected'),
     )
 
     stats = {
-        'total_applications': total_applications,
-        'pending_review': pending_count + under_review_count,
-        'interview_scheduled': interview_count,
-        'office_assigned': office_assigned_count,
-        'approved': approved_count,
-        'rejected': rejected_count,
+        'total_applications': counts['total'],
+        'pending_review': counts['pending_review'],
+        'interview_scheduled': counts['interview'],
+        'office_assigned': counts['office_assigned'],
+        'approved': counts['approved'],
+        'rejected': counts['rejected'],
     }
 
     # ── Build unified list of ALL students (new + renewal) ──
     all_students = []
     today = _date.today()
 
-    for app in new_apps.order_by('-submitted_at'):
+    for entry in _applications_with_details():
+        app = entry.detail
+        if entry.is_renewal:
+            all_students.append({
+                'pk': app.pk,
+                'app_type': 'Renewal',
+                'app_type_class': 'renewal',
+                'student_id': app.student_id,
+                'first_name': app.full_name.split()[0] if app.full_name else '',
+                'last_name': ' '.join(app.full_name.split()[1:]) if app.full_name else '',
+                'middle_initial': '',
+                'extension_name': '',
+                'full_name': app.full_name,
+                'email': app.email,
+                'contact_number': app.contact_number,
+                'address': app.address,
+                'gender_display': '',
+                'date_of_birth': None,
+                'age': '',
+                'course': app.course,
+                'year_level_display': app.get_year_level_display(),
+                'semester_display': app.get_semester_display(),
+                'preferred_office': app.preferred_office.name if app.preferred_office else '',
+                'available_days': ' '.join(sorted(app.availability_schedule.keys())) if app.availability_schedule else '',
+                'interview_date': app.interview_date,
+                'assigned_office': app.assigned_office,
+                'start_date': app.start_date,
+                'submitted_at': app.submitted_at,
+                'status': app.status,
+                'status_display': app.get_status_display(),
+                'review_url_name': 'home:staff_review_application',
+                'status_url_name': 'home:staff_update_application_status',
+                'is_renewal': True,
+            })
+            continue
+
         dob = app.date_of_birth
         age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day)) if dob else None
         all_students.append({
@@ -1289,42 +1342,6 @@ def staff_dashboard(request):
             'is_renewal': False,
         })
 
-    for app in renewal_apps.order_by('-submitted_at'):
-        all_students.append({
-            'pk': app.pk,
-            'app_type': 'Renewal',
-            'app_type_class': 'renewal',
-            'student_id': app.student_id,
-            'first_name': app.full_name.split()[0] if app.full_name else '',
-            'last_name': ' '.join(app.full_name.split()[1:]) if app.full_name else '',
-            'middle_initial': '',
-            'extension_name': '',
-            'full_name': app.full_name,
-            'email': app.email,
-            'contact_number': app.contact_number,
-            'address': app.address,
-            'gender_display': '',
-            'date_of_birth': None,
-            'age': '',
-            'course': app.course,
-            'year_level_display': app.get_year_level_display(),
-            'semester_display': app.get_semester_display(),
-            'preferred_office': app.preferred_office.name if app.preferred_office else '',
-            'available_days': ' '.join(sorted(app.availability_schedule.keys())) if app.availability_schedule else '',
-            'interview_date': app.interview_date,
-            'assigned_office': app.assigned_office,
-            'start_date': app.start_date,
-            'submitted_at': app.submitted_at,
-            'status': app.status,
-            'status_display': app.get_status_display(),
-            'review_url_name': 'home:staff_review_application',
-            'status_url_name': 'home:staff_update_application_status',
-            'is_renewal': True,
-        })
-
-    # Sort all by submitted_at descending
-    all_students.sort(key=lambda x: x['submitted_at'], reverse=True)
-
     # Applications needing attention (pending + under_review), newest first
     pending_applications = new_apps.filter(
         status__in=['pending', 'under_review']
@@ -1334,21 +1351,15 @@ def staff_dashboard(request):
     all_applications = new_apps.order_by('-submitted_at')
 
     # Recent activity: last 10 approved/rejected with timestamps (both types)
-    recent_new = list(new_apps.filter(status__in=['approved', 'rejected']).order_by('-submitted_at')[:10])
-    recent_renewal = list(renewal_apps.filter(status__in=['approved', 'rejected']).order_by('-submitted_at')[:10])
-
-    # Normalize renewal apps to have first_name/last_name for template
-    for r in recent_renewal:
-        r.first_name = r.full_name.split()[0] if r.full_name else ''
-        r.last_name = ' '.join(r.full_name.split()[1:]) if r.full_name else ''
-        r.app_type = 'Renewal'
-
-    for n in recent_new:
-        n.app_type = 'New'
-
-    recent_combined = recent_new + recent_renewal
-    recent_combined.sort(key=lambda x: x.submitted_at, reverse=True)
-    recent_activity = recent_combined[:10]
+    recent_activity = []
+    for entry in _applications_with_details().filter(status__in=['approved', 'rejected'])[:10]:
+        app = entry.detail
+        # Normalize renewal apps to have first_name/last_name for template
+        if entry.is_renewal:
+            app.first_name = app.full_name.split()[0] if app.full_name else ''
+            app.last_name = ' '.join(app.full_name.split()[1:]) if app.full_name else ''
+        app.app_type = entry.get_kind_display()
+        recent_activity.append(app)
 
     from django.db.models import Q as _Q
     context = {
@@ -1405,6 +1416,7 @@ def staff_review_application(request, pk):
         ('grades_last_sem', 'Grades Last Semester'),
         ('official_time', 'Official Time'),
     ]
+    validations = _stored_document_validations(app, [f for f, _ in doc_fields])
     documents = []
     for field_name, label in doc_fields:
         # Official Time = availability schedule, not a file upload
@@ -1432,7 +1444,7 @@ def staff_review_application(request, pk):
             'returned_reason': (app.returned_documents or {}).get(field_name, ''),
         }
         if file_field:
-            doc_entry['validation'] = _validate_uploaded_file(file_field, field_name)
+            doc_entry['validation'] = validations.get(field_name)
         documents.append(doc_entry)
 
     total_docs = len(documents)
@@ -1728,7 +1740,6 @@ def director_dashboard(request):
     auto_expire_student_assistants()
 
     all_apps = NewApplication.objects.all()
-    renewal_apps = RenewalApplication.objects.all()
 
     # Applications awaiting interview (interview_scheduled)
     interview_apps = all_apps.filter(
@@ -1764,7 +1775,33 @@ def director_dashboard(request):
     all_students = []
     today = _date.today()
 
-    for app in all_apps.order_by('-submitted_at'):
+    for entry in _applications_with_details():
+        app = entry.detail
+        if entry.is_renewal:
+            all_students.append({
+                'pk': app.pk,
+                'app_type': 'Renewal',
+                'app_type_class': 'renewal',
+                'student_id': app.student_id,
+                'full_name': app.full_name,
+                'first_name': app.full_name.split()[0] if app.full_name else '',
+                'last_name': ' '.join(app.full_name.split()[1:]) if app.full_name else '',
+                'email': app.email,
+                'contact_number': app.contact_number,
+                'course': app.course,
+                'year_level_display': app.get_year_level_display(),
+                'semester_display': app.get_semester_display(),
+                'preferred_office': app.preferred_office.name if app.preferred_office else '',
+                'available_days': ' '.join(sorted(app.availability_schedule.keys())) if app.availability_schedule else '',
+                'interview_date': app.interview_date,
+                'assigned_office': app.assigned_office,
+                'submitted_at': app.submitted_at,
+                'status': app.status,
+                'status_display': app.get_status_display(),
+                'is_renewal': True,
+            })
+            continue
+
         dob = app.date_of_birth
         age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day)) if dob else None
         all_students.append({
@@ -1790,32 +1827,6 @@ def director_dashboard(request):
             'is_renewal': False,
         })
 
-    for app in renewal_apps.order_by('-submitted_at'):
-        all_students.append({
-            'pk': app.pk,
-            'app_type': 'Renewal',
-            'app_type_class': 'renewal',
-            'student_id': app.student_id,
-            'full_name': app.full_name,
-            'first_name': app.full_name.split()[0] if app.full_name else '',
-            'last_name': ' '.join(app.full_name.split()[1:]) if app.full_name else '',
-            'email': app.email,
-            'contact_number': app.contact_number,
-            'course': app.course,
-            'year_level_display': app.get_year_level_display(),
-            'semester_display': app.get_semester_display(),
-            'preferred_office': app.preferred_office.name if app.preferred_office else '',
-            'available_days': ' '.join(sorted(app.availability_schedule.keys())) if app.availability_schedule else '',
-            'interview_date': app.interview_date,
-            'assigned_office': app.assigned_office,
-            'submitted_at': app.submitted_at,
-            'status': app.status,
-            'status_display': app.get_status_display(),
-            'is_renewal': True,
-        })
-
-    all_students.sort(key=lambda x: x['submitted_at'], reverse=True)
-
     context = {
         'director_name': request.user.get_full_name() or 'Director',
         'interview_apps': interview_apps,
@@ -1848,6 +1859,7 @@ def director_review_application(request, pk):
         ('grades_last_sem', 'Grades Last Semester'),
         ('official_time', 'Official Time'),
     ]
+    validations = _stored_document_validations(app, [f for f, _ in doc_fields])
     documents = []
     for field_name, label in doc_fields:
         if field_name == 'official_time':
@@ -1874,7 +1886,7 @@ def director_review_application(request, pk):
             'returned_reason': (app.returned_documents or {}).get(field_name, ''),
         }
         if file_field:
-            doc_entry['validation'] = _validate_uploaded_file(file_field, field_name)
+            doc_entry['validation'] = validations.get(field_name)
         documents.append(doc_entry)
 
     total_docs = len(documents)
@@ -2131,6 +2143,15 @@ def director_move_office(request, pk):
     return JsonResponse({'success': True, 'name': office.name, 'lat': lat, 'lng': lng})
 
 
+@login_required
+def staff_concurrency_stats(request):
+    """Concurrency limiter state (slots in use, queue depth, rejections) as JSON."""
+    from .limiter import stats
+    if not (request.user.is_staff or request.user.is_superuser):
+        return JsonResponse({'error': 'forbidden'}, status=403)
+    return JsonResponse({'limits': stats()})
+
+
 @login_required
 def staff_get_office_json(request, pk):
     """Return a single office as JSON (for populating edit forms)."""
@@ -2237,7 +2258,7 @@ def staff_sa_detail(request, pk):
     # Update cached total_hours
     if sa.total_hours != total_hours:
         sa.total_hours = total_hours
-        sa.save(update_fields=['total_hours'])
+        sa.save(update_fields=['total_hours', 'updated_at'])
 
     attendance_form = AttendanceForm(initial={'date': _date.today()})
     evaluation_form = PerformanceEvaluationForm()
@@ -2355,7 +2376,7 @@ def staff_log_attendance(request, pk):
         # Update cached total_hours
         from decimal import Decimal
         sa.total_hours += Decimal(str(record.hours_worked))
-        sa.save(update_fields=['total_hours'])
+        sa.save(update_fields=['total_hours', 'updated_at'])
 
         messages.success(request, f'Attendance logged for {sa.full_name}.')
     else:
@@ -2380,7 +2401,7 @@ def staff_delete_attendance(request, sa_pk, att_pk):
     # Subtract hours before deleting
     from decimal import Decimal
     sa.total_hours = max(Decimal('0'), sa.total_hours - Decimal(str(record.hours_worked)))
-    sa.save(update_fields=['total_hours'])
+    sa.save(update_fields=['total_hours', 'updated_at'])
 
     record.delete()
     messages.success(request, 'Attendance record deleted.')
@@ -2484,7 +2505,7 @@ def director_sa_detail(request, pk):
         total_hours += Decimal(str(rec.hours_worked))
     if sa.total_hours != total_hours:
         sa.total_hours = total_hours
-        sa.save(update_fields=['total_hours'])
+        sa.save(update_fields=['total_hours', 'updated_at'])
 
     attendance_form = AttendanceForm(initial={'date': _date.today()})
     evaluation_form = PerformanceEvaluationForm()
@@ -2566,7 +2587,7 @@ def director_log_attendance(request, pk):
 
         from decimal import Decimal
         sa.total_hours += Decimal(str(record.hours_worked))
-        sa.save(update_fields=['total_hours'])
+        sa.save(update_fields=['total_hours', 'updated_at'])
 
         messages.success(request, f'Attendance logged for {sa.full_name}.')
     else:
@@ -2750,6 +2771,8 @@ def resubmit_documents(request, app_type, pk):
             app.requested_documents_note = ''
             app.returned_documents = {}
             app.save()
+            log_normalized_uploads(app, getattr(form, 'normalized_uploads', {}))
+            _queue_document_validation(app, list(request.FILES))
 
             ApplicationNote.objects.create(
                 **{('new_application' if app_type == 'new' else 'renewal_application'): app},
@@ -2914,9 +2937,9 @@ def student_login(request):
                     return redirect('home:student_dashboard')
             except StudentProfile.DoesNotExist:
                 # Auto-create account if the student has an existing application
-                app = NewApplication.objects.filter(student_id=sid).order_by('-submitted_at').first()
-                if not app:
-                    app = RenewalApplication.objects.filter(student_id=sid).order_by('-submitted_at').first()
+                # (a new application takes precedence over a renewal)
+                entry = _applications_with_details().filter(student_id=sid).order_by('kind', '-submitted_at').first()
+                app = entry.detail if entry else None
 
                 if app:
                     if isinstance(app, NewApplication):
@@ -2970,41 +2993,16 @@ def student_dashboard(request):
     today = _date.today()
 
     # ── Applications ──
-    new_apps = list(NewApplication.objects.filter(student_id=student_id).order_by('-submitted_at'))
-    renewal_apps = list(RenewalApplication.objects.filter(student_id=student_id).order_by('-submitted_at'))
-
     applications = []
 
-    for app in new_apps:
-        documents = _build_documents_from_app(app)
-        steps = _build_steps_from_status(app.status)
-        display_status, status_message = STATUS_DISPLAY_MAP.get(
-            app.status, ('Under Review', "Your documents are currently being verified.")
-        )
-        total_steps = len(steps)
-        done_steps = sum(1 for s in steps if s['status'] == 'done')
-        progress_pct = int((done_steps / total_steps) * 100) if total_steps else 0
-        total_docs = len(documents)
-        completed_docs = sum(1 for d in documents if d['status'] in ('uploaded', 'done'))
-        pending_docs = sum(1 for d in documents if d['status'] in ('pending', 'missing'))
-
-        applications.append({
-            'obj': app, 'app_type': 'New Application', 'app_type_key': 'new',
-            'student_name': f"{app.first_name} {app.last_name}",
-            'application_id': app.student_id, 'documents': documents, 'steps': steps,
-            'application_status': display_status, 'status_message': status_message,
-            'raw_status': app.status, 'progress_percent': progress_pct,
-            'total_steps': total_steps, 'completed_steps': done_steps,
-            'total_docs': total_docs, 'completed_docs': completed_docs, 'pending_docs': pending_docs,
-            'submitted_at': app.submitted_at,
-            'schedule_mismatch_note': app.schedule_mismatch_note if app.status == 'schedule_mismatch' else '',
-            'requested_documents_note': app.requested_documents_note if app.status == 'documents_requested' else '',
-            'returned_documents': app.returned_documents if app.status == 'documents_requested' else {},
-            'availability_schedule': app.availability_schedule or {},
-        })
-
-    for app in renewal_apps:
-        documents = _build_documents_from_renewal(app)
+    for entry in _applications_with_details().filter(student_id=student_id):
+        app = entry.detail
+        if entry.is_renewal:
+            documents = _build_documents_from_renewal(app)
+            app_type = 'Renewal Application'
+        else:
+            documents = _build_documents_from_app(app)
+            app_type = 'New Application'
         steps = _build_steps_from_status(app.status)
         display_status, status_message = STATUS_DISPLAY_MAP.get(
             app.status, ('Under Review', "Your documents are currently being verified.")
@@ -3017,8 +3015,8 @@ def student_dashboard(request):
         pending_docs = sum(1 for d in documents if d['status'] in ('pending', 'missing'))
 
         applications.append({
-            'obj': app, 'app_type': 'Renewal Application', 'app_type_key': 'renewal',
-            'student_name': app.full_name,
+            'obj': app, 'app_type': app_type, 'app_type_key': entry.kind,
+            'student_name': entry.full_name,
             'application_id': app.student_id, 'documents': documents, 'steps': steps,
             'application_status': display_status, 'status_message': status_message,
             'raw_status': app.status, 'progress_percent': progress_pct,
@@ -3031,8 +3029,6 @@ def student_dashboard(request):
             'availability_schedule': app.availability_schedule or {},
         })
 
-    applications.sort(key=lambda x: x['submitted_at'], reverse=True)
-
     # ── Active SA records ──
     from django.db.models import Q
     active_sa_records = ActiveStudentAssistant.objects.filter(
@@ -3081,13 +3077,13 @@ def student_dashboard(request):
             # Auto clock-out: if clocked in but not out, and we're past slot_end + 2 min
             if rec and rec.time_in and not rec.time_out and auto_out and now_time > auto_out:
                 rec.time_out = slot_end
-                rec.save(update_fields=['time_out'])
+                rec.save(update_fields=['time_out', 'updated_at'])
                 # recalculate total hours
                 total = Decimal('0')
                 for r in sa.attendance_records.all():
                     total += Decimal(str(r.hours_worked))
                 sa.total_hours = total
-                sa.save(update_fields=['total_hours'])
+                sa.save(update_fields=['total_hours', 'updated_at'])
 
             can_clock_in = (
                 slot_start and earliest_in and not rec
@@ -3225,28 +3221,17 @@ def student_dashboard(request):
         })
 
     # ── Approved Student Assistants (public list) ──
-    approved_new = NewApplication.objects.filter(status='approved').order_by('-submitted_at')
-    approved_renewal = RenewalApplication.objects.filter(status='approved').order_by('-submitted_at')
-    approved_students = []
-    for app in approved_new:
-        approved_students.append({
-            'name': f"{app.first_name} {app.last_name}",
-            'student_id': app.student_id,
-            'course': app.course,
-            'office': app.assigned_office or '—',
-            'start_date': app.start_date,
-            'submitted_at': app.submitted_at,
-        })
-    for app in approved_renewal:
-        approved_students.append({
+    approved_students = [
+        {
             'name': app.full_name,
             'student_id': app.student_id,
             'course': app.course,
             'office': app.assigned_office or '—',
             'start_date': app.start_date,
             'submitted_at': app.submitted_at,
-        })
-    approved_students.sort(key=lambda x: x['submitted_at'], reverse=True)
+        }
+        for app in Application.objects.filter(status='approved')
+    ]
 
     # ── Reminders & Announcements (same logic as home view) ──
     from django.db.models import Q
@@ -3605,7 +3590,7 @@ def student_save_duty_schedule(request, pk):
             return redirect('home:student_dashboard')
 
     sa.duty_schedule = schedule
-    sa.save(update_fields=['duty_schedule'])
+    sa.save(update_fields=['duty_schedule', 'updated_at'])
     messages.success(request, 'Duty schedule saved successfully!')
     return redirect('home:student_dashboard')
 
@@ -3696,14 +3681,14 @@ def student_clock_out(request, pk):
         return redirect('home:student_dashboard')
 
     record.time_out = now
-    record.save(update_fields=['time_out'])
+    record.save(update_fields=['time_out', 'updated_at'])
 
     # Update the SA's cached total_hours
     total = Decimal('0')
     for rec in sa.attendance_records.all():
         total += Decimal(str(rec.hours_worked))
     sa.total_hours = total
-    sa.save(update_fields=['total_hours'])
+    sa.save(update_fields=['total_hours', 'updated_at'])
 
     messages.success(request, f'Clocked out at {now.strftime("%I:%M %p")}. Hours: {record.hours_worked}')
     return redirect('home:student_dashboard')
@@ -3754,21 +3739,80 @@ def staff_delete_no_duty_day(request, pk):
 #  CSV EXPORT VIEWS
 # ================================================================
 
+# Rows fetched per round trip while streaming; server-side cursor on PostgreSQL
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into one chunk of the response body
+EXPORT_ROWS_PER_WRITE = 500
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
 def _make_csv_response(filename, header, rows):
-    """Helper to build an HttpResponse with CSV content."""
-    from django.http import HttpResponse
-    response = HttpResponse(content_type='text/csv')
+    """Stream *rows* (any iterable) as a CSV download without building it in memory."""
+    from django.http import StreamingHttpResponse
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        batch = []
+        for row in rows:
+            batch.append(writer.writerow(row))
+            if len(batch) >= EXPORT_ROWS_PER_WRITE:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    writer = csv.writer(response)
-    writer.writerow(header)
-    for row in rows:
-        writer.writerow(row)
     return response
 
 
+def _export_filters(request):
+    """Parse the optional export filters from the query string.
+
+    ``from`` / ``to`` (YYYY-MM-DD, inclusive), ``office`` (Office pk),
+    ``status`` and ``semester``. Malformed values are ignored.
+    """
+    def _parse_date(value):
+        try:
+            return _datetime.strptime(value, '%Y-%m-%d').date() if value else None
+        except ValueError:
+            return None
+
+    office = request.GET.get('office', '')
+    return {
+        'date_from': _parse_date(request.GET.get('from', '')),
+        'date_to': _parse_date(request.GET.get('to', '')),
+        'office': int(office) if office.isdigit() else None,
+        'status': request.GET.get('status', ''),
+        'semester': request.GET.get('semester', ''),
+    }
+
+
+def _apply_export_filters(qs, filters, date_field, office_field, status_field, semester_field):
+    """Filter *qs* by the parsed export filters, using the given lookups for each."""
+    if filters['date_from']:
+        qs = qs.filter(**{f'{date_field}__gte': filters['date_from']})
+    if filters['date_to']:
+        qs = qs.filter(**{f'{date_field}__lte': filters['date_to']})
+    if filters['office']:
+        qs = qs.filter(**{office_field: filters['office']})
+    if filters['status']:
+        qs = qs.filter(**{status_field: filters['status']})
+    if filters['semester']:
+        qs = qs.filter(**{semester_field: filters['semester']})
+    return qs
+
+
 @login_required
 def staff_export_applications_csv(request):
-    """Export all applications as CSV (staff)."""
+    """Export all applications as CSV (staff). Accepts the ``_export_filters`` query parameters."""
     if not (request.user.is_staff or request.user.is_superuser):
         return redirect('home:home')
     header = [
@@ -3776,27 +3820,48 @@ def staff_export_applications_csv(request):
         'Course', 'Year Level', 'Semester', 'GPA', 'Preferred Office', 'Status',
         'Submitted At',
     ]
-    rows = []
-    for app in NewApplication.objects.select_related('preferred_office').order_by('-submitted_at'):
-        rows.append([
-            'New', app.student_id, app.first_name, app.last_name,
-            app.email, app.contact_number, app.course, app.year_level,
-            app.semester, app.gpa or '', app.preferred_office or '',
-            app.get_status_display(), app.submitted_at.strftime('%Y-%m-%d %H:%M'),
-        ])
-    for app in RenewalApplication.objects.select_related('preferred_office').order_by('-submitted_at'):
-        rows.append([
-            'Renewal', app.student_id, app.first_name, app.last_name,
-            app.email, app.contact_number, app.course, app.year_level,
-            app.semester, app.gpa or '', app.preferred_office or '',
-            app.get_status_display(), app.submitted_at.strftime('%Y-%m-%d %H:%M'),
-        ])
-    return _make_csv_response('applications_export.csv', header, rows)
+    filters = _export_filters(request)
+    status_labels = dict(NewApplication.STATUS_CHOICES)
+
+    def _filtered(model):
+        return _apply_export_filters(
+            model.objects.order_by('-submitted_at'), filters,
+            'submitted_at__date', 'preferred_office_id', 'status', 'semester',
+        )
+
+    def rows():
+        new_apps = _filtered(NewApplication).values_list(
+            'student_id', 'first_name', 'last_name', 'email', 'contact_number', 'course',
+            'year_level', 'semester', 'gpa', 'preferred_office__name', 'status', 'submitted_at',
+        )
+        for row in new_apps.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            (student_id, first_name, last_name, email, contact, course,
+             year_level, semester, gpa, office, status, submitted_at) = row
+            yield [
+                'New', student_id, first_name, last_name, email, contact, course,
+                year_level, semester, gpa or '', office or '',
+                status_labels.get(status, status), submitted_at.strftime('%Y-%m-%d %H:%M'),
+            ]
+        # Renewals only record a full name; it goes in the First Name column
+        renewals = _filtered(RenewalApplication).values_list(
+            'student_id', 'full_name', 'email', 'contact_number', 'course',
+            'year_level', 'semester', 'gpa', 'preferred_office__name', 'status', 'submitted_at',
+        )
+        for row in renewals.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            (student_id, full_name, email, contact, course,
+             year_level, semester, gpa, office, status, submitted_at) = row
+            yield [
+                'Renewal', student_id, full_name, '', email, contact, course,
+                year_level, semester, gpa or '', office or '',
+                status_labels.get(status, status), submitted_at.strftime('%Y-%m-%d %H:%M'),
+            ]
+
+    return _make_csv_response('applications_export.csv', header, rows())
 
 
 @login_required
 def staff_export_active_sa_csv(request):
-    """Export active student assistants as CSV (staff)."""
+    """Export active student assistants as CSV (staff). Dates filter on the start date."""
     if not (request.user.is_staff or request.user.is_superuser):
         return redirect('home:home')
     header = [
@@ -3804,34 +3869,63 @@ def staff_export_active_sa_csv(request):
         'Semester', 'Academic Year', 'Start Date', 'End Date',
         'Total Hours', 'Required Hours', 'Status',
     ]
-    rows = []
-    for sa in ActiveStudentAssistant.objects.select_related('assigned_office').order_by('-created_at'):
-        rows.append([
-            sa.student_id, sa.full_name, sa.email, sa.course,
-            sa.assigned_office or '', sa.semester, sa.academic_year,
-            sa.start_date or '', sa.end_date or '',
-            sa.total_hours, sa.required_hours, sa.get_status_display(),
-        ])
-    return _make_csv_response('active_sa_export.csv', header, rows)
+    status_labels = dict(ActiveStudentAssistant.STATUS_CHOICES)
+    qs = _apply_export_filters(
+        ActiveStudentAssistant.objects.order_by('-created_at'), _export_filters(request),
+        'start_date', 'assigned_office_id', 'status', 'semester',
+    ).values_list(
+        'student_id', 'full_name', 'email', 'course', 'assigned_office__name',
+        'semester', 'academic_year', 'start_date', 'end_date',
+        'total_hours', 'required_hours', 'status',
+    )
 
+    def rows():
+        for row in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            (student_id, full_name, email, course, office, semester, academic_year,
+             start_date, end_date, total_hours, required_hours, status) = row
+            yield [
+                student_id, full_name, email, course, office or '', semester, academic_year,
+                start_date or '', end_date or '', total_hours, required_hours,
+                status_labels.get(status, status),
+            ]
 
-@login_required
-def staff_export_attendance_csv(request):
-    """Export attendance records as CSV (staff)."""
-    if not (request.user.is_staff or request.user.is_superuser):
-        return redirect('home:home')
+    return _make_csv_response('active_sa_export.csv', header, rows())
+
+
+def _attendance_export(filters):
+    """``(header, rows)`` for the attendance CSV; also used by scheduled report delivery."""
     header = [
         'Student ID', 'Full Name', 'Office', 'Date', 'Shift',
         'Time In', 'Time Out', 'Hours Worked', 'Status', 'Remarks',
     ]
-    rows = []
-    for att in AttendanceRecord.objects.select_related('student_assistant', 'student_assistant__assigned_office').order_by('-date', '-time_in'):
-        sa = att.student_assistant
-        rows.append([
-            sa.student_id, sa.full_name, sa.assigned_office or '',
-            att.date, att.shift, att.time_in or '', att.time_out or '',
-            att.hours_worked, att.get_status_display(), att.remarks,
-        ])
+    status_labels = dict(AttendanceRecord.STATUS_CHOICES)
+    qs = _apply_export_filters(
+        AttendanceRecord.objects.order_by('-date', '-time_in'), filters,
+        'date', 'student_assistant__assigned_office_id', 'status', 'student_assistant__semester',
+    ).values_list(
+        'student_assistant__student_id', 'student_assistant__full_name',
+        'student_assistant__assigned_office__name',
+        'date', 'shift', 'time_in', 'time_out', 'status', 'remarks',
+    )
+
+    def rows():
+        for (student_id, full_name, office, day, shift,
+             time_in, time_out, status, remarks) in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                student_id, full_name, office or '', day, shift, time_in or '', time_out or '',
+                compute_hours_worked(day, time_in, time_out),
+                status_labels.get(status, status), remarks,
+            ]
+
+    return header, rows()
+
+
+@login_required
+def staff_export_attendance_csv(request):
+    """Export attendance records as CSV (staff). Semester and office are the SA's."""
+    if not (request.user.is_staff or request.user.is_superuser):
+        return redirect('home:home')
+    header, rows = _attendance_export(_export_filters(request))
     return _make_csv_response('attendance_export.csv', header, rows)
 
 
@@ -3844,18 +3938,63 @@ def director_export_evaluations_csv(request):
         'Work Quality', 'Punctuality', 'Initiative', 'Cooperation',
         'Communication', 'Overall Rating', 'Recommendation', 'Remarks', 'Evaluated By', 'Date',
     ]
-    rows = []
-    for ev in PerformanceEvaluation.objects.select_related('student_assistant', 'student_assistant__assigned_office', 'evaluated_by').order_by('-evaluated_at'):
-        sa = ev.student_assistant
-        rows.append([
-            sa.student_id, sa.full_name, sa.assigned_office or '',
-            ev.get_evaluation_period_display(),
-            ev.work_quality, ev.punctuality, ev.initiative,
-            ev.cooperation, ev.communication, ev.overall_rating,
-            ev.get_recommendation_status_display() if ev.recommendation_status else '',
-            ev.remarks, ev.evaluated_by or '', ev.evaluated_at.strftime('%Y-%m-%d %H:%M'),
-        ])
-    return _make_csv_response('evaluations_export.csv', header, rows)
+    period_labels = dict(PerformanceEvaluation.PERIOD_CHOICES)
+    recommendation_labels = dict(PerformanceEvaluation.RECOMMENDATION_CHOICES)
+    # ``status`` filters on the rehire recommendation
+    qs = _apply_export_filters(
+        PerformanceEvaluation.objects.order_by('-evaluated_at'), _export_filters(request),
+        'evaluated_at__date', 'student_assistant__assigned_office_id',
+        'recommendation_status', 'student_assistant__semester',
+    ).values_list(
+        'student_assistant__student_id', 'student_assistant__full_name',
+        'student_assistant__assigned_office__name', 'evaluation_period',
+        'work_quality', 'punctuality', 'initiative', 'cooperation', 'communication',
+        'overall_rating', 'recommendation_status', 'remarks', 'evaluated_by__username',
+        'evaluated_at',
+    )
+
+    def rows():
+        for row in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            (student_id, full_name, office, period, work_quality, punctuality, initiative,
+             cooperation, communication, overall, recommendation, remarks, evaluated_by,
+             evaluated_at) = row
+            yield [
+                student_id, full_name, office or '', period_labels.get(period, period),
+                work_quality, punctuality, initiative, cooperation, communication, overall,
+                recommendation_labels.get(recommendation, recommendation) if recommendation else '',
+                remarks, evaluated_by or '', evaluated_at.strftime('%Y-%m-%d %H:%M'),
+            ]
+
+    return _make_csv_response('evaluations_export.csv', header, rows())
+
+
+def export_api_delta(request, feed):
+    """Delta export API: rows changed and deleted since ``?cursor=`` for one feed.
+
+    Authenticated with ``Authorization: Bearer <EXPORT_API_TOKEN>``; see
+    ``home.delta_export`` for the cursor semantics. ``?limit=`` caps the
+    page size.
+    """
+    import hmac
+    from .delta_export import DEFAULT_LIMIT, FEEDS, fetch_delta
+
+    token = getattr(settings, 'EXPORT_API_TOKEN', '')
+    if not token:
+        raise Http404
+    auth = request.headers.get('Authorization', '')
+    if not (auth.startswith('Bearer ') and hmac.compare_digest(auth[7:].encode(), token.encode())):
+        response = JsonResponse({'error': 'unauthorized'}, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    if feed not in FEEDS:
+        return JsonResponse({'error': f'unknown feed "{feed}"', 'feeds': sorted(FEEDS)}, status=404)
+
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+        page = fetch_delta(feed, request.GET.get('cursor', ''), limit)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'feed': feed, **page})
 
 
 # ================================================================
@@ -3868,199 +4007,16 @@ def director_department_reports(request):
     if not request.user.is_superuser:
         return redirect('home:home')
 
-    from django.db.models import Avg, Count, FloatField, Q, Sum, F
-    from django.db.models.functions import Coalesce
-
-    offices = Office.objects.filter(is_active=True).order_by('name')
-    report = []
-
-    for office in offices:
-        sas = ActiveStudentAssistant.objects.filter(assigned_office=office)
-        sa_count = sas.count()
-        active_count = sas.filter(status='active').count()
-
-        att_qs = AttendanceRecord.objects.filter(student_assistant__assigned_office=office)
-        att_total = att_qs.count()
-        att_present = att_qs.filter(status='present').count()
-        att_late = att_qs.filter(status='late').count()
-        att_absent = att_qs.filter(status='absent').count()
-        att_excused = att_qs.filter(status='excused').count()
-        attended = att_present + att_late + att_excused
-        attendance_rate = round(attended / att_total * 100, 1) if att_total else 0
-
-
-        hours_agg = sas.aggregate(
-            avg_hours=Coalesce(Avg('total_hours'), 0.0, output_field=FloatField()),
-            total_hours=Coalesce(Sum('total_hours'), 0.0, output_field=FloatField()),
-            avg_required=Coalesce(Avg('required_hours'), 0.0, output_field=FloatField()),
-        )
-        avg_hours = round(float(hours_agg['avg_hours']), 1)
-        total_hours = round(float(hours_agg['total_hours']), 1)
-        avg_required = round(float(hours_agg['avg_required']), 1)
-        avg_completion = round(avg_hours / avg_required * 100, 1) if avg_required else 0
-
-
-        eval_qs = PerformanceEvaluation.objects.filter(student_assistant__assigned_office=office)
-        eval_agg = eval_qs.aggregate(
-            count=Count('id'),
-            avg_quality=Avg('work_quality'),
-            avg_punctuality=Avg('punctuality'),
-            avg_initiative=Avg('initiative'),
-            avg_cooperation=Avg('cooperation'),
-            avg_communication=Avg('communication'),
-            avg_overall=Avg('overall_rating'),
-        )
-        eval_count = eval_agg['count'] or 0
-
-        def _r(v):
-            return round(float(v), 2) if v else 0
-
-        report.append({
-            'office': office,
-            'sa_count': sa_count,
-            'active_count': active_count,
-
-            'att_total': att_total,
-            'att_present': att_present,
-            'att_late': att_late,
-            'att_absent': att_absent,
-            'att_excused': att_excused,
-            'attendance_rate': attendance_rate,
-            # productivity
-            'avg_hours': avg_hours,
-            'total_hours': total_hours,
-            'avg_required': avg_required,
-            'avg_completion': avg_completion,
-            # evaluations
-            'eval_count': eval_count,
-            'avg_quality': _r(eval_agg['avg_quality']),
-            'avg_punctuality': _r(eval_agg['avg_punctuality']),
-            'avg_initiative': _r(eval_agg['avg_initiative']),
-            'avg_cooperation': _r(eval_agg['avg_cooperation']),
-            'avg_communication': _r(eval_agg['avg_communication']),
-            'avg_overall': _r(eval_agg['avg_overall']),
-        })
-
-
-    all_att = AttendanceRecord.objects.all()
-    g_att_total = all_att.count()
-    g_attended = all_att.filter(status__in=['present', 'late', 'excused']).count()
-    g_attendance_rate = round(g_attended / g_att_total * 100, 1) if g_att_total else 0
-
-    all_sas = ActiveStudentAssistant.objects.all()
-    g_hours = all_sas.aggregate(
-        avg_hours=Coalesce(Avg('total_hours'), 0.0, output_field=FloatField()),
-        total_hours=Coalesce(Sum('total_hours'), 0.0, output_field=FloatField()),
-    )
-
-    all_evals = PerformanceEvaluation.objects.all()
-    g_eval = all_evals.aggregate(avg_overall=Avg('overall_rating'), count=Count('id'))
-
+    from .reports import build_department_report
+    report, global_stats = build_department_report()
     context = {
         'report': report,
-        'offices': offices,
-        'global_stats': {
-            'total_sas': all_sas.count(),
-            'active_sas': all_sas.filter(status='active').count(),
-            'attendance_rate': g_attendance_rate,
-            'avg_hours': round(float(g_hours['avg_hours']), 1),
-            'total_hours': round(float(g_hours['total_hours']), 1),
-            'avg_overall': round(float(g_eval['avg_overall']), 2) if g_eval['avg_overall'] else 0,
-            'eval_count': g_eval['count'] or 0,
-        },
+        'global_stats': global_stats,
         'director_name': request.user.get_full_name() or 'Director',
     }
     return render(request, 'director/department_reports.html', context)
 
 
-def _build_department_report_data():
-    from django.db.models import Avg, Count, FloatField, Sum
-    from django.db.models.functions import Coalesce
-
-    offices = Office.objects.filter(is_active=True).order_by('name')
-    report = []
-
-    for office in offices:
-        sas = ActiveStudentAssistant.objects.filter(assigned_office=office)
-        sa_count = sas.count()
-        active_count = sas.filter(status='active').count()
-
-        att_qs = AttendanceRecord.objects.filter(student_assistant__assigned_office=office)
-        att_total = att_qs.count()
-        att_present = att_qs.filter(status='present').count()
-        att_late = att_qs.filter(status='late').count()
-        att_absent = att_qs.filter(status='absent').count()
-        att_excused = att_qs.filter(status='excused').count()
-        attended = att_present + att_late + att_excused
-        attendance_rate = round(attended / att_total * 100, 1) if att_total else 0
-
-        hours_agg = sas.aggregate(
-            avg_hours=Coalesce(Avg('total_hours'), 0.0, output_field=FloatField()),
-            total_hours=Coalesce(Sum('total_hours'), 0.0, output_field=FloatField()),
-            avg_required=Coalesce(Avg('required_hours'), 0.0, output_field=FloatField()),
-        )
-        avg_hours = round(float(hours_agg['avg_hours']), 1)
-        total_hours = round(float(hours_agg['total_hours']), 1)
-        avg_required = round(float(hours_agg['avg_required']), 1)
-        avg_completion = round(avg_hours / avg_required * 100, 1) if avg_required else 0
-
-        eval_qs = PerformanceEvaluation.objects.filter(student_assistant__assigned_office=office)
-        eval_agg = eval_qs.aggregate(
-            count=Count('id'),
-            avg_quality=Avg('work_quality'),
-            avg_punctuality=Avg('punctuality'),
-            avg_initiative=Avg('initiative'),
-            avg_cooperation=Avg('cooperation'),
-            avg_communication=Avg('communication'),
-            avg_overall=Avg('overall_rating'),
-        )
-
-        def _r(v):
-            return round(float(v), 2) if v else 0
-
-        report.append({
-            'office_name': office.name,
-            'building': office.building,
-            'head': office.head or '—',
-            'sa_count': sa_count,
-            'active_count': active_count,
-            'att_total': att_total, 'att_present': att_present, 'att_late': att_late,
-            'att_absent': att_absent, 'att_excused': att_excused, 'attendance_rate': attendance_rate,
-            'avg_hours': avg_hours, 'total_hours': total_hours,
-            'avg_required': avg_required, 'avg_completion': avg_completion,
-            'eval_count': eval_agg['count'] or 0,
-            'avg_quality': _r(eval_agg['avg_quality']),
-            'avg_punctuality': _r(eval_agg['avg_punctuality']),
-            'avg_initiative': _r(eval_agg['avg_initiative']),
-            'avg_cooperation': _r(eval_agg['avg_cooperation']),
-            'avg_communication': _r(eval_agg['avg_communication']),
-            'avg_overall': _r(eval_agg['avg_overall']),
-        })
-
-    all_att = AttendanceRecord.objects.all()
-    g_att_total = all_att.count()
-    g_attended = all_att.filter(status__in=['present', 'late', 'excused']).count()
-
-    all_sas = ActiveStudentAssistant.objects.all()
-    g_hours = all_sas.aggregate(
-        avg_hours=Coalesce(Avg('total_hours'), 0.0, output_field=FloatField()),
-        total_hours=Coalesce(Sum('total_hours'), 0.0, output_field=FloatField()),
-    )
-    all_evals = PerformanceEvaluation.objects.all()
-    g_eval = all_evals.aggregate(avg_overall=Avg('overall_rating'), count=Count('id'))
-
-    global_stats = {
-        'total_sas': all_sas.count(),
-        'active_sas': all_sas.filter(status='active').count(),
-        'attendance_rate': round(g_attended / g_att_total * 100, 1) if g_att_total else 0,
-        'avg_hours': round(float(g_hours['avg_hours']), 1),
-        'total_hours': round(float(g_hours['total_hours']), 1),
-        'avg_overall': round(float(g_eval['avg_overall']), 2) if g_eval['avg_overall'] else 0,
-        'eval_count': g_eval['count'] or 0,
-    }
-    return report, global_stats
-
-
 def _render_department_report_pdf(report, global_stats):
     """Generate a department-reports PDF (landscape letter) and return the bytes."""
     from io import BytesIO
@@ -4221,18 +4177,43 @@ def _render_department_report_pdf(report, global_stats):
     return buf.getvalue()
 
 
+def _department_report_filename():
+    return f"Department_Reports_{_date.today().strftime('%Y%m%d')}.pdf"
+
+
 @login_required
 def director_department_reports_pdf(request):
+    """
+    Serve the cached PDF for the current data. Rendering happens once per
+    data version in the background (see home/reports.py); until it's done
+    the request gets a page that reloads every few seconds.
+    """
     if not request.user.is_superuser:
         return redirect('home:home')
 
-    from django.http import HttpResponse
-    report, global_stats = _build_department_report_data()
-    pdf_bytes = _render_department_report_pdf(report, global_stats)
+    from django.http import FileResponse, HttpResponse
+    from .reports import request_snapshot
+    snapshot = request_snapshot()
 
-    response = HttpResponse(pdf_bytes, content_type='application/pdf')
-    date_str = _date.today().strftime('%Y%m%d')
-    response['Content-Disposition'] = f'attachment; filename="Department_Reports_{date_str}.pdf"'
+    if snapshot.status == 'ready':
+        return FileResponse(
+            snapshot.file.open('rb'),
+            as_attachment=True,
+            filename=_department_report_filename(),
+            content_type='application/pdf',
+        )
+    if snapshot.status == 'failed':
+        messages.error(request, 'The report PDF could not be generated. Please try again.')
+        return redirect('home:director_department_reports')
+
+    response = HttpResponse(
+        '<!DOCTYPE html><html><head><meta http-equiv="refresh" content="3"></head>'
+        '<body style="font-family:sans-serif;text-align:center;padding-top:80px;">'
+        '<p>The department report is being generated&hellip; the download will start shortly.</p>'
+        '</body></html>',
+        status=202,
+    )
+    response['Retry-After'] = '3'
     return response
 
 
@@ -4241,38 +4222,71 @@ def director_department_reports_email(request):
     if not request.user.is_superuser:
         return redirect('home:home')
 
-    from django.core.mail import EmailMessage
-
-    report, global_stats = _build_department_report_data()
-    pdf_bytes = _render_department_report_pdf(report, global_stats)
-
-    date_str = _date.today().strftime('%B %d, %Y')
-    filename = f"Department_Reports_{_date.today().strftime('%Y%m%d')}.pdf"
+    from .outbox import flush_in_background, queue_email
+    from .reports import request_snapshot
 
+    snapshot = request_snapshot()
     recipient = request.user.email or settings.EMAIL_HOST_USER
-    email = EmailMessage(
-        subject=f'Department-Level Reports — {date_str}',
-        body=(
-            f'Good day,\n\n'
-            f'Please find attached the Department-Level Reports generated on {date_str}.\n\n'
-            f'Summary:\n'
-            f'  • Total SAs: {global_stats["total_sas"]}\n'
-            f'  • Active SAs: {global_stats["active_sas"]}\n'
-            f'  • Attendance Rate: {global_stats["attendance_rate"]}%\n'
-            f'  • Avg Hours/SA: {global_stats["avg_hours"]}\n'
-            f'  • Avg Performance Rating: {global_stats["avg_overall"]}/5\n'
-            f'  • Total Evaluations: {global_stats["eval_count"]}\n\n'
-            f'This is an automated report from the CHMSU SA Application System.'
-        ),
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[recipient],
+    queue_email(
+        recipient,
+        f"Department-Level Reports — {_date.today().strftime('%B %d, %Y')}",
+        snapshot=snapshot,
+        attachment_name=_department_report_filename(),
     )
-    email.attach(filename, pdf_bytes, 'application/pdf')
-    email.send()
+    flush_in_background(snapshot)
 
-    messages.success(request, f'Report emailed successfully to {recipient}.')
+    messages.success(request, f'The report is being generated and will be emailed to {recipient} shortly.')
     return redirect('home:director_department_reports')
 
+TREND_WEEK_CHOICES = [12, 26, 52, 104]
+
+
+def _trend_params(request):
+    try:
+        weeks = int(request.GET.get('weeks', 52))
+    except ValueError:
+        weeks = 52
+    weeks = min(max(weeks, 1), max(TREND_WEEK_CHOICES))
+    office = request.GET.get('office', '')
+    return weeks, int(office) if office.isdigit() else None
+
+
+@login_required
+def director_department_trends(request):
+    """Week-over-week attendance, hours and evaluation trends, read from OfficeWeeklySnapshot only."""
+    if not request.user.is_superuser:
+        return redirect('home:home')
+
+    from .reports import weekly_trends
+    weeks, office_id = _trend_params(request)
+    trends = weekly_trends(weeks, office_id)
+    overall = trends['overall']
+    max_hours = max((p['hours_worked'] for p in overall), default=0) or 1
+    for point in overall:
+        point['hours_pct'] = round(point['hours_worked'] / max_hours * 100)
+
+    context = {
+        'overall': list(reversed(overall)),
+        'offices': Office.objects.filter(is_active=True).order_by('name'),
+        'current_office': office_id,
+        'weeks': weeks,
+        'week_choices': TREND_WEEK_CHOICES,
+        'director_name': request.user.get_full_name() or 'Director',
+    }
+    return render(request, 'director/department_trends.html', context)
+
+
+@login_required
+def director_department_trends_json(request):
+    """Same data as the trends page, plus a series per office."""
+    if not request.user.is_superuser:
+        return JsonResponse({'error': 'forbidden'}, status=403)
+
+    from .reports import weekly_trends
+    weeks, office_id = _trend_params(request)
+    return JsonResponse({'weeks': weeks, **weekly_trends(weeks, office_id)})
+
+
 def _compute_renewal_recommendation(attendance_rate, total_hours, required_hours, latest_eval):
     att_score = min(attendance_rate, 100)
 
@@ -4319,6 +4333,8 @@ def _compute_renewal_recommendation(attendance_rate, total_hours, required_hours
     }
 
 
+@login_required
+@concurrency_limit('pdf')
 def sa_completion_certificate(request, pk):
     if not (request.user.is_staff or request.user.is_superuser):
         return redirect('home:home')
@@ -4328,127 +4344,12 @@ def sa_completion_certificate(request, pk):
     )
 
     from django.http import HttpResponse
-    from io import BytesIO
+    from .certificates import certificate_data, certificate_filename, render_certificate
 
     try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.pdfgen import canvas as pdf_canvas
-
-        buf = BytesIO()
-        c = pdf_canvas.Canvas(buf, pagesize=letter)
-        width, height = letter
-
-        # Border
-        c.setStrokeColor(colors.HexColor('#166534'))
-        c.setLineWidth(3)
-        c.rect(40, 40, width - 80, height - 80)
-        c.setLineWidth(1)
-        c.rect(45, 45, width - 90, height - 90)
-
-        # Header
-        y = height - 100
-        c.setFont('Helvetica-Bold', 22)
-        c.setFillColor(colors.HexColor('#14532d'))
-        c.drawCentredString(width / 2, y, 'CARLOS HILADO MEMORIAL STATE UNIVERSITY')
-        y -= 22
-        c.setFont('Helvetica', 12)
-        c.setFillColor(colors.HexColor('#166534'))
-        c.drawCentredString(width / 2, y, 'Talisay City, Negros Occidental')
-        y -= 40
-        c.setFont('Helvetica-Bold', 18)
-        c.setFillColor(colors.HexColor('#14532d'))
-        c.drawCentredString(width / 2, y, 'CERTIFICATE OF COMPLETION')
-        y -= 15
-        c.setStrokeColor(colors.HexColor('#22c55e'))
-        c.setLineWidth(2)
-        c.line(width / 2 - 120, y, width / 2 + 120, y)
-        y -= 30
-
-        # Body
-        c.setFont('Helvetica', 12)
-        c.setFillColor(colors.black)
-        c.drawCentredString(width / 2, y, 'This is to certify that')
-        y -= 35
-        c.setFont('Helvetica-Bold', 20)
-        c.setFillColor(colors.HexColor('#14532d'))
-        c.drawCentredString(width / 2, y, sa.full_name.upper())
-        y -= 15
-        c.setStrokeColor(colors.HexColor('#14532d'))
-        c.setLineWidth(0.5)
-        c.line(width / 2 - 150, y, width / 2 + 150, y)
-        y -= 25
-        c.setFont('Helvetica', 11)
-        c.setFillColor(colors.black)
-        c.drawCentredString(width / 2, y, f'Student ID: {sa.student_id}    |    Course: {sa.course}')
-        y -= 30
-        c.setFont('Helvetica', 12)
-
-
-        office_name = sa.assigned_office.name if sa.assigned_office else 'N/A'
-        semester_label = sa.get_semester_display()
-        academic_year = sa.academic_year or 'N/A'
-        start = sa.start_date.strftime('%B %d, %Y') if sa.start_date else 'N/A'
-        end = sa.end_date.strftime('%B %d, %Y') if sa.end_date else 'N/A'
-        total_hours = float(sa.total_hours)
-
-        lines = [
-            f'has successfully completed the Student Assistant Program',
-            f'at {office_name}',
-            f'for {semester_label}, A.Y. {academic_year}',
-            f'from {start} to {end}',
-            f'with a total of {total_hours:.1f} hours rendered.',
-        ]
-        for line in lines:
-            c.drawCentredString(width / 2, y, line)
-            y -= 20
-
-
-        semester_report = _build_semester_report(sa)
-        if semester_report:
-            y -= 15
-            c.setFont('Helvetica', 10)
-            c.setFillColor(colors.HexColor('#374151'))
-            c.drawCentredString(width / 2, y, f'Attendance Rate: {semester_report["attendance_rate"]}%    |    '
-                                f'Present: {semester_report["present"]}    |    Late: {semester_report["late"]}    |    '
-                                f'Absent: {semester_report["absent"]}')
-
-        final_eval = sa.evaluations.filter(evaluation_period='final').first()
-        if final_eval:
-            y -= 25
-            c.setFont('Helvetica', 10)
-            c.setFillColor(colors.HexColor('#374151'))
-            c.drawCentredString(width / 2, y, f'Performance Rating: {final_eval.overall_rating}/5.00')
-            if final_eval.recommendation_status:
-                y -= 16
-                c.drawCentredString(width / 2, y, f'Recommendation: {final_eval.get_recommendation_status_display()}')
-
-        y -= 60
-        c.setStrokeColor(colors.black)
-        c.setLineWidth(0.5)
-        # Left
-        c.line(80, y, 260, y)
-        c.setFont('Helvetica', 10)
-        c.drawCentredString(170, y - 14, 'Student Director')
-        # Right
-        c.line(width - 260, y, width - 80, y)
-        c.drawCentredString(width - 170, y - 14, 'Office Head / Supervisor')
-
-        # Date
-        y -= 45
-        c.setFont('Helvetica', 10)
-        c.setFillColor(colors.HexColor('#6b7280'))
-        today_str = _date.today().strftime('%B %d, %Y')
-        c.drawCentredString(width / 2, y, f'Issued on: {today_str}')
-
-        c.showPage()
-        c.save()
-        buf.seek(0)
-
-        response = HttpResponse(buf.getvalue(), content_type='application/pdf')
-        safe_name = sa.full_name.replace(' ', '_')
-        response['Content-Disposition'] = f'attachment; filename="Completion_Certificate_{safe_name}.pdf"'
+        cert = certificate_data([sa])[0]
+        response = HttpResponse(render_certificate(cert), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{certificate_filename(cert)}"'
         return response
 
     except ImportError:
@@ -4480,24 +4381,213 @@ def sa_completion_certificate(request, pk):
         return HttpResponse(html)
 
 
+@login_required
+@concurrency_limit('pdf')
+def director_bulk_certificates(request):
+    """
+    Completion certificates for every completed SA matching the office /
+    semester / academic year filters — a ZIP with one PDF each or
+    ``?format=pdf`` for one merged PDF. Both are rendered in full while the
+    'pdf' slot is held (the ZIP is spooled to a temp file), so a run can't
+    outlive its slot. Larger runs can use ``manage.py bulk_certificates``,
+    which renders in parallel processes.
+    """
+    if not request.user.is_superuser:
+        return redirect('home:home')
+
+    import tempfile
+    from django.http import FileResponse, HttpResponse
+    from io import BytesIO
+    from .certificates import certificate_data, write_merged_pdf, write_zip
+
+    sas = ActiveStudentAssistant.objects.select_related('assigned_office').filter(status='completed')
+    office = request.GET.get('office', '')
+    semester = request.GET.get('semester', '')
+    academic_year = request.GET.get('academic_year', '').strip()
+    if office:
+        sas = sas.filter(assigned_office__pk=office)
+    if semester:
+        sas = sas.filter(semester=semester)
+    if academic_year:
+        sas = sas.filter(academic_year=academic_year)
+    certs = certificate_data(sas.order_by('assigned_office__name', 'full_name'))
+
+    if not certs:
+        messages.warning(request, 'No completed SAs match those filters.')
+        return redirect('home:director_sa_list')
+
+    stamp = _date.today().strftime('%Y%m%d')
+    if request.GET.get('format') == 'pdf':
+        buf = BytesIO()
+        write_merged_pdf(certs, buf)
+        response = HttpResponse(buf.getvalue(), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="Completion_Certificates_{stamp}.pdf"'
+        return response
+
+    spool = tempfile.TemporaryFile()
+    try:
+        write_zip(certs, spool)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return FileResponse(
+        spool, as_attachment=True, filename=f'Completion_Certificates_{stamp}.zip',
+        content_type='application/zip',
+    )
+
+
 # ================================================================
 #  Database File Serving (production)
 # ================================================================
 
-def serve_db_file(request, file_path):
-    """Serve a file stored in the database (used in production)."""
-    from django.http import HttpResponse, Http404
-    from .models import DBFile
+def _parse_byte_range(range_header, size):
+    """Parse a single ``bytes=`` Range header against a file of *size* bytes.
 
+    Returns ``(start, end)`` (inclusive), ``None`` when the header is absent
+    or should be ignored (multi-range, other units), or ``False`` when the
+    range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith('bytes='):
+        return None
+    spec = range_header[len('bytes='):].strip()
+    if ',' in spec or '-' not in spec:
+        return None
+    first, last = (part.strip() for part in spec.split('-', 1))
     try:
-        db_file = DBFile.objects.get(name=file_path)
-    except DBFile.DoesNotExist:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the final N bytes
+            suffix = int(last)
+            if suffix == 0:
+                return False
+            start = max(0, size - suffix)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return False
+    return start, min(end, size - 1)
+
+
+def serve_db_file(request, file_path):
+    """Serve a file stored in the database (used in production).
+
+    Hits in the node-local media cache are read from disk; misses fill the
+    cache first, or stream the blob out of the database in chunks when
+    the cache is off. ETag / Last-Modified validators allow browsers to
+    revalidate with a 304, and single byte ranges are honoured so PDF
+    viewers can fetch pages lazily.
+    """
+    from django.http import HttpResponse, StreamingHttpResponse, Http404
+    from django.utils.cache import get_conditional_response
+    from django.utils.http import http_date, quote_etag
+    from . import media_cache
+    from .storage import cached_db_file_path, db_file_meta, iter_db_file
+
+    meta = db_file_meta(file_path)
+    if meta is None:
         raise Http404("File not found")
 
-    response = HttpResponse(db_file.data, content_type=db_file.content_type)
-    response['Content-Length'] = db_file.size
+    # Content-addressed: the blob digest is a strong validator for the bytes
+    last_modified = int(meta['updated_at'])
+    etag = quote_etag(meta['sha256'])
 
-    # Set caching headers
-    response['Cache-Control'] = 'public, max-age=86400'
+    headers = HttpResponse()
+    headers['ETag'] = etag
+    headers['Last-Modified'] = http_date(last_modified)
+    headers['Cache-Control'] = 'public, max-age=86400'
+    headers['Accept-Ranges'] = 'bytes'
+
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=headers,
+    )
+    if conditional is not headers:
+        return conditional
+
+    size = meta['size']
+    byte_range = _parse_byte_range(request.META.get('HTTP_RANGE', ''), size)
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if byte_range is not None and if_range and if_range not in (etag, http_date(last_modified)):
+        byte_range = None  # validator changed — send the whole file
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
 
-    return response
\ No newline at end of file
+    if byte_range:
+        start, end = byte_range
+        status = 206
+    else:
+        start, end = 0, size - 1
+        status = 200
+
+    if request.method == 'HEAD' or not size:
+        body = iter(())
+    else:
+        cached = None
+        try:
+            path = cached_db_file_path(file_path, meta)
+            if path is not None:
+                try:
+                    cached = open(path, 'rb')
+                except OSError:
+                    pass  # evicted by another worker in the meantime
+            if cached is not None:
+                body = media_cache.iter_file(cached, start, end)
+            else:
+                body = iter_db_file(meta['pk'], start, end)
+        except FileNotFoundError:
+            # Metadata was cached but the file has since been deleted
+            media_cache.invalidate(file_path)
+            raise Http404("File not found")
+    response = StreamingHttpResponse(body, status=status, content_type=meta['content_type'])
+    for header in ('ETag', 'Last-Modified', 'Cache-Control', 'Accept-Ranges'):
+        response[header] = headers[header]
+    response['Content-Length'] = end - start + 1
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+@concurrency_limit('image_derivative')
+def _render_image_derivative(request, name, digest, variant, fmt):
+    """First render of a derivative, inside the shared CPU budget (503 when it's full)."""
+    from .derivatives import get_or_create_derivative
+
+    return get_or_create_derivative(name, digest, variant, fmt)
+
+
+def image_derivative(request, variant, digest, name):
+    """Serve a resized WebP/JPEG rendition of an uploaded image.
+
+    The URL embeds the source's SHA-256, so the response never changes and
+    is cached as immutable. WebP is sent to browsers that accept it.
+    """
+    from django.http import FileResponse, HttpResponse
+    from PIL import UnidentifiedImageError
+    from .derivatives import VARIANTS, check_source_digest, find_derivative, webp_supported
+
+    if variant not in VARIANTS:
+        raise Http404("Unknown image variant")
+
+    fmt = 'webp' if 'image/webp' in request.META.get('HTTP_ACCEPT', '') and webp_supported() else 'jpeg'
+    try:
+        derivative = find_derivative(digest, variant, fmt)
+        if derivative is None:
+            # Turn away unknown digests before taking a slot or reading the file
+            check_source_digest(name, digest)
+            derivative = _render_image_derivative(request, name, digest, variant, fmt)
+            if isinstance(derivative, HttpResponse):
+                return derivative  # shed by the limiter
+        image = derivative.file.open('rb')
+    except (OSError, ValueError, UnidentifiedImageError):
+        raise Http404("Image not found")
+
+    response = FileResponse(image, content_type=f'image/{fmt}')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response['Vary'] = 'Accept'
+    return response
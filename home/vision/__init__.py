@@ -0,0 +1,22 @@
+"""
+Shared OpenCV image-analysis engine.
+
+Everything that inspects uploaded images (the live ``validate_document``
+check, stored DocumentValidation results, the revalidation command) goes
+through here so the classifier is loaded once per process and all checks
+run at the same fixed analysis resolution. The webcam capture pipeline
+lives here too (``camera``).
+"""
+from .analysis import (
+    ANALYSIS_MAX_EDGE, BLANK_THRESHOLD, BLUR_THRESHOLD,
+    analyze_bytes, analyze_image, decode_for_analysis, face_cascade, is_image_name,
+    validate_image_bytes, warm_up,
+)
+from .camera import CAMERA_MAX_EDGE, process_camera_image
+
+__all__ = [
+    'ANALYSIS_MAX_EDGE', 'BLANK_THRESHOLD', 'BLUR_THRESHOLD',
+    'analyze_bytes', 'analyze_image', 'decode_for_analysis', 'face_cascade', 'is_image_name',
+    'validate_image_bytes', 'warm_up',
+    'CAMERA_MAX_EDGE', 'process_camera_image',
+]
@@ -0,0 +1,180 @@
+import threading
+from io import BytesIO
+
+import cv2
+import numpy as np
+
+# Every image is analysed with its longest edge scaled down to this size, so
+# cost no longer grows with the phone's megapixels and scores are comparable.
+ANALYSIS_MAX_EDGE = 1024
+
+# Calibrated at ANALYSIS_MAX_EDGE with synthetic document scans (see
+# ``manage.py benchmark_vision --calibrate``): a Gaussian blur of about
+# 1.5 px at analysis size sits right at the line. The old full-resolution
+# threshold of 50 flagged slightly soft 12 MP photos that read fine on
+# screen and passed visibly blurry webcam frames.
+BLUR_THRESHOLD = 60.0
+# Grey-level standard deviation barely changes with INTER_AREA downscaling.
+BLANK_THRESHOLD = 15.0
+FACE_MIN_SIZE = (30, 30)
+# Enough to reach the JPEG SOF / PNG IHDR past typical EXIF and ICC blocks
+PROBE_BYTES = 256 * 1024
+
+_REDUCED_GRAYSCALE = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+_cascade = None
+_cascade_lock = threading.Lock()
+# CascadeClassifier isn't documented as thread-safe; background validation
+# threads may share it with the request thread.
+_detect_lock = threading.Lock()
+
+
+def face_cascade():
+    """Return the process-wide frontal-face Haar cascade, loading it on first use."""
+    global _cascade
+    if _cascade is None:
+        with _cascade_lock:
+            if _cascade is None:
+                cascade = cv2.CascadeClassifier(
+                    cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+                )
+                if cascade.empty():
+                    raise RuntimeError('Could not load the Haar face cascade.')
+                _cascade = cascade
+    return _cascade
+
+
+def warm_up():
+    """Load the classifier before gunicorn forks (``--preload``) so workers share it.
+
+    Only the XML is parsed here; running a detection would start OpenCV's
+    thread pool in the master process, which does not survive fork().
+    """
+    face_cascade()
+
+
+def _fit(img, max_edge=ANALYSIS_MAX_EDGE):
+    h, w = img.shape[:2]
+    scale = max_edge / max(h, w)
+    if scale >= 1:
+        return img
+    return cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+def _probe(file_bytes, max_edge):
+    """
+    Read the image size from its header and pick the largest libjpeg
+    reduction (1, 2, 4 or 8) that still leaves at least *max_edge* pixels.
+    Returns ``((width, height), factor)``; the size is ``(None, None)`` if
+    Pillow can't parse the header.
+    """
+    from PIL import Image
+
+    try:
+        # Only the header is needed; slicing keeps memoryview input zero-copy
+        with Image.open(BytesIO(file_bytes[:PROBE_BYTES])) as im:
+            width, height = im.size
+    except Exception:
+        return (None, None), 1
+
+    for factor in (8, 4, 2):
+        if max(width, height) // factor >= max_edge:
+            return (width, height), factor
+    return (width, height), 1
+
+
+def decode_for_analysis(file_bytes):
+    """
+    Decode image bytes straight to a greyscale array at analysis size.
+
+    JPEGs are decoded at 1/2, 1/4 or 1/8 scale by libjpeg itself when the
+    original is big enough, which skips most of the decode work. Returns
+    ``(gray, (width, height))`` with the original size, or ``(None, None)``.
+    """
+    (width, height), factor = _probe(file_bytes, ANALYSIS_MAX_EDGE)
+    gray = cv2.imdecode(np.frombuffer(file_bytes, np.uint8), _REDUCED_GRAYSCALE[factor])
+    if gray is None:
+        return None, None
+    h, w = gray.shape[:2]
+    if width is None:
+        width, height = w, h
+    elif (h > w) != (height > width):
+        width, height = height, width  # OpenCV applied the EXIF rotation
+    return _fit(gray), (width, height)
+
+
+def analyze_image(gray, original_size, detect_faces=False):
+    """Blur / blank (and optionally face) metrics for an analysis-size greyscale image."""
+    checks = {
+        'decodable': True,
+        'resolution': f'{original_size[0]}x{original_size[1]}',
+    }
+
+    lap_var = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    checks['blur_score'] = round(lap_var, 2)
+    checks['blur_ok'] = lap_var >= BLUR_THRESHOLD
+
+    std_dev = float(gray.std())
+    checks['contrast_score'] = round(std_dev, 2)
+    checks['blank_ok'] = std_dev >= BLANK_THRESHOLD
+
+    if detect_faces:
+        try:
+            cascade = face_cascade()
+            with _detect_lock:
+                faces = cascade.detectMultiScale(
+                    gray, scaleFactor=1.1, minNeighbors=5, minSize=FACE_MIN_SIZE,
+                )
+            num = len(faces) if faces is not None else 0
+            checks['faces_detected'] = num
+            checks['face_ok'] = num == 1
+        except Exception:
+            checks['face_ok'] = None  # cascade not available
+    return checks
+
+
+def analyze_bytes(file_bytes, detect_faces=False):
+    """Decode and analyse image bytes. ``checks['decodable']`` is False on failure."""
+    gray, original_size = decode_for_analysis(file_bytes)
+    if gray is None:
+        return {'decodable': False}
+    return analyze_image(gray, original_size, detect_faces=detect_faces)
+
+
+def is_image_name(name):
+    """True if *name* has an extension the OpenCV checks run on."""
+    ext = ('.' + name.rsplit('.', 1)[-1]).lower() if '.' in name else ''
+    return ext in ('.jpg', '.jpeg', '.png')
+
+
+def validate_image_bytes(file_bytes, field_name):
+    """Run the checks for a stored *field_name* upload.
+
+    Returns ``{'warnings': [...], 'checks': {...}}``, the shape kept in
+    DocumentValidation ``result``. Faces are only counted on ``id_picture``.
+    """
+    result = {'warnings': [], 'checks': {}}
+    try:
+        checks = analyze_bytes(file_bytes, detect_faces=(field_name == 'id_picture'))
+    except Exception:
+        return result
+    result['checks'] = checks
+    if not checks['decodable']:
+        result['warnings'].append('Could not decode image — file may be corrupted.')
+        return result
+    if not checks['blur_ok']:
+        result['warnings'].append(f'Blurry (sharpness: {checks["blur_score"]:.0f})')
+    if not checks['blank_ok']:
+        result['warnings'].append('Appears blank or nearly blank')
+    if checks.get('face_ok') is False:
+        num = checks['faces_detected']
+        if num == 0:
+            result['warnings'].append('No face detected')
+        else:
+            result['warnings'].append(f'{num} faces detected (expected 1)')
+    return result
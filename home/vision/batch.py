@@ -0,0 +1,36 @@
+"""
+Process-pool entry points for offline checks (``revalidate_documents``).
+
+Worker processes are spawned, so this module must not import Django
+models at import time — ``init_worker`` sets Django up first.
+"""
+import hashlib
+
+
+def init_worker():
+    """Runs once in each worker process: set Django up and load the classifier."""
+    import django
+
+    django.setup()
+    from . import warm_up
+
+    warm_up()
+
+
+def check_stored_document(name, field_name):
+    """Read one stored image and run the OpenCV checks on it.
+
+    Returns ``(sha256, result)`` with *result* shaped like a
+    DocumentValidation ``result``.
+    """
+    from django.core.files.storage import default_storage
+    from django.db import connection
+
+    from . import validate_image_bytes
+
+    try:
+        with default_storage.open(name, 'rb') as f:
+            file_bytes = f.read()
+    finally:
+        connection.close()
+    return hashlib.sha256(file_bytes).hexdigest(), validate_image_bytes(file_bytes, field_name)
@@ -0,0 +1,112 @@
+import time
+
+import cv2
+import numpy as np
+
+from .analysis import _fit, _probe
+
+# Webcam/phone captures are capped to this longest edge before any
+# processing. Uploads are normalized to at most 2200 px (1200 px for ID
+# pictures) afterwards anyway, and every stage below scales with pixels.
+CAMERA_MAX_EDGE = 1600
+CAMERA_JPEG_QUALITY = 90
+# Raw and multipart capture bodies bigger than this are rejected
+CAMERA_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# Denoising only touches the luminance channel: webcam chroma noise is
+# low-frequency and barely visible once re-encoded, and the colour NL-means
+# pass this replaces was the single most expensive stage. A bilateral
+# filter is the default; ``manage.py benchmark_vision --camera`` showed it
+# matching small-window NL-means on PSNR at a fraction of the cost.
+DENOISE_METHOD = 'bilateral'
+BILATERAL_DIAMETER = 5
+BILATERAL_SIGMA = 40
+NLMEANS_STRENGTH = 5
+NLMEANS_TEMPLATE_WINDOW = 5
+NLMEANS_SEARCH_WINDOW = 11
+
+_REDUCED_COLOR = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+class _Stopwatch:
+    """Collects per-stage wall times in milliseconds, in stage order."""
+
+    def __init__(self):
+        self.timings = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+
+def decode_camera_image(img_bytes):
+    """Decode a capture to BGR, letting libjpeg downscale large JPEGs while decoding.
+
+    *img_bytes* may be any buffer (bytes, bytearray, memoryview); it is
+    wrapped with ``np.frombuffer`` without copying.
+    """
+    _, factor = _probe(img_bytes, CAMERA_MAX_EDGE)
+    return cv2.imdecode(np.frombuffer(img_bytes, np.uint8), _REDUCED_COLOR[factor])
+
+
+def enhance(img, denoise=DENOISE_METHOD, watch=None):
+    """
+    Resize, denoise and contrast-equalize a BGR capture.
+
+    *denoise* is ``'bilateral'`` (edge-preserving bilateral filter on L),
+    ``'luma'`` (small-window NL-means on L — slower) or ``None``. Denoising
+    runs before CLAHE so the equalization doesn't amplify sensor noise.
+    """
+    watch = watch or _Stopwatch()
+    img = _fit(img, CAMERA_MAX_EDGE)
+    watch.lap('resize')
+
+    l, a, b = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2LAB))
+    if denoise == 'luma':
+        l = cv2.fastNlMeansDenoising(
+            l, None, NLMEANS_STRENGTH, NLMEANS_TEMPLATE_WINDOW, NLMEANS_SEARCH_WINDOW,
+        )
+    elif denoise == 'bilateral':
+        l = cv2.bilateralFilter(l, BILATERAL_DIAMETER, BILATERAL_SIGMA, BILATERAL_SIGMA)
+    watch.lap('denoise')
+
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    img = cv2.cvtColor(cv2.merge([clahe.apply(l), a, b]), cv2.COLOR_LAB2BGR)
+    watch.lap('clahe')
+    return img
+
+
+def encode_jpeg(img, quality=CAMERA_JPEG_QUALITY):
+    ok, buf = cv2.imencode('.jpg', img, [
+        cv2.IMWRITE_JPEG_QUALITY, quality,
+        cv2.IMWRITE_JPEG_PROGRESSIVE, 1,
+        cv2.IMWRITE_JPEG_OPTIMIZE, 1,
+    ])
+    if not ok:
+        raise ValueError('Could not encode the processed image.')
+    return buf.tobytes()
+
+
+def process_camera_image(img_bytes, denoise=DENOISE_METHOD):
+    """
+    Full capture pipeline: decode → resize → denoise → CLAHE → JPEG.
+
+    Returns ``(jpeg_bytes, timings)`` where *timings* maps each stage to
+    milliseconds, or ``(None, timings)`` if the bytes aren't an image.
+    """
+    watch = _Stopwatch()
+    img = decode_camera_image(img_bytes)
+    watch.lap('decode')
+    if img is None:
+        return None, watch.timings
+    img = enhance(img, denoise=denoise, watch=watch)
+    data = encode_jpeg(img)
+    watch.lap('encode')
+    return data, watch.timings
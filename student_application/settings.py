@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
@@ -151,6 +152,59 @@ if os.environ.get("DO_SPACES_BUCKET"):
     AWS_DEFAULT_ACL = "public-read"
     MEDIA_URL = f"https://{AWS_STORAGE_BUCKET_NAME}.{AWS_S3_REGION_NAME}.digitaloceanspaces.com/"
 
+# ── Media cache — node-local disk cache in front of DatabaseStorage ──
+# Shared by every gunicorn worker on the node; set MEDIA_CACHE_MAX_MB=0 to disable.
+MEDIA_CACHE_DIR = os.environ.get(
+    "MEDIA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "swa-media-cache")
+)
+MEDIA_CACHE_MAX_BYTES = int(os.environ.get("MEDIA_CACHE_MAX_MB", "256")) * 1024 * 1024
+MEDIA_CACHE_META_TTL = int(os.environ.get("MEDIA_CACHE_META_TTL", "300"))  # seconds
+
+# ── Concurrency limits for CPU-heavy endpoints (home/limiter.py) ──
+# Camera, document-check and PDF requests share one CPU budget across all
+# gunicorn workers on the node. A queued request sleeps inside a sync
+# worker too, so running slots plus queue places stay below the worker
+# count and ordinary pages always have a free worker. WEB_CONCURRENCY is
+# also what gunicorn reads for its worker count (render.yaml).
+WEB_CONCURRENCY = max(1, int(os.environ.get("WEB_CONCURRENCY", "2")))
+CONCURRENCY_LIMIT_DIR = os.environ.get(
+    "CONCURRENCY_LIMIT_DIR", os.path.join(tempfile.gettempdir(), "swa-limiter")
+)
+_cpu_queue = 1 if WEB_CONCURRENCY >= 3 else 0
+CONCURRENCY_BUDGET = {
+    "slots": max(1, WEB_CONCURRENCY - 1 - _cpu_queue),
+    "queue": _cpu_queue,
+    "timeout": 1,  # seconds a queued request waits before it's shed
+}
+# Per endpoint: the Retry-After (s) sent with the 503 when shed
+CONCURRENCY_LIMITS = {
+    "camera_photo": {"retry_after": 5},
+    "validate_document": {"retry_after": 3},
+    "pdf": {"retry_after": 15},
+    "image_derivative": {"retry_after": 5},
+}
+
+# ── Extra storage aliases for `manage.py migrate_media` ──
+# "database" and "filesystem" are always available; "s3" points at any
+# S3-compatible endpoint (DigitalOcean Spaces, AWS, or a local MinIO).
+STORAGES["database"] = {"BACKEND": "home.storage.DatabaseStorage"}
+STORAGES["filesystem"] = {
+    "BACKEND": "django.core.files.storage.FileSystemStorage",
+    "OPTIONS": {"location": MEDIA_ROOT},
+}
+if os.environ.get("MEDIA_S3_BUCKET"):
+    STORAGES["s3"] = {
+        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "OPTIONS": {
+            "bucket_name": os.environ["MEDIA_S3_BUCKET"],
+            "endpoint_url": os.environ.get("MEDIA_S3_ENDPOINT_URL") or None,
+            "access_key": os.environ.get("MEDIA_S3_ACCESS_KEY", ""),
+            "secret_key": os.environ.get("MEDIA_S3_SECRET_KEY", ""),
+            "region_name": os.environ.get("MEDIA_S3_REGION") or None,
+            "file_overwrite": True,
+        },
+    }
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # ── Logging — print errors to stderr so Render / gunicorn captures them ──
@@ -188,6 +242,11 @@ LOGGING = {
 # ── Encrypted Data Storage (Fernet symmetric encryption for backups) ──
 DATA_ENCRYPTION_KEY = os.environ.get("DATA_ENCRYPTION_KEY", "")
 
+# ── Delta export API (/api/export/<feed>/) ──
+# Registrar/finance sync jobs send "Authorization: Bearer <token>".
+# The API is disabled while this is empty.
+EXPORT_API_TOKEN = os.environ.get("EXPORT_API_TOKEN", "")
+
 # Authentication
 LOGIN_URL = "/"
 LOGIN_REDIRECT_URL = "/"
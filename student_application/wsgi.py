@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_application.settings")
 
 application = get_wsgi_application()
+
+# Load the OpenCV face classifier once in the gunicorn master (--preload) so
+# every worker inherits it instead of parsing the XML on first request.
+try:
+    from home.vision import warm_up
+
+    warm_up()
+except Exception:  # never block startup on an optional warm-up
+    pass